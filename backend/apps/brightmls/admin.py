@@ -1,11 +1,23 @@
 from django.contrib import admin
+from django.urls import reverse
 from django.utils.safestring import mark_safe
 from brightmls import models as bright_models
-from backend.core.admin import ViewOnlyAdminMixin, ImageUrlFieldsAdminMixin
+from brightmls.services.search import (
+    search_documents,
+    search_properties,
+    search_similar,
+)
+from backend.core.admin import (
+    FullTextSearchAdminMixin,
+    ViewOnlyAdminMixin,
+    ImageUrlFieldsAdminMixin,
+)
 
 
 @admin.register(bright_models.BrightProperties)
-class BrightPropertiesAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
+class BrightPropertiesAdmin(
+    ViewOnlyAdminMixin, FullTextSearchAdminMixin, admin.ModelAdmin
+):
     list_display = [
         "ListingKey",
         "Location",
@@ -14,6 +26,37 @@ class BrightPropertiesAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
     search_fields = [
         "ListingKey",
     ]
+    search_help_text = (
+        "Listing key, keywords of the listing id, address and remarks, "
+        "or a partial address, city, postal code or subdivision"
+    )
+    readonly_fields = ["display_details"]
+
+    def full_text_search(self, queryset, search_term):
+        return search_properties(search_term, queryset, similar=True)
+
+    @admin.display(description="Details")
+    def display_details(self, obj):
+        url = reverse(
+            "admin:brightmls_brightpropertiesdetails_change", args=[obj.ListingKey]
+        )
+        return mark_safe(f'<a href="{url}">All other columns</a>')
+
+
+@admin.register(bright_models.BrightPropertiesDetails)
+class BrightPropertiesDetailsAdmin(
+    ViewOnlyAdminMixin, FullTextSearchAdminMixin, admin.ModelAdmin
+):
+    list_display = [
+        "ListingKey",
+    ]
+    search_fields = [
+        "ListingKey",
+    ]
+    search_help_text = "Listing key, or keywords of the remarks"
+
+    def full_text_search(self, queryset, search_term):
+        return search_documents(queryset, search_term)
 
 
 @admin.register(bright_models.SysOfficeMedia)
@@ -202,7 +245,9 @@ class DeletionAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
 
 
 @admin.register(bright_models.BrightOffices)
-class BrightOfficesAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
+class BrightOfficesAdmin(
+    ViewOnlyAdminMixin, FullTextSearchAdminMixin, admin.ModelAdmin
+):
     list_display = [
         "OfficeKey",
         "FranchiseAffiliation",
@@ -280,10 +325,15 @@ class BrightOfficesAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
         "SourceModificationTimestamp",
         "OfficeStreetDirPrefix",
     ]
+    # trigram indexed, searched by similarity (a number is looked up as the OfficeKey)
     search_fields = [
-        "OfficeKey",
+        "OfficeName",
+        "OfficeAddress1",
     ]
 
+    def full_text_search(self, queryset, search_term):
+        return search_similar(queryset, self.search_fields, search_term)
+
 
 @admin.register(bright_models.SchoolDistrict)
 class SchoolDistrictAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
@@ -452,7 +502,9 @@ class CityAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
 
 
 @admin.register(bright_models.BrightMembers)
-class BrightMembersAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
+class BrightMembersAdmin(
+    ViewOnlyAdminMixin, FullTextSearchAdminMixin, admin.ModelAdmin
+):
     list_display = [
         "MemberKey",
         "JobTitle",
@@ -539,10 +591,15 @@ class BrightMembersAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
         "SourceModificationTimestamp",
         "MemberStreetDirPrefix",
     ]
+    # trigram indexed, searched by similarity (a number is looked up as the MemberKey)
     search_fields = [
-        "MemberKey",
+        "MemberFullName",
+        "MemberEmail",
     ]
 
+    def full_text_search(self, queryset, search_term):
+        return search_similar(queryset, self.search_fields, search_term)
+
 
 @admin.register(bright_models.Unit)
 class UnitAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
@@ -724,6 +781,52 @@ class RoomAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
     ]
 
 
+@admin.register(bright_models.IngestionTask)
+class IngestionTaskAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
+    list_display = [
+        "id",
+        "entity",
+        "mode",
+        "status",
+        "attempt",
+        "worker",
+        "lease_expires_at",
+        "inserted",
+        "updated_at",
+    ]
+    list_filter = [
+        "entity",
+        "status",
+    ]
+
+
+@admin.register(bright_models.RequestBudget)
+class RequestBudgetAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
+    list_display = [
+        "name",
+        "tokens",
+        "updated_at",
+        "granted",
+        "waits",
+        "wait_seconds",
+    ]
+
+
+@admin.register(bright_models.DictionaryCode)
+class DictionaryCodeAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
+    list_display = [
+        "dictionary",
+        "code",
+        "value",
+    ]
+    list_filter = [
+        "dictionary",
+    ]
+    search_fields = [
+        "value",
+    ]
+
+
 # @admin.register(bright_models.BusinessHistoryDeletions)
 # class BusinessHistoryDeletionsAdmin(ViewOnlyAdminMixin, admin.ModelAdmin):
 #     list_display = [
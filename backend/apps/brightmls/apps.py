@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate, pre_migrate
 
 
 class BrightmlsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'brightmls'
+
+    def ready(self):
+        from brightmls.services.dictionary import (
+            create_views_after_migrate,
+            drop_views_before_migrate,
+        )
+
+        # views of the encoded columns block altering the columns, they are
+        # recreated around every migrate
+        pre_migrate.connect(drop_views_before_migrate, sender=self)
+        post_migrate.connect(create_views_after_migrate, sender=self)
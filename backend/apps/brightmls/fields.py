@@ -0,0 +1,191 @@
+from django.db import models, transaction
+from django.db.models import lookups
+
+# code of lookups by values which are not in the dictionary, it matches no record
+UNKNOWN_CODE = -1
+
+
+class Dictionary:
+    """
+    Codes of the values of one dictionary (DictionaryCode rows), cached in the process.
+    Codes are never changed or deleted, so the cache is only extended.
+    """
+
+    _instances = {}
+
+    def __init__(self, name):
+        self.name = name
+        self.codes = {}
+        self.values = {}
+
+    @classmethod
+    def get(cls, name):
+        if name not in cls._instances:
+            cls._instances[name] = cls(name)
+        return cls._instances[name]
+
+    def load(self):
+        from brightmls.models import DictionaryCode
+
+        for code, value in DictionaryCode.objects.filter(
+            dictionary=self.name
+        ).values_list("code", "value"):
+            self._add(code, value)
+
+    def _add(self, code, value):
+        self.codes[value] = code
+        self.values[code] = value
+
+    def encode(self, value, connection, create=True):
+        """
+        :param connection: Connection writing the record, new codes are created in its
+        transaction
+        :param create: Add unknown values to the dictionary, UNKNOWN_CODE is returned otherwise
+        """
+        if value not in self.codes:
+            self.load()
+        if value in self.codes:
+            return self.codes[value]
+        if not create:
+            return UNKNOWN_CODE
+        return self._create(value, connection)
+
+    def decode(self, code):
+        if code not in self.values:
+            # added by another process
+            self.load()
+        return self.values.get(code)
+
+    def _create(self, value, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT brightmls_dictionary_encode(%s, %s)", [self.name, value]
+            )
+            code = cursor.fetchone()[0]
+        # the code is rolled back with the record, it is only cached once committed
+        # (until then the encode function finds it in the transaction)
+        transaction.on_commit(lambda: self._add(code, value), using=connection.alias)
+        return code
+
+
+class DictionaryField(models.CharField):
+    """
+    Text field of a small set of values (statuses, types, counties...) whose column
+    can be stored as a smallint code of a dictionary, which is much smaller in tables
+    and indexes. Columns are text until their table is encoded (opt-in per model,
+    see brightmls.services.dictionary.encode_model and mls_dictionary --encode).
+
+    The field follows the type of its column: values of encoded columns are encoded
+    when records are written (unknown values get a new code) and decoded when they
+    are read, exact and in lookups compare codes, other lookups (icontains, ...)
+    match the values in DictionaryCode, so models, lookups and the admin still see
+    text. Views "<table>_decoded" show the values for SQL.
+
+    usage: MlsStatus = DictionaryField(dictionary="MlsStatus", max_length=255, null=True)
+    """
+
+    description = "Text value which can be stored as a dictionary code"
+
+    # (connection alias, table) -> columns of the table stored as codes
+    _encoded_columns = {}
+
+    def __init__(self, *args, dictionary, **kwargs):
+        self.dictionary = dictionary
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["dictionary"] = self.dictionary
+        return name, path, args, kwargs
+
+    def get_dictionary(self):
+        return Dictionary.get(self.dictionary)
+
+    def is_encoded(self, connection):
+        """
+        :return: True if the column is stored as codes, read once per process and table
+        """
+        key = (connection.alias, self.model._meta.db_table)
+        if key not in self._encoded_columns:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_schema = current_schema() AND table_name = %s
+                        AND data_type = 'smallint'
+                    """,
+                    [self.model._meta.db_table],
+                )
+                self._encoded_columns[key] = {row[0] for row in cursor.fetchall()}
+        return self.column in self._encoded_columns[key]
+
+    @classmethod
+    def reset_encoded_columns(cls):
+        cls._encoded_columns.clear()
+
+    def from_db_value(self, value, expression, connection):
+        if isinstance(value, int):
+            return self.get_dictionary().decode(value)
+        return value
+
+    def to_python(self, value):
+        if isinstance(value, int):
+            return self.get_dictionary().decode(value)
+        return super().to_python(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is not None and self.is_encoded(connection):
+            # exact and in lookups: values missing in the dictionary match no record
+            return self.get_dictionary().encode(value, connection, create=False)
+        return value
+
+    def get_db_prep_save(self, value, connection):
+        if value is not None and self.is_encoded(connection):
+            return self.get_dictionary().encode(self.to_python(value), connection)
+        return super().get_db_prep_save(value, connection)
+
+
+class DictionaryLookupMixin:
+    """
+    Lookup of a DictionaryField matching the values in DictionaryCode when the
+    column is encoded: column IN (SELECT code ... WHERE value <lookup> rhs)
+    """
+
+    def as_sql(self, compiler, connection):
+        field = self.lhs.output_field
+        if not field.is_encoded(connection):
+            return super().as_sql(compiler, connection)
+
+        from brightmls.models import DictionaryCode
+
+        codes = DictionaryCode.objects.filter(
+            dictionary=field.dictionary, **{f"value__{self.lookup_name}": self.rhs}
+        ).values("code")
+        return compiler.compile(lookups.In(self.lhs, codes.query))
+
+
+# exact and in are served by get_db_prep_value, isnull works on codes as well
+for lookup_class in (
+    lookups.IExact,
+    lookups.Contains,
+    lookups.IContains,
+    lookups.StartsWith,
+    lookups.IStartsWith,
+    lookups.EndsWith,
+    lookups.IEndsWith,
+    lookups.Regex,
+    lookups.IRegex,
+    lookups.GreaterThan,
+    lookups.GreaterThanOrEqual,
+    lookups.LessThan,
+    lookups.LessThanOrEqual,
+    lookups.Range,
+):
+    DictionaryField.register_lookup(
+        type(
+            f"Dictionary{lookup_class.__name__}",
+            (DictionaryLookupMixin, lookup_class),
+            {},
+        )
+    )
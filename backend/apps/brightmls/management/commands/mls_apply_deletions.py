@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from brightmls.services.deletions import BrightMLSDeletionService
+from brightmls.services.grab_linear import BrightMLSGrabService
+
+
+class Command(BaseCommand):
+    help = "Command to delete the records listed in the Deletion feed from all MLS tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grab",
+            action="store_true",
+            help="Grab new Deletion records from the API before applying them",
+        )
+
+        parser.add_argument(
+            "--follow",
+            action="store_true",
+            help="Keep running, grab (with --grab) and apply new deletions every --interval seconds",
+        )
+
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=300,
+            help="Seconds between the runs of --follow (defaults to 300)",
+        )
+
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Deletion rows applied in one transaction (defaults to 5000)",
+        )
+
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Forget the watermark and replay the whole Deletion feed",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            BrightMLSDeletionService().reset_watermark()
+
+        while True:
+            if options["grab"]:
+                grab_service = BrightMLSGrabService()
+                grab_service.entity_name = "Deletion"
+                grab_service.populate()
+                print()
+
+            service = BrightMLSDeletionService()
+            if options["batch_size"]:
+                service.batch_size = options["batch_size"]
+            service.apply()
+
+            if not options["follow"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Successfully finished"))
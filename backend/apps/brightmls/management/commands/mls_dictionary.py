@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+from brightmls import models as bright_models
+from brightmls.models import DictionaryCode
+from brightmls.services.dictionary import (
+    create_views,
+    decode_model,
+    encode_model,
+    get_dictionaries,
+    get_encoded_models,
+    seed_from_lookup,
+)
+
+
+class Command(BaseCommand):
+    help = "Command to maintain the dictionaries of the encoded columns and their decoded views"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "entity",
+            type=str,
+            nargs="?",
+            choices=sorted(model.__name__ for model in get_encoded_models()),
+            help="Entity name (The same as Model name) to --encode or --decode",
+        )
+
+        parser.add_argument(
+            "--encode",
+            action="store_true",
+            help="Store the dictionary columns of the entity as codes (rewrites the table)",
+        )
+
+        parser.add_argument(
+            "--decode",
+            action="store_true",
+            help="Store the dictionary columns of the entity as text again (rewrites the table)",
+        )
+
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Add the values of the Lookup entity to the dictionaries of the same name",
+        )
+
+        parser.add_argument(
+            "--views",
+            action="store_true",
+            help="Recreate the <table>_decoded views (they are recreated by migrate too)",
+        )
+
+    def handle(self, *args, **options):
+        if options["encode"] or options["decode"]:
+            if not options["entity"]:
+                raise CommandError("An entity is required to --encode or --decode")
+            if options["encode"] and options["decode"]:
+                raise CommandError("Use either --encode or --decode")
+
+        if options["seed"]:
+            seed_from_lookup()
+
+        model_class = getattr(bright_models, options["entity"] or "", None)
+        try:
+            if options["encode"]:
+                fields = encode_model(model_class)
+                self.stdout.write(f"Encoded {', '.join(fields)}")
+            elif options["decode"]:
+                fields = decode_model(model_class)
+                self.stdout.write(f"Decoded {', '.join(fields)}")
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options["views"]:
+            for view in create_views():
+                self.stdout.write(f"Created view {view}")
+
+        for dictionary in get_dictionaries():
+            count = DictionaryCode.objects.filter(dictionary=dictionary).count()
+            self.stdout.write(f"{dictionary}: {count:,} codes")
+
+        self.stdout.write(self.style.SUCCESS("Successfully finished"))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from brightmls.models import IngestionTask
+from brightmls.services.queue import BrightMLSEnqueueService
+
+
+class Command(BaseCommand):
+    help = "Command to split entities into key range tasks for mls_worker processes"
+
+    def add_arguments(self, parser):
+        # mandatory string names of the entities
+        parser.add_argument(
+            "entities",
+            nargs="+",
+            type=str,
+            help="Entity names (the same as Model names)",
+        )
+
+        parser.add_argument(
+            "--partitions",
+            type=int,
+            default=8,
+            help="Number of tasks per entity (defaults to 8)",
+        )
+
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help="Update existing records instead of skipping them",
+        )
+
+    def handle(self, *args, **options):
+        for entity_name in options["entities"]:
+            service = BrightMLSEnqueueService()
+            service.entity_name = entity_name
+            service.partitions = options["partitions"]
+            if options["upsert"]:
+                service.mode = IngestionTask.MODE_UPSERT
+
+            try:
+                service.enqueue()
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS("Successfully finished"))
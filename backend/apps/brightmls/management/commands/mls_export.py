@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from brightmls.services.export import BrightMLSExportService
+
+
+class Command(BaseCommand):
+    help = "Command to export an entity to a Parquet file and/or load it into the database with COPY"
+
+    def add_arguments(self, parser):
+        # mandatory string name of the entity argument
+        parser.add_argument(
+            "entity", nargs=1, type=str, help="Entity name (the same as Model name)"
+        )
+
+        # add optional int limit argument
+        parser.add_argument(
+            "limit",
+            nargs="?",
+            type=int,
+            help="Select this count of records once (defaults to 10000)",
+        )
+
+        parser.add_argument(
+            "--output",
+            type=str,
+            help="Write the records to this Parquet file (requires pyarrow)",
+        )
+
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Load the records into the model table with COPY (the table should be empty)",
+        )
+
+    def handle(self, *args, **options):
+        service = BrightMLSExportService()
+
+        service.entity_name = options["entity"][0]
+        if options["limit"]:
+            service.limit = options["limit"]
+        service.output = options["output"]
+        service.copy = options["copy"]
+
+        try:
+            service.export()
+        except (ValueError, ImportError) as e:
+            # pyarrow is optional, it is only required by --output
+            raise CommandError(str(e))
+        else:
+            self.stdout.write(self.style.SUCCESS("Successfully finished"))
@@ -17,7 +17,7 @@ class Command(BaseCommand):
             "limit",
             nargs="?",
             type=int,
-            help="Select this count of records once (defaults to 10000)",
+            help="Select this count of records once (the page size is tuned automatically if omitted)",
         )
 
         # add optional int last processed pk argument
@@ -28,14 +28,57 @@ class Command(BaseCommand):
             help="Start the process from the next record after this one",
         )
 
+        parser.add_argument(
+            "--no-select",
+            action="store_true",
+            help="Request all entity properties instead of the model fields only",
+        )
+
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help="Convert pages to model rows in this many processes (defaults to 0, no pool)",
+        )
+
+        parser.add_argument(
+            "--reload",
+            action="store_true",
+            help="Reload the whole entity into a shadow table and swap it in when done",
+        )
+
+        parser.add_argument(
+            "--defer-indexes",
+            action="store_true",
+            help="Drop the secondary indexes while loading and rebuild them in parallel when done",
+        )
+
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Bypass the on-disk response cache of slowly changing entities",
+        )
+
     def handle(self, *args, **options):
         service = BrightMLSGrabService()
 
         service.entity_name = options["entity"][0]
         if options["limit"]:
             service.limit = options["limit"]
+        else:
+            service.adaptive_page_size = True
         if options["last_pk"]:
             service.last_pk = options["last_pk"]
+        if options["no_select"]:
+            service.use_select = False
+        if options["workers"]:
+            service.conversion_workers = options["workers"]
+        if options["reload"]:
+            service.reload = True
+        if options["defer_indexes"]:
+            service.defer_indexes = True
+        if options["no_cache"]:
+            service.use_cache = False
 
         try:
             service.populate()
@@ -43,4 +86,6 @@ class Command(BaseCommand):
             raise
             # raise CommandError("Error happens: %s" % e)
         else:
+            if service.rate_limiter is not None:
+                self.stdout.write(f"Request budget: {service.rate_limiter.metrics()}")
             self.stdout.write(self.style.SUCCESS("Successfully finished"))
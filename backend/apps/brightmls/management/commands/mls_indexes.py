@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from brightmls import models as bright_models
+from brightmls.services.indexes import DeferredIndexes
+
+
+class Command(BaseCommand):
+    help = "Command to drop the secondary indexes of an entity before a bulk load and rebuild them after it"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "entity", type=str, help="Entity name (The same as Model name)"
+        )
+
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop the indexes instead of rebuilding the missing ones",
+        )
+
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DeferredIndexes.workers,
+            help=f"Build this many indexes at once (defaults to {DeferredIndexes.workers})",
+        )
+
+        parser.add_argument(
+            "--concurrently",
+            action="store_true",
+            help="Build with CREATE INDEX CONCURRENTLY, one by one, without blocking writes",
+        )
+
+    def handle(self, *args, **options):
+        model_class = getattr(bright_models, options["entity"], None)
+        if not isinstance(model_class, type) or not issubclass(
+            model_class, bright_models.BaseModel
+        ):
+            raise CommandError(f"Model {options['entity']} not found")
+
+        indexes = DeferredIndexes(model_class)
+        indexes.workers = options["workers"]
+        indexes.concurrently = options["concurrently"]
+
+        try:
+            if options["drop"]:
+                indexes.drop()
+            else:
+                indexes.rebuild()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS("Successfully finished"))
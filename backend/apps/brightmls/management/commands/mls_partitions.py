@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from brightmls import models as bright_models
+from brightmls.services.partitions import PARTITION_KEYS, MonthlyPartitions
+
+
+class Command(BaseCommand):
+    help = "Command to maintain the monthly partitions of append-heavy MLS tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "entity",
+            type=str,
+            choices=sorted(PARTITION_KEYS),
+            help="Entity name (The same as Model name)",
+        )
+
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Rewrite the table as a partitioned one first (once, while nothing writes to it)",
+        )
+
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=3,
+            help="Create the partitions of the current and this many next months (defaults to 3)",
+        )
+
+        parser.add_argument(
+            "--retain",
+            type=int,
+            help="Detach the partitions of months older than this many months",
+        )
+
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop the detached partitions instead of keeping them as standalone tables",
+        )
+
+    def handle(self, *args, **options):
+        partitions = MonthlyPartitions(getattr(bright_models, options["entity"]))
+
+        try:
+            if options["convert"]:
+                partitions.convert()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for name in partitions.create_ahead(options["ahead"]):
+            self.stdout.write(f"Created {name}")
+
+        if options["retain"] is not None:
+            for name in partitions.expire(options["retain"], drop=options["drop"]):
+                self.stdout.write(f"{'Dropped' if options['drop'] else 'Detached'} {name}")
+
+        self.stdout.write(self.style.SUCCESS("Successfully finished"))
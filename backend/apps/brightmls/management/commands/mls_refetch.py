@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from brightmls.services.refetch import BrightMLSRefetchService
+
+
+class Command(BaseCommand):
+    help = "Command to refetch specific records by primary key and update them"
+
+    def add_arguments(self, parser):
+        # mandatory string name of the entity argument
+        parser.add_argument(
+            "entity", nargs=1, type=str, help="Entity name (the same as Model name)"
+        )
+
+        parser.add_argument(
+            "keys", nargs="*", type=int, help="Primary keys of the records to refetch"
+        )
+
+        parser.add_argument(
+            "--keys-file",
+            type=str,
+            help="File with primary keys to refetch, one per line",
+        )
+
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Number of keys requested at once (defaults to 100)",
+        )
+
+    def handle(self, *args, **options):
+        keys = list(options["keys"])
+        if options["keys_file"]:
+            with open(options["keys_file"]) as keys_file:
+                keys += [int(line) for line in keys_file if line.strip()]
+
+        if not keys:
+            raise CommandError("Provide the keys as arguments or with --keys-file")
+
+        service = BrightMLSRefetchService()
+        service.entity_name = options["entity"][0]
+        service.keys = keys
+        if options["chunk_size"]:
+            service.chunk_size = options["chunk_size"]
+
+        service.refetch()
+
+        self.stdout.write(self.style.SUCCESS("Successfully finished"))
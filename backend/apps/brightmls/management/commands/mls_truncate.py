@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 from brightmls import models as bright_models
+from brightmls.services.shadow import ShadowTable
 
 
 class Command(BaseCommand):
@@ -11,13 +13,32 @@ class Command(BaseCommand):
             "entity", type=str, help="Entity name (The same as Model name)"
         )
 
+        parser.add_argument(
+            "--shadow",
+            action="store_true",
+            help="Drop the shadow table of an unfinished mls_grab --reload instead",
+        )
+
     def handle(self, *args, **options):
         try:
             model_class = getattr(bright_models, options["entity"])
         except AttributeError:
             raise CommandError(f"Model {options['entity']} not found")
 
-        model_class.objects.all().delete()
+        if options["shadow"]:
+            ShadowTable(model_class).drop()
+            self.stdout.write(
+                self.style.SUCCESS(f"Successfully dropped {options['entity']} shadow table")
+            )
+            return
+
+        # TRUNCATE frees the tables at once, without the deletion collector of the ORM
+        tables = ", ".join(
+            connection.ops.quote_name(part_class._meta.db_table)
+            for part_class in model_class.get_part_models()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE TABLE {tables}")
 
         self.stdout.write(
             self.style.SUCCESS(f"Successfully truncated {options['entity']} table")
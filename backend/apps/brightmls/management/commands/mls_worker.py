@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+
+from brightmls.services.queue import BrightMLSWorkerService
+
+
+class Command(BaseCommand):
+    help = "Command to process ingestion tasks created by mls_enqueue, run any number of them"
+
+    def add_arguments(self, parser):
+        # add optional int limit argument
+        parser.add_argument(
+            "limit",
+            nargs="?",
+            type=int,
+            help="Select this count of records once (defaults to 10000)",
+        )
+
+        parser.add_argument(
+            "--lease",
+            type=int,
+            help="Seconds a claimed task stays locked after its worker died (defaults to 600)",
+        )
+
+        parser.add_argument(
+            "--max-tasks",
+            type=int,
+            help="Exit after processing this count of tasks",
+        )
+
+        parser.add_argument(
+            "--exit-when-empty",
+            action="store_true",
+            help="Exit when there are no tasks to claim instead of waiting for new ones",
+        )
+
+        parser.add_argument(
+            "--no-select",
+            action="store_true",
+            help="Request all entity properties instead of the model fields only",
+        )
+
+    def handle(self, *args, **options):
+        service = BrightMLSWorkerService()
+
+        if options["limit"]:
+            service.limit = options["limit"]
+        if options["lease"]:
+            service.lease_seconds = options["lease"]
+        if options["max_tasks"]:
+            service.max_tasks = options["max_tasks"]
+        if options["exit_when_empty"]:
+            service.exit_when_empty = True
+        if options["no_select"]:
+            service.use_select = False
+
+        service.run()
+
+        if service.rate_limiter is not None:
+            self.stdout.write(f"Request budget: {service.rate_limiter.metrics()}")
+
+        self.stdout.write(self.style.SUCCESS("Successfully finished"))
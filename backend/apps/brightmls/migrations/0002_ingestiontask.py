@@ -0,0 +1,67 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brightmls", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestionTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("entity", models.CharField(max_length=100)),
+                (
+                    "mode",
+                    models.CharField(
+                        choices=[
+                            ("insert", "Insert, skip existing records"),
+                            ("upsert", "Insert or update existing records"),
+                        ],
+                        default="insert",
+                        max_length=10,
+                    ),
+                ),
+                ("token", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempt", models.IntegerField(default=0)),
+                ("worker", models.CharField(max_length=255, null=True)),
+                ("lease_expires_at", models.DateTimeField(null=True)),
+                ("inserted", models.BigIntegerField(default=0)),
+                ("error", models.TextField(null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "lease_expires_at"],
+                        name="brightmls_i_status_c1b3c3_idx",
+                    )
+                ],
+            },
+        ),
+    ]
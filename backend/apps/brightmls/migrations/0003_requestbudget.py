@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brightmls", "0002_ingestiontask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestBudget",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("tokens", models.FloatField()),
+                ("updated_at", models.DateTimeField()),
+                ("granted", models.BigIntegerField(default=0)),
+                ("waits", models.BigIntegerField(default=0)),
+                ("wait_seconds", models.FloatField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,361 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+# columns of the narrow BrightProperties table, the other ones stay in
+# brightmls_brightpropertiesdetails (the former brightmls_brightproperties)
+HOT_COLUMNS = [
+    "Location",
+    "BuyerAgentKey",
+    "ListingId",
+    "ListingKey",
+    "StandardStatus",
+    "MlsStatus",
+    "BuyerOfficeKey",
+    "ClosePrice",
+    "ListPriceLow",
+    "PreviousListPrice",
+    "ListPrice",
+    "OriginalListPrice",
+    "CloseDate",
+    "DaysOnMarket",
+    "CumulativeDaysOnMarket",
+    "OriginalEntryTimestamp",
+    "ListingContractDate",
+    "PriceChangeTimestamp",
+    "ModificationTimestamp",
+    "OffMarketDate",
+    "OnMarketDate",
+    "MajorChangeTimestamp",
+    "StatusChangeTimestamp",
+    "CoBuyerAgentKey",
+    "CoBuyerOfficeKey",
+    "CoListAgentKey",
+    "City",
+    "County",
+    "StreetNumber",
+    "PostalCode",
+    "StateOrProvince",
+    "StreetName",
+    "UnitNumber",
+    "UnparsedAddress",
+    "FullStreetAddress",
+    "CoListOfficeKey",
+    "SubdivisionName",
+    "Latitude",
+    "Longitude",
+    "ListAgentMlsId",
+    "ListAgentKey",
+    "ListOfficeKey",
+    "ListOfficeMlsId",
+    "BathroomsTotalInteger",
+    "BedroomsTotal",
+    "LivingArea",
+    "YearBuilt",
+    "PropertySubType",
+    "PropertyType",
+    "PhotosChangeTimestamp",
+]
+COLUMN_LIST = ", ".join(f'"{column}"' for column in HOT_COLUMNS)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brightmls", "0004_checkpoint"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="brightproperties",
+            name="brightmls_b_Modific_3c3ee6_idx",
+        ),
+        migrations.RenameModel(
+            old_name="BrightProperties",
+            new_name="BrightPropertiesDetails",
+        ),
+        migrations.RunSQL(
+            'ALTER INDEX "brightmls_brightproperties_pkey" '
+            'RENAME TO "brightmls_brightpropertiesdetails_pkey"',
+            reverse_sql='ALTER INDEX "brightmls_brightpropertiesdetails_pkey" '
+            'RENAME TO "brightmls_brightproperties_pkey"',
+        ),
+        migrations.AlterModelOptions(
+            name="brightpropertiesdetails",
+            options={"verbose_name_plural": "BrightPropertiesDetails"},
+        ),
+        migrations.CreateModel(
+            name="BrightProperties",
+            fields=[
+                ("Location", models.CharField(max_length=255, null=True)),
+                ("BuyerAgentKey", models.CharField(max_length=255, null=True)),
+                ("ListingId", models.CharField(max_length=255, null=True)),
+                (
+                    "ListingKey",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                ("StandardStatus", models.CharField(max_length=255, null=True)),
+                ("MlsStatus", models.CharField(max_length=255, null=True)),
+                ("BuyerOfficeKey", models.CharField(max_length=255, null=True)),
+                ("ClosePrice", models.CharField(max_length=255, null=True)),
+                ("ListPriceLow", models.CharField(max_length=255, null=True)),
+                ("PreviousListPrice", models.CharField(max_length=255, null=True)),
+                ("ListPrice", models.CharField(max_length=255, null=True)),
+                ("OriginalListPrice", models.CharField(max_length=255, null=True)),
+                ("CloseDate", models.DateField(null=True)),
+                ("DaysOnMarket", models.IntegerField(null=True)),
+                ("CumulativeDaysOnMarket", models.IntegerField(null=True)),
+                ("OriginalEntryTimestamp", models.DateTimeField(null=True)),
+                ("ListingContractDate", models.DateField(null=True)),
+                ("PriceChangeTimestamp", models.DateTimeField(null=True)),
+                ("ModificationTimestamp", models.DateTimeField(null=True)),
+                ("OffMarketDate", models.DateField(null=True)),
+                ("OnMarketDate", models.DateField(null=True)),
+                ("MajorChangeTimestamp", models.DateTimeField(null=True)),
+                ("StatusChangeTimestamp", models.DateTimeField(null=True)),
+                ("CoBuyerAgentKey", models.CharField(max_length=255, null=True)),
+                ("CoBuyerOfficeKey", models.CharField(max_length=255, null=True)),
+                ("CoListAgentKey", models.CharField(max_length=255, null=True)),
+                ("City", models.CharField(max_length=50, null=True)),
+                ("County", models.CharField(max_length=255, null=True)),
+                ("StreetNumber", models.CharField(max_length=25, null=True)),
+                ("PostalCode", models.CharField(max_length=10, null=True)),
+                ("StateOrProvince", models.CharField(max_length=255, null=True)),
+                ("StreetName", models.CharField(max_length=50, null=True)),
+                ("UnitNumber", models.CharField(max_length=25, null=True)),
+                ("UnparsedAddress", models.CharField(max_length=255, null=True)),
+                ("FullStreetAddress", models.CharField(max_length=80, null=True)),
+                ("CoListOfficeKey", models.CharField(max_length=255, null=True)),
+                ("SubdivisionName", models.CharField(max_length=50, null=True)),
+                ("Latitude", models.CharField(max_length=255, null=True)),
+                ("Longitude", models.CharField(max_length=255, null=True)),
+                ("ListAgentMlsId", models.CharField(max_length=25, null=True)),
+                ("ListAgentKey", models.CharField(max_length=255, null=True)),
+                ("ListOfficeKey", models.CharField(max_length=255, null=True)),
+                ("ListOfficeMlsId", models.CharField(max_length=25, null=True)),
+                ("BathroomsTotalInteger", models.CharField(max_length=255, null=True)),
+                ("BedroomsTotal", models.IntegerField(null=True)),
+                ("LivingArea", models.IntegerField(null=True)),
+                ("YearBuilt", models.IntegerField(null=True)),
+                ("PropertySubType", models.CharField(max_length=255, null=True)),
+                ("PropertyType", models.CharField(max_length=255, null=True)),
+                ("PhotosChangeTimestamp", models.DateTimeField(null=True)),
+            ],
+            options={
+                "verbose_name_plural": "BrightProperties",
+                "indexes": [
+                    models.Index(
+                        fields=["ModificationTimestamp"],
+                        name="brightmls_b_Modific_3c3ee6_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            f'INSERT INTO "brightmls_brightproperties" ({COLUMN_LIST}) '
+            f'SELECT {COLUMN_LIST} FROM "brightmls_brightpropertiesdetails"',
+            reverse_sql='UPDATE "brightmls_brightpropertiesdetails" AS d SET '
+            + ", ".join(
+                f'"{column}" = h."{column}"'
+                for column in HOT_COLUMNS
+                if column != "ListingKey"
+            )
+            + ' FROM "brightmls_brightproperties" AS h '
+            'WHERE d."ListingKey" = h."ListingKey"',
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="Location",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="BuyerAgentKey",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ListingId",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="StandardStatus",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="MlsStatus",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="BuyerOfficeKey",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ClosePrice",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ListPriceLow",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="PreviousListPrice",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ListPrice",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="OriginalListPrice",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="CloseDate",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="DaysOnMarket",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="CumulativeDaysOnMarket",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="OriginalEntryTimestamp",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ListingContractDate",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="PriceChangeTimestamp",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ModificationTimestamp",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="OffMarketDate",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="OnMarketDate",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="MajorChangeTimestamp",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="StatusChangeTimestamp",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="CoBuyerAgentKey",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="CoBuyerOfficeKey",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="CoListAgentKey",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="City",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="County",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="StreetNumber",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="PostalCode",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="StateOrProvince",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="StreetName",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="UnitNumber",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="UnparsedAddress",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="FullStreetAddress",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="CoListOfficeKey",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="SubdivisionName",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="Latitude",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="Longitude",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ListAgentMlsId",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ListAgentKey",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ListOfficeKey",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="ListOfficeMlsId",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="BathroomsTotalInteger",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="BedroomsTotal",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="LivingArea",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="YearBuilt",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="PropertySubType",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="PropertyType",
+        ),
+        migrations.RemoveField(
+            model_name="brightpropertiesdetails",
+            name="PhotosChangeTimestamp",
+        ),
+    ]
@@ -0,0 +1,179 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:59
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brightmls", "0005_brightpropertiesdetails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="brightoffices",
+            name="OfficeLatitudeNumeric",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        OfficeLatitude__regex="^-?[0-9]{1,3}(\\.[0-9]+)?$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "OfficeLatitude", models.FloatField()
+                        ),
+                    ),
+                    default=None,
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="brightoffices",
+            name="OfficeLongitudeNumeric",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        OfficeLongitude__regex="^-?[0-9]{1,3}(\\.[0-9]+)?$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "OfficeLongitude", models.FloatField()
+                        ),
+                    ),
+                    default=None,
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="brightproperties",
+            name="ClosePriceNumeric",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        ClosePrice__regex="^-?[0-9]{1,12}(\\.[0-9]+)?$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "ClosePrice",
+                            models.DecimalField(decimal_places=2, max_digits=14),
+                        ),
+                    ),
+                    default=None,
+                ),
+                output_field=models.DecimalField(decimal_places=2, max_digits=14),
+            ),
+        ),
+        migrations.AddField(
+            model_name="brightproperties",
+            name="LatitudeNumeric",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        Latitude__regex="^-?[0-9]{1,3}(\\.[0-9]+)?$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "Latitude", models.FloatField()
+                        ),
+                    ),
+                    default=None,
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="brightproperties",
+            name="ListPriceNumeric",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        ListPrice__regex="^-?[0-9]{1,12}(\\.[0-9]+)?$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "ListPrice",
+                            models.DecimalField(decimal_places=2, max_digits=14),
+                        ),
+                    ),
+                    default=None,
+                ),
+                output_field=models.DecimalField(decimal_places=2, max_digits=14),
+            ),
+        ),
+        migrations.AddField(
+            model_name="brightproperties",
+            name="LongitudeNumeric",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        Longitude__regex="^-?[0-9]{1,3}(\\.[0-9]+)?$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "Longitude", models.FloatField()
+                        ),
+                    ),
+                    default=None,
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="brightproperties",
+            name="OriginalListPriceNumeric",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        OriginalListPrice__regex="^-?[0-9]{1,12}(\\.[0-9]+)?$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "OriginalListPrice",
+                            models.DecimalField(decimal_places=2, max_digits=14),
+                        ),
+                    ),
+                    default=None,
+                ),
+                output_field=models.DecimalField(decimal_places=2, max_digits=14),
+            ),
+        ),
+        migrations.AddField(
+            model_name="brightproperties",
+            name="PreviousListPriceNumeric",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        PreviousListPrice__regex="^-?[0-9]{1,12}(\\.[0-9]+)?$",
+                        then=django.db.models.functions.comparison.Cast(
+                            "PreviousListPrice",
+                            models.DecimalField(decimal_places=2, max_digits=14),
+                        ),
+                    ),
+                    default=None,
+                ),
+                output_field=models.DecimalField(decimal_places=2, max_digits=14),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightoffices",
+            index=models.Index(
+                fields=["OfficeLatitudeNumeric", "OfficeLongitudeNumeric"],
+                name="brightmls_b_OfficeL_4ced37_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=models.Index(
+                fields=["ListPriceNumeric"], name="brightmls_b_ListPri_e7c814_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=models.Index(
+                fields=["ClosePriceNumeric"], name="brightmls_b_ClosePr_867949_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=models.Index(
+                fields=["LatitudeNumeric", "LongitudeNumeric"],
+                name="brightmls_b_Latitud_869504_idx",
+            ),
+        ),
+    ]
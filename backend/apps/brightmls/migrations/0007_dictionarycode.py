@@ -0,0 +1,142 @@
+# Generated by Django 5.1.2 on 2026-10-19 19:20
+
+import brightmls.fields
+from django.db import migrations, models
+
+# (model, field, dictionary, max length of the CharField)
+DICTIONARY_FIELDS = [
+    ("brightmedia", "County", "County", 255),
+    ("brightmedia", "MediaCategory", "MediaCategory", 255),
+    ("brightmedia", "MediaSubSystemLocale", "SubSystemLocale", 255),
+    ("brightmedia", "MediaSystemLocale", "SystemLocale", 255),
+    ("brightmedia", "MlsStatus", "MlsStatus", 255),
+    ("brightmedia", "PropertyType", "PropertyType", 255),
+    ("brightmembers", "MemberSubSystemLocale", "SubSystemLocale", 255),
+    ("brightmembers", "MemberSystemLocale", "SystemLocale", 255),
+    ("brightoffices", "OfficeSubSystemLocale", "SubSystemLocale", 255),
+    ("brightoffices", "OfficeSystemLocale", "SystemLocale", 255),
+    ("brightopenhouses", "County", "County", 255),
+    ("brightopenhouses", "MlsStatus", "MlsStatus", 255),
+    ("brightopenhouses", "OpenHouseSubSystemLocale", "SubSystemLocale", 255),
+    ("brightopenhouses", "OpenHouseSystemLocale", "SystemLocale", 255),
+    ("brightproperties", "County", "County", 255),
+    ("brightproperties", "MlsStatus", "MlsStatus", 255),
+    ("brightproperties", "PropertyType", "PropertyType", 255),
+    ("brightproperties", "StandardStatus", "StandardStatus", 255),
+    ("brightpropertiesdetails", "SubSystemLocale", "SubSystemLocale", 255),
+    ("brightpropertiesdetails", "SystemLocale", "SystemLocale", 255),
+    ("greenverification", "County", "County", 255),
+    ("greenverification", "GreenVerificationSubSystemLocale", "SubSystemLocale", 255),
+    ("greenverification", "GreenVerificationSystemLocale", "SystemLocale", 255),
+    ("history", "PropHistChangeType", "PropHistChangeType", 20),
+    ("history", "PropHistSubSystemLocale", "SubSystemLocale", 255),
+    ("history", "PropHistSystemLocale", "SystemLocale", 255),
+    ("partypermissions", "PartyPermSubSystemLocale", "SubSystemLocale", 255),
+    ("partypermissions", "PartyPermSystemLocale", "SystemLocale", 255),
+    ("room", "County", "County", 255),
+    ("room", "RoomSubSystemLocale", "SubSystemLocale", 255),
+    ("room", "RoomSystemLocale", "SystemLocale", 255),
+    ("sysagentmedia", "SysMediaSubSystemLocale", "SubSystemLocale", 255),
+    ("sysagentmedia", "SysMediaSystemLocale", "SystemLocale", 255),
+    ("sysofficemedia", "SysMediaSubSystemLocale", "SubSystemLocale", 255),
+    ("sysofficemedia", "SysMediaSystemLocale", "SystemLocale", 255),
+    ("syspartylicense", "SysPartyLicenseSubSystemLocale", "SubSystemLocale", 255),
+    ("syspartylicense", "SysPartyLicenseSystemLocale", "SystemLocale", 255),
+    ("team", "TeamSubSystemLocale", "SubSystemLocale", 255),
+    ("team", "TeamSystemLocale", "SystemLocale", 255),
+    ("unit", "County", "County", 255),
+    ("unit", "UnitSubSystemLocale", "SubSystemLocale", 255),
+    ("unit", "UnitSystemLocale", "SystemLocale", 255),
+]
+
+ENCODE_FUNCTION = """
+CREATE OR REPLACE FUNCTION brightmls_dictionary_encode(p_dictionary text, p_value text)
+RETURNS smallint LANGUAGE plpgsql AS $$
+DECLARE
+    result smallint;
+BEGIN
+    IF p_value IS NULL THEN
+        RETURN NULL;
+    END IF;
+    SELECT code INTO result FROM brightmls_dictionarycode
+    WHERE dictionary = p_dictionary AND value = p_value;
+    IF result IS NULL THEN
+        -- one writer per dictionary, so a code is never taken twice
+        PERFORM pg_advisory_xact_lock(hashtext('brightmls_dictionary:' || p_dictionary));
+        SELECT code INTO result FROM brightmls_dictionarycode
+        WHERE dictionary = p_dictionary AND value = p_value;
+        IF result IS NULL THEN
+            SELECT COALESCE(MAX(code), 0) + 1 INTO result FROM brightmls_dictionarycode
+            WHERE dictionary = p_dictionary;
+            INSERT INTO brightmls_dictionarycode (dictionary, code, value)
+            VALUES (p_dictionary, result, p_value);
+        END IF;
+    END IF;
+    RETURN result;
+END
+$$
+"""
+
+DECODE_FUNCTION = """
+CREATE OR REPLACE FUNCTION brightmls_dictionary_decode(p_dictionary text, p_code smallint)
+RETURNS text LANGUAGE sql STABLE AS $$
+    SELECT value FROM brightmls_dictionarycode
+    WHERE dictionary = p_dictionary AND code = p_code
+$$
+"""
+
+
+def dictionary_field(model_name, field_name, dictionary, max_length):
+    """
+    The column stays text, tables are encoded on demand (mls_dictionary --encode)
+    """
+    return migrations.AlterField(
+        model_name=model_name,
+        name=field_name,
+        field=brightmls.fields.DictionaryField(
+            dictionary=dictionary, max_length=max_length, null=True
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brightmls", "0006_numeric_values"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DictionaryCode",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dictionary", models.CharField(max_length=64)),
+                ("code", models.SmallIntegerField()),
+                ("value", models.CharField(max_length=1024)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dictionary", "value"), name="dictionarycode_value_uniq"
+                    ),
+                    models.UniqueConstraint(
+                        fields=("dictionary", "code"), name="dictionarycode_code_uniq"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            [ENCODE_FUNCTION, DECODE_FUNCTION],
+            reverse_sql=[
+                "DROP FUNCTION brightmls_dictionary_encode(text, text)",
+                "DROP FUNCTION brightmls_dictionary_decode(text, smallint)",
+            ],
+        ),
+    ] + [dictionary_field(*field) for field in DICTIONARY_FIELDS]
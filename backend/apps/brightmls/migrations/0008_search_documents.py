@@ -0,0 +1,94 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brightmls", "0007_dictionarycode"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="brightproperties",
+            name="SearchDocument",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.CombinedSearchVector(
+                        django.contrib.postgres.search.CombinedSearchVector(
+                            django.contrib.postgres.search.CombinedSearchVector(
+                                django.contrib.postgres.search.CombinedSearchVector(
+                                    django.contrib.postgres.search.SearchVector(
+                                        "ListingId", config="english", weight="A"
+                                    ),
+                                    "||",
+                                    django.contrib.postgres.search.SearchVector(
+                                        "FullStreetAddress",
+                                        config="english",
+                                        weight="A",
+                                    ),
+                                    django.contrib.postgres.search.SearchConfig(
+                                        "english"
+                                    ),
+                                ),
+                                "||",
+                                django.contrib.postgres.search.SearchVector(
+                                    "UnparsedAddress", config="english", weight="A"
+                                ),
+                                django.contrib.postgres.search.SearchConfig("english"),
+                            ),
+                            "||",
+                            django.contrib.postgres.search.SearchVector(
+                                "City", config="english", weight="B"
+                            ),
+                            django.contrib.postgres.search.SearchConfig("english"),
+                        ),
+                        "||",
+                        django.contrib.postgres.search.SearchVector(
+                            "PostalCode", config="english", weight="B"
+                        ),
+                        django.contrib.postgres.search.SearchConfig("english"),
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "SubdivisionName", config="english", weight="B"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("english"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="brightpropertiesdetails",
+            name="SearchDocument",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.SearchVector(
+                        "PublicRemarks", config="english", weight="A"
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "SyndicationRemarks", config="english", weight="B"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("english"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["SearchDocument"], name="brightmls_b_SearchD_660bc2_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightpropertiesdetails",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["SearchDocument"], name="brightmls_b_SearchD_9c31ea_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:07
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brightmls", "0008_search_documents"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="brightmembers",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["MemberFullName"],
+                name="brightmembers_fullname_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightmembers",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["MemberEmail"],
+                name="brightmembers_email_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightoffices",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["OfficeName"],
+                name="brightoffices_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightoffices",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["OfficeAddress1"],
+                name="brightoffices_address1_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["FullStreetAddress"],
+                name="brightproperties_address_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["City"],
+                name="brightproperties_city_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["PostalCode"],
+                name="brightproperties_postal_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["SubdivisionName"],
+                name="brightproperties_subdiv_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:17
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brightmls", "0009_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="brightoffices",
+            name="brightmls_b_OfficeL_4ced37_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="brightproperties",
+            name="brightmls_b_Latitud_869504_idx",
+        ),
+        migrations.AddIndex(
+            model_name="brightoffices",
+            index=django.contrib.postgres.indexes.GistIndex(
+                models.Func(
+                    models.F("OfficeLongitudeNumeric"),
+                    models.F("OfficeLatitudeNumeric"),
+                    function="point",
+                ),
+                name="brightoffices_location_gist",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="brightproperties",
+            index=django.contrib.postgres.indexes.GistIndex(
+                models.Func(
+                    models.F("LongitudeNumeric"),
+                    models.F("LatitudeNumeric"),
+                    function="point",
+                ),
+                name="brightproperties_location_gist",
+            ),
+        ),
+    ]
@@ -1,6 +1,82 @@
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models.functions import Cast
 from django.utils.dateparse import parse_datetime
 from bulk_update_or_create import BulkUpdateOrCreateQuerySet
+from brightmls.fields import DictionaryField
+
+PRICE_PATTERN = r"^-?[0-9]{1,12}(\.[0-9]+)?$"
+COORDINATE_PATTERN = r"^-?[0-9]{1,3}(\.[0-9]+)?$"
+# text search configuration of the search documents and of the queries matching them
+SEARCH_CONFIG = "english"
+
+
+def numeric_value(field_name, pattern, output_field):
+    """
+    Column with the value of a text field as a number, computed by Postgres on every
+    write (stored generated column), so range filters and sorts can use indexes.
+    NULL when the text does not match the pattern, a bad value never fails an insert.
+    """
+    return models.GeneratedField(
+        expression=models.Case(
+            models.When(
+                **{f"{field_name}__regex": pattern},
+                then=Cast(field_name, output_field.clone()),
+            ),
+            default=None,
+        ),
+        output_field=output_field,
+        db_persist=True,
+    )
+
+
+def location_point(longitude_field, latitude_field):
+    """
+    point(longitude, latitude) of typed coordinates: the expression of the GiST
+    indexes of map searches, queries must use the same expression (see
+    services.search.in_bounding_box)
+    """
+    return models.Func(
+        models.F(longitude_field), models.F(latitude_field), function="point"
+    )
+
+
+def price_value(field_name):
+    return numeric_value(
+        field_name, PRICE_PATTERN, models.DecimalField(max_digits=14, decimal_places=2)
+    )
+
+
+def coordinate_value(field_name):
+    return numeric_value(field_name, COORDINATE_PATTERN, models.FloatField())
+
+
+def search_document(**weighted_fields):
+    """
+    tsvector column of text fields, computed by Postgres on every write (stored
+    generated column) and searched through a GIN index (see services.search).
+
+    usage: SearchDocument = search_document(A=["FullStreetAddress"], B=["City"])
+    """
+    vector = None
+    for weight, field_names in sorted(weighted_fields.items()):
+        for field_name in field_names:
+            field_vector = SearchVector(field_name, config=SEARCH_CONFIG, weight=weight)
+            vector = field_vector if vector is None else vector + field_vector
+    return models.GeneratedField(
+        expression=vector,
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+
+def trigram_index(field_name, name):
+    """
+    GIN index of the trigrams of a text field (pg_trgm), serving fuzzy lookups of
+    partial or misspelled names and addresses (trigram_word_similar, see services.search)
+    """
+    return GinIndex(fields=[field_name], name=name, opclasses=["gin_trgm_ops"])
 
 
 class BaseModel(models.Model):
@@ -13,14 +89,30 @@ class BaseModel(models.Model):
 
     objects = BulkUpdateOrCreateQuerySet.as_manager()
 
+    # names of 1:1 models storing more columns of the same entity (vertical split),
+    # with the same primary key. They are requested and written together with this model
+    parts = ()
+
     class Meta:
         abstract = True
 
+    @classmethod
+    def get_part_models(cls):
+        """
+        Models storing the entity: this model first, then its parts (looked up in the
+        registry of the model, which is a private one for shadow models)
+        """
+        return [cls] + [
+            cls._meta.apps.get_registered_model(cls._meta.app_label, name)
+            for name in cls.parts
+        ]
+
     @classmethod
     def from_python_odata(cls, odata_obj):
         """
         Generic method to map python_odata entity fields to Django model fields.
         Automatically matches fields based on name.
+        Accepts either an entity object or a raw dict row (returned by queries with $select).
         """
         field_values = {}
         for field in cls._meta.get_fields():
@@ -28,8 +120,8 @@ class BaseModel(models.Model):
             # Map python_odata field to the model field if it exists in the odata object
             odata_field = cls._map_field_name_to_odata(field_name)
             # print(">>>>>>> OData field:", odata_field)
-            if hasattr(odata_obj, odata_field):
-                value = getattr(odata_obj, odata_field)
+            if cls._has_odata_value(odata_obj, odata_field):
+                value = cls._get_odata_value(odata_obj, odata_field)
 
                 # Parse datetime fields if necessary (if returned as a string from odata)
                 if isinstance(field, models.DateTimeField) and isinstance(value, str):
@@ -40,7 +132,7 @@ class BaseModel(models.Model):
                     # Handle foreign key relationships
                     related_model = field.related_model
                     # print(">>>>>>> Related model:", related_model)
-                    related_key = getattr(odata_obj, odata_field, None)
+                    related_key = value
                     # print(">>>>>>> Related key:", related_key)
                     if related_key:
                         # find primary key from the related model
@@ -58,6 +150,32 @@ class BaseModel(models.Model):
         # print("field_values:", field_values)
         return cls(**field_values)
 
+    @classmethod
+    def get_odata_field_names(cls):
+        """
+        OData property names of all concrete model fields (of all parts). Used to build
+        $select, so only the columns we actually store are requested from the API.
+        """
+        names = []
+        for model_class in cls.get_part_models():
+            for field in model_class._meta.concrete_fields:
+                name = cls._map_field_name_to_odata(field.name)
+                if name not in names:
+                    names.append(name)
+        return names
+
+    @staticmethod
+    def _has_odata_value(odata_obj, odata_field):
+        if isinstance(odata_obj, dict):
+            return odata_field in odata_obj
+        return hasattr(odata_obj, odata_field)
+
+    @staticmethod
+    def _get_odata_value(odata_obj, odata_field, default=None):
+        if isinstance(odata_obj, dict):
+            return odata_obj.get(odata_field, default)
+        return getattr(odata_obj, odata_field, default)
+
     @staticmethod
     def _map_field_name_to_odata(field_name):
         """
@@ -77,8 +195,8 @@ class BaseModel(models.Model):
                 continue
 
             field_name = field.name
-            if hasattr(odata_obj, field_name):
-                value = getattr(odata_obj, field_name)
+            if self._has_odata_value(odata_obj, field_name):
+                value = self._get_odata_value(odata_obj, field_name)
                 if isinstance(field, models.DateTimeField) and isinstance(value, str):
                     value = parse_datetime(value)
 
@@ -87,10 +205,12 @@ class BaseModel(models.Model):
 
 class BrightMedia(BaseModel):
     Location = models.CharField(max_length=255, null=True)
-    PropertyType = models.CharField(max_length=255, null=True)
-    County = models.CharField(max_length=255, null=True)
+    PropertyType = DictionaryField(dictionary="PropertyType", max_length=255, null=True)
+    County = DictionaryField(dictionary="County", max_length=255, null=True)
     MediaBytes = models.CharField(max_length=255, null=True)
-    MediaCategory = models.CharField(max_length=255, null=True)
+    MediaCategory = DictionaryField(
+        dictionary="MediaCategory", max_length=255, null=True
+    )
     MediaCreationTimestamp = models.DateTimeField(null=True)
     MediaExternalKey = models.CharField(max_length=20, null=True)
     MediaFileName = models.CharField(max_length=3000, null=True)
@@ -106,8 +226,12 @@ class BrightMedia(BaseModel):
     MediaShortDescription = models.CharField(max_length=50, null=True)
     MediaSizeDescription = models.CharField(max_length=255, null=True)
     MediaSourceFileName = models.CharField(max_length=3000, null=True)
-    MediaSubSystemLocale = models.CharField(max_length=255, null=True)
-    MediaSystemLocale = models.CharField(max_length=255, null=True)
+    MediaSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
+    MediaSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
     MediaType = models.CharField(max_length=255, null=True)
     MediaURL = models.URLField(max_length=4000, null=True)
     MediaURLFull = models.URLField(max_length=4000, null=True)
@@ -115,7 +239,7 @@ class BrightMedia(BaseModel):
     MediaURLHiRes = models.URLField(max_length=4000, null=True)
     MediaURLMedium = models.URLField(max_length=4000, null=True)
     MediaURLThumb = models.URLField(max_length=4000, null=True)
-    MlsStatus = models.CharField(max_length=255, null=True)
+    MlsStatus = DictionaryField(dictionary="MlsStatus", max_length=255, null=True)
     PreferredPhotoYN = models.BooleanField(null=True)
     ResourceName = models.CharField(max_length=255, null=True)
     ListingId = models.CharField(max_length=255, null=True)
@@ -225,8 +349,12 @@ class BrightMembers(BaseModel):
     MemberSourceBusinessPartner = models.CharField(max_length=255, null=True)
     MemberSourceTransport = models.CharField(max_length=255, null=True)
     SyndicateTo = models.JSONField(default=list)
-    MemberSubSystemLocale = models.CharField(max_length=255, null=True)
-    MemberSystemLocale = models.CharField(max_length=255, null=True)
+    MemberSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
+    MemberSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
     MemberPreferredFirstName = models.CharField(max_length=128, null=True)
     MemberPreferredLastName = models.CharField(max_length=128, null=True)
     MemberBrightConvertedYN = models.BooleanField(null=True)
@@ -240,6 +368,8 @@ class BrightMembers(BaseModel):
         verbose_name_plural = "BrightMembers"
         indexes = [
             models.Index(fields=["ModificationTimestamp"]),
+            trigram_index("MemberFullName", "brightmembers_fullname_trgm"),
+            trigram_index("MemberEmail", "brightmembers_email_trgm"),
         ]
 
     def __str__(self) -> str:
@@ -302,8 +432,12 @@ class BrightOffices(BaseModel):
     OfficeUnitDesignation = models.CharField(max_length=255, null=True)
     OfficeUnitNumber = models.CharField(max_length=20, null=True)
     OfficeUserName = models.CharField(max_length=30, null=True)
-    OfficeSubSystemLocale = models.CharField(max_length=255, null=True)
-    OfficeSystemLocale = models.CharField(max_length=255, null=True)
+    OfficeSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
+    OfficeSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
     SocialMediaBlogUrlOrId = models.CharField(max_length=8000, null=True)
     SocialMediaFacebookUrlOrId = models.CharField(max_length=8000, null=True)
     SocialMediaLinkedInUrlOrId = models.CharField(max_length=8000, null=True)
@@ -325,10 +459,21 @@ class BrightOffices(BaseModel):
     SourceModificationTimestamp = models.DateTimeField(null=True)
     OfficeStreetDirPrefix = models.CharField(max_length=255, null=True)
 
+    # typed copies of the coordinates, for map area searches
+    OfficeLatitudeNumeric = coordinate_value("OfficeLatitude")
+    OfficeLongitudeNumeric = coordinate_value("OfficeLongitude")
+
     class Meta:
         verbose_name_plural = "BrightOffices"
         indexes = [
             models.Index(fields=["ModificationTimestamp"]),
+            # bounding box searches (map areas)
+            GistIndex(
+                location_point("OfficeLongitudeNumeric", "OfficeLatitudeNumeric"),
+                name="brightoffices_location_gist",
+            ),
+            trigram_index("OfficeName", "brightoffices_name_trgm"),
+            trigram_index("OfficeAddress1", "brightoffices_address1_trgm"),
         ]
 
     def __str__(self) -> str:
@@ -336,9 +481,9 @@ class BrightOffices(BaseModel):
 
 
 class BrightOpenHouses(BaseModel):
-    County = models.CharField(max_length=255, null=True)
+    County = DictionaryField(dictionary="County", max_length=255, null=True)
     ListingId = models.CharField(max_length=255, null=True)
-    MlsStatus = models.CharField(max_length=255, null=True)
+    MlsStatus = DictionaryField(dictionary="MlsStatus", max_length=255, null=True)
     OpenHouseAttendedBy = models.CharField(max_length=255, null=True)
     OpenHouseCreationTimestamp = models.DateTimeField(null=True)
     OpenHouseDate = models.DateField(null=True)
@@ -351,8 +496,12 @@ class BrightOpenHouses(BaseModel):
     OpenHouseSourceInput = models.CharField(max_length=255, null=True)
     OpenHouseRemarks = models.CharField(max_length=500, null=True)
     OpenHouseSourceTransport = models.CharField(max_length=255, null=True)
-    OpenHouseSubSystemLocale = models.CharField(max_length=255, null=True)
-    OpenHouseSystemLocale = models.CharField(max_length=255, null=True)
+    OpenHouseSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
+    OpenHouseSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
     ListingSourceRecordKey = models.CharField(max_length=30, null=True)
     OpenHouseExternalSystemID = models.CharField(max_length=30, null=True)
     ListOfficeMlsId = models.CharField(max_length=25, null=True)
@@ -373,7 +522,114 @@ class BrightOpenHouses(BaseModel):
 
 
 class BrightProperties(BaseModel):
+    """
+    Property listings, split vertically: the columns read by lists, lookups and filters
+    (keys, status, prices, address, geo, timestamps, agent and office keys) are stored
+    here, all the other columns in BrightPropertiesDetails with the same ListingKey.
+    Both tables are written together (see BaseModel.parts).
+    """
+
+    parts = ("BrightPropertiesDetails",)
+
     Location = models.CharField(max_length=255, null=True)
+    BuyerAgentKey = models.CharField(max_length=255, null=True)
+    ListingId = models.CharField(max_length=255, null=True)
+    ListingKey = models.BigIntegerField(primary_key=True)
+    StandardStatus = DictionaryField(
+        dictionary="StandardStatus", max_length=255, null=True
+    )
+    MlsStatus = DictionaryField(dictionary="MlsStatus", max_length=255, null=True)
+    BuyerOfficeKey = models.CharField(max_length=255, null=True)
+    ClosePrice = models.CharField(max_length=255, null=True)
+    ListPriceLow = models.CharField(max_length=255, null=True)
+    PreviousListPrice = models.CharField(max_length=255, null=True)
+    ListPrice = models.CharField(max_length=255, null=True)
+    OriginalListPrice = models.CharField(max_length=255, null=True)
+    CloseDate = models.DateField(null=True)
+    DaysOnMarket = models.IntegerField(null=True)
+    CumulativeDaysOnMarket = models.IntegerField(null=True)
+    OriginalEntryTimestamp = models.DateTimeField(null=True)
+    ListingContractDate = models.DateField(null=True)
+    PriceChangeTimestamp = models.DateTimeField(null=True)
+    ModificationTimestamp = models.DateTimeField(null=True)
+    OffMarketDate = models.DateField(null=True)
+    OnMarketDate = models.DateField(null=True)
+    MajorChangeTimestamp = models.DateTimeField(null=True)
+    StatusChangeTimestamp = models.DateTimeField(null=True)
+    CoBuyerAgentKey = models.CharField(max_length=255, null=True)
+    CoBuyerOfficeKey = models.CharField(max_length=255, null=True)
+    CoListAgentKey = models.CharField(max_length=255, null=True)
+    City = models.CharField(max_length=50, null=True)
+    County = DictionaryField(dictionary="County", max_length=255, null=True)
+    StreetNumber = models.CharField(max_length=25, null=True)
+    PostalCode = models.CharField(max_length=10, null=True)
+    StateOrProvince = models.CharField(max_length=255, null=True)
+    StreetName = models.CharField(max_length=50, null=True)
+    UnitNumber = models.CharField(max_length=25, null=True)
+    UnparsedAddress = models.CharField(max_length=255, null=True)
+    FullStreetAddress = models.CharField(max_length=80, null=True)
+    CoListOfficeKey = models.CharField(max_length=255, null=True)
+    SubdivisionName = models.CharField(max_length=50, null=True)
+    Latitude = models.CharField(max_length=255, null=True)
+    Longitude = models.CharField(max_length=255, null=True)
+    ListAgentMlsId = models.CharField(max_length=25, null=True)
+    ListAgentKey = models.CharField(max_length=255, null=True)
+    ListOfficeKey = models.CharField(max_length=255, null=True)
+    ListOfficeMlsId = models.CharField(max_length=25, null=True)
+    BathroomsTotalInteger = models.CharField(max_length=255, null=True)
+    BedroomsTotal = models.IntegerField(null=True)
+    LivingArea = models.IntegerField(null=True)
+    YearBuilt = models.IntegerField(null=True)
+    PropertySubType = models.CharField(max_length=255, null=True)
+    PropertyType = DictionaryField(dictionary="PropertyType", max_length=255, null=True)
+    PhotosChangeTimestamp = models.DateTimeField(null=True)
+
+    # typed copies of the prices and coordinates, for price ranges, sorts and map areas
+    ListPriceNumeric = price_value("ListPrice")
+    ClosePriceNumeric = price_value("ClosePrice")
+    OriginalListPriceNumeric = price_value("OriginalListPrice")
+    PreviousListPriceNumeric = price_value("PreviousListPrice")
+    LatitudeNumeric = coordinate_value("Latitude")
+    LongitudeNumeric = coordinate_value("Longitude")
+
+    # keyword search by listing id and address, the remarks are in BrightPropertiesDetails
+    SearchDocument = search_document(
+        A=["ListingId", "FullStreetAddress", "UnparsedAddress"],
+        B=["City", "PostalCode", "SubdivisionName"],
+    )
+
+    class Meta:
+        verbose_name_plural = "BrightProperties"
+        indexes = [
+            models.Index(fields=["ModificationTimestamp"]),
+            models.Index(fields=["ListPriceNumeric"]),
+            models.Index(fields=["ClosePriceNumeric"]),
+            # bounding box searches (map areas)
+            GistIndex(
+                location_point("LongitudeNumeric", "LatitudeNumeric"),
+                name="brightproperties_location_gist",
+            ),
+            GinIndex(fields=["SearchDocument"]),
+            trigram_index("FullStreetAddress", "brightproperties_address_trgm"),
+            trigram_index("City", "brightproperties_city_trgm"),
+            trigram_index("PostalCode", "brightproperties_postal_trgm"),
+            trigram_index("SubdivisionName", "brightproperties_subdiv_trgm"),
+        ]
+
+    def __str__(self) -> str:
+        return str(self.ListingKey)
+
+    @property
+    def details(self):
+        return BrightPropertiesDetails.objects.filter(pk=self.pk).first()
+
+
+class BrightPropertiesDetails(BaseModel):
+    """
+    Rarely read columns of BrightProperties (remarks, compensation, association, tax,
+    structure details...), one row per listing
+    """
+
     BuyerAgentMlsId = models.CharField(max_length=25, null=True)
     BuyerAgentCellPhone = models.CharField(max_length=16, null=True)
     BuyerAgentDirectPhone = models.CharField(max_length=16, null=True)
@@ -382,7 +638,6 @@ class BrightProperties(BaseModel):
     BuyerAgentFax = models.CharField(max_length=16, null=True)
     BuyerAgentFirstName = models.CharField(max_length=50, null=True)
     BuyerAgentFullName = models.CharField(max_length=150, null=True)
-    BuyerAgentKey = models.CharField(max_length=255, null=True)
     BuyerAgentLastName = models.CharField(max_length=50, null=True)
     BuyerAgentNameSuffix = models.CharField(max_length=255, null=True)
     BuyerAgentOfficePhone = models.CharField(max_length=16, null=True)
@@ -405,11 +660,8 @@ class BrightProperties(BaseModel):
     HomeWarrantyYN = models.BooleanField(null=True)
     ListingAgreementType = models.CharField(max_length=255, null=True)
     ProspectsExcludedYN = models.BooleanField(null=True)
-    ListingId = models.CharField(max_length=255, null=True)
     ListingKey = models.BigIntegerField(primary_key=True)
     ListingServiceType = models.CharField(max_length=255, null=True)
-    StandardStatus = models.CharField(max_length=255, null=True)
-    MlsStatus = models.CharField(max_length=255, null=True)
     AuctionBuyerPremium = models.CharField(max_length=255, null=True)
     AuctionBuyerPremiumType = models.CharField(max_length=255, null=True)
     AuctionEndDate = models.DateField(null=True)
@@ -429,8 +681,10 @@ class BrightProperties(BaseModel):
     ListingSourceRecordID = models.CharField(max_length=255, null=True)
     ListingSourceRecordKey = models.CharField(max_length=30, null=True)
     ListingSourceBusinessPartner = models.CharField(max_length=255, null=True)
-    SystemLocale = models.CharField(max_length=255, null=True)
-    SubSystemLocale = models.CharField(max_length=255, null=True)
+    SystemLocale = DictionaryField(dictionary="SystemLocale", max_length=255, null=True)
+    SubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
     TotalBrokerOpenHouses = models.IntegerField(null=True)
     TotalOpenHouses = models.IntegerField(null=True)
     TotalPublicOpenHouses = models.IntegerField(null=True)
@@ -465,7 +719,6 @@ class BrightProperties(BaseModel):
     ClientApplicationEditedYN = models.BooleanField(null=True)
     ScheduledSubmissionAction = models.CharField(max_length=255, null=True)
     CopiedFromKeys = models.CharField(max_length=128, null=True)
-    BuyerOfficeKey = models.CharField(max_length=255, null=True)
     BuyerOfficeEmail = models.CharField(max_length=80, null=True)
     BuyerOfficeFax = models.CharField(max_length=16, null=True)
     BuyerOfficeName = models.CharField(max_length=50, null=True)
@@ -481,31 +734,15 @@ class BrightProperties(BaseModel):
     BuyerOfficeResponsibleBrokerLicenseNumber = models.CharField(
         max_length=128, null=True
     )
-    ClosePrice = models.CharField(max_length=255, null=True)
-    ListPriceLow = models.CharField(max_length=255, null=True)
-    PreviousListPrice = models.CharField(max_length=255, null=True)
-    ListPrice = models.CharField(max_length=255, null=True)
-    OriginalListPrice = models.CharField(max_length=255, null=True)
     CancelationDate = models.DateField(null=True)
-    CloseDate = models.DateField(null=True)
     PurchaseContractDate = models.DateField(null=True)
-    DaysOnMarket = models.IntegerField(null=True)
-    CumulativeDaysOnMarket = models.IntegerField(null=True)
     ExpirationDate = models.DateField(null=True)
-    OriginalEntryTimestamp = models.DateTimeField(null=True)
     MLSListDate = models.DateField(null=True)
-    ListingContractDate = models.DateField(null=True)
-    PriceChangeTimestamp = models.DateTimeField(null=True)
     MajorChangeType = models.CharField(max_length=255, null=True)
-    ModificationTimestamp = models.DateTimeField(null=True)
     BaseOffMarketDate = models.DateField(null=True)
-    OffMarketDate = models.DateField(null=True)
     OffMarketTimestamp = models.DateTimeField(null=True)
-    OnMarketDate = models.DateField(null=True)
     OnMarketTimestamp = models.DateTimeField(null=True)
     PendingTimestamp = models.DateTimeField(null=True)
-    MajorChangeTimestamp = models.DateTimeField(null=True)
-    StatusChangeTimestamp = models.DateTimeField(null=True)
     WithdrawnDate = models.DateField(null=True)
     ContingentDate = models.DateField(null=True)
     ContractStatusChangeDate = models.DateField(null=True)
@@ -527,7 +764,6 @@ class BrightProperties(BaseModel):
     CoBuyerAgentFirstName = models.CharField(max_length=50, null=True)
     CoBuyerAgentFullName = models.CharField(max_length=150, null=True)
     CoBuyerAgentMlsId = models.CharField(max_length=25, null=True)
-    CoBuyerAgentKey = models.CharField(max_length=255, null=True)
     CoBuyerAgentLastName = models.CharField(max_length=50, null=True)
     CoBuyerAgentNameSuffix = models.CharField(max_length=255, null=True)
     CoBuyerAgentOfficePhone = models.CharField(max_length=16, null=True)
@@ -545,7 +781,6 @@ class BrightProperties(BaseModel):
     CoBuyerAgentTeamLeadStateLicenseNumber = models.CharField(max_length=256, null=True)
     CoBuyerAgentTeamName = models.CharField(max_length=250, null=True)
     CoBuyerAgentTeamLeadAgentName = models.CharField(max_length=150, null=True)
-    CoBuyerOfficeKey = models.CharField(max_length=255, null=True)
     CoBuyerOfficeEmail = models.CharField(max_length=80, null=True)
     CoBuyerOfficeFax = models.CharField(max_length=16, null=True)
     CoBuyerOfficeName = models.CharField(max_length=50, null=True)
@@ -595,7 +830,6 @@ class BrightProperties(BaseModel):
     CoListAgentFirstName = models.CharField(max_length=50, null=True)
     CoListAgentFullName = models.CharField(max_length=150, null=True)
     CoListAgentMlsId = models.CharField(max_length=25, null=True)
-    CoListAgentKey = models.CharField(max_length=255, null=True)
     CoListAgentLastName = models.CharField(max_length=50, null=True)
     CoListAgentNameSuffix = models.CharField(max_length=255, null=True)
     CoListAgentOfficePhone = models.CharField(max_length=16, null=True)
@@ -613,31 +847,21 @@ class BrightProperties(BaseModel):
     CoListAgentTeamLeadStateLicenseNumber = models.CharField(max_length=256, null=True)
     CoListAgentTeamName = models.CharField(max_length=250, null=True)
     CoListAgentTeamLeadAgentName = models.CharField(max_length=150, null=True)
-    City = models.CharField(max_length=50, null=True)
     CityID = models.CharField(max_length=255, null=True)
     Country = models.CharField(max_length=255, null=True)
-    County = models.CharField(max_length=255, null=True)
     IncorporatedCityName = models.CharField(max_length=50, null=True)
-    StreetNumber = models.CharField(max_length=25, null=True)
-    PostalCode = models.CharField(max_length=10, null=True)
-    StateOrProvince = models.CharField(max_length=255, null=True)
     StreetDirPrefix = models.CharField(max_length=255, null=True)
     StreetDirSuffix = models.CharField(max_length=255, null=True)
-    StreetName = models.CharField(max_length=50, null=True)
     StreetNumberNumeric = models.IntegerField(null=True)
     StreetSuffix = models.CharField(max_length=255, null=True)
     StreetSuffixModifier = models.CharField(max_length=25, null=True)
-    UnitNumber = models.CharField(max_length=25, null=True)
-    UnparsedAddress = models.CharField(max_length=255, null=True)
     PostalCodePlus4 = models.CharField(max_length=4, null=True)
     ValidationStatus = models.CharField(max_length=255, null=True)
     TrafficCount = models.JSONField(default=list)
     ListingLocale = models.CharField(max_length=255, null=True)
-    FullStreetAddress = models.CharField(max_length=80, null=True)
     TrafficCountSource = models.CharField(max_length=30, null=True)
     StreetNameAndSuffix = models.CharField(max_length=65, null=True)
     IncorporatedCityKey = models.CharField(max_length=255, null=True)
-    CoListOfficeKey = models.CharField(max_length=255, null=True)
     CoListOfficeMlsId = models.CharField(max_length=25, null=True)
     CoListOfficeEmail = models.CharField(max_length=80, null=True)
     CoListOfficeFax = models.CharField(max_length=16, null=True)
@@ -650,7 +874,6 @@ class BrightProperties(BaseModel):
     SussexDEQuadrants = models.CharField(max_length=255, null=True)
     MLSAreaMinor = models.CharField(max_length=255, null=True)
     LegalSubdivision = models.CharField(max_length=50, null=True)
-    SubdivisionName = models.CharField(max_length=50, null=True)
     AvailabilityDate = models.DateField(null=True)
     BuyerFinancing = models.JSONField(default=list)
     Concessions = models.CharField(max_length=255, null=True)
@@ -665,8 +888,6 @@ class BrightProperties(BaseModel):
     CrossStreet = models.CharField(max_length=50, null=True)
     OCCrossStreet = models.CharField(max_length=255, null=True)
     Directions = models.CharField(max_length=1024, null=True)
-    Latitude = models.CharField(max_length=255, null=True)
-    Longitude = models.CharField(max_length=255, null=True)
     MapURL = models.URLField(max_length=4000, null=True)
     BuyerAgencyCompensationType = models.CharField(max_length=255, null=True)
     BuyerAgencyCompensation = models.CharField(max_length=25, null=True)
@@ -687,7 +908,6 @@ class BrightProperties(BaseModel):
     TransactionBrokerCompensationSelection = models.CharField(max_length=255, null=True)
     BuyerAgencyCompensationSelection = models.CharField(max_length=255, null=True)
     SubAgencyCompensationSelection = models.CharField(max_length=255, null=True)
-    ListAgentMlsId = models.CharField(max_length=25, null=True)
     ListAgentCellPhone = models.CharField(max_length=16, null=True)
     ListAgentDirectPhone = models.CharField(max_length=16, null=True)
     ListAgentEmail = models.CharField(max_length=80, null=True)
@@ -695,7 +915,6 @@ class BrightProperties(BaseModel):
     ListAgentFax = models.CharField(max_length=16, null=True)
     ListAgentFirstName = models.CharField(max_length=50, null=True)
     ListAgentFullName = models.CharField(max_length=150, null=True)
-    ListAgentKey = models.CharField(max_length=255, null=True)
     ListAgentLastName = models.CharField(max_length=50, null=True)
     ListAgentNameSuffix = models.CharField(max_length=255, null=True)
     ListAgentOfficePhone = models.CharField(max_length=16, null=True)
@@ -746,11 +965,9 @@ class BrightProperties(BaseModel):
     SchoolDistrictName = models.CharField(max_length=50, null=True)
     SchoolDistrictSource = models.CharField(max_length=255, null=True)
     SchoolDistrictKey = models.CharField(max_length=255, null=True)
-    ListOfficeKey = models.CharField(max_length=255, null=True)
     ListOfficeEmail = models.CharField(max_length=80, null=True)
     ListOfficeFax = models.CharField(max_length=16, null=True)
     ListOfficeName = models.CharField(max_length=50, null=True)
-    ListOfficeMlsId = models.CharField(max_length=25, null=True)
     ListOfficePhone = models.CharField(max_length=16, null=True)
     ListOfficePhoneExt = models.IntegerField(null=True)
     ListOfficeAOR = models.CharField(max_length=255, null=True)
@@ -781,10 +998,8 @@ class BrightProperties(BaseModel):
     BelowGradeFinishedArea = models.IntegerField(null=True)
     BelowGradeFinishedAreaSource = models.CharField(max_length=255, null=True)
     Basement = models.JSONField(default=list)
-    BathroomsTotalInteger = models.CharField(max_length=255, null=True)
     BathroomsFull = models.IntegerField(null=True)
     BathroomsHalf = models.IntegerField(null=True)
-    BedroomsTotal = models.IntegerField(null=True)
     BelowGradeFinishedAreaUnits = models.CharField(max_length=255, null=True)
     BuilderName = models.CharField(max_length=50, null=True)
     BuildingAreaUnits = models.CharField(max_length=255, null=True)
@@ -824,7 +1039,6 @@ class BrightProperties(BaseModel):
     License1 = models.CharField(max_length=25, null=True)
     License2 = models.CharField(max_length=25, null=True)
     License3 = models.CharField(max_length=25, null=True)
-    LivingArea = models.IntegerField(null=True)
     LivingAreaUnits = models.CharField(max_length=255, null=True)
     Make = models.CharField(max_length=50, null=True)
     Model = models.CharField(max_length=50, null=True)
@@ -852,7 +1066,6 @@ class BrightProperties(BaseModel):
     HabitableResidenceYN = models.BooleanField(null=True)
     WallsCeilings = models.JSONField(default=list)
     WindowFeatures = models.JSONField(default=list)
-    YearBuilt = models.IntegerField(null=True)
     YearBuiltEffective = models.CharField(max_length=255, null=True)
     WalkScore = models.CharField(max_length=255, null=True)
     MobileDimUnits = models.CharField(max_length=255, null=True)
@@ -1131,8 +1344,6 @@ class BrightProperties(BaseModel):
     CommunityPoolFeatures = models.JSONField(default=list)
     PossibleUse = models.JSONField(default=list)
     ProfessionalManagementExpense = models.CharField(max_length=255, null=True)
-    PropertySubType = models.CharField(max_length=255, null=True)
-    PropertyType = models.CharField(max_length=255, null=True)
     RangeArea = models.IntegerField(null=True)
     RentControlYN = models.BooleanField(null=True)
     RoadResponsibility = models.JSONField(default=list)
@@ -1252,7 +1463,6 @@ class BrightProperties(BaseModel):
     ListPictureURL = models.URLField(max_length=4000, null=True)
     PhotoKey = models.CharField(max_length=20, null=True)
     PhotoOption = models.CharField(max_length=255, null=True)
-    PhotosChangeTimestamp = models.DateTimeField(null=True)
     TotalPhotos = models.IntegerField(null=True)
     LisMediaList = models.JSONField(default=list)
     MediaBy = models.CharField(max_length=80, null=True)
@@ -1312,10 +1522,13 @@ class BrightProperties(BaseModel):
     OfferManagementUrl = models.CharField(max_length=255, null=True)
     OfferManagementProvider = models.CharField(max_length=255, null=True)
 
+    # keyword search by the remarks shown to the public
+    SearchDocument = search_document(A=["PublicRemarks"], B=["SyndicationRemarks"])
+
     class Meta:
-        verbose_name_plural = "BrightProperties"
+        verbose_name_plural = "BrightPropertiesDetails"
         indexes = [
-            models.Index(fields=["ModificationTimestamp"]),
+            GinIndex(fields=["SearchDocument"]),
         ]
 
     def __str__(self) -> str:
@@ -1400,8 +1613,12 @@ class Deletion(BaseModel):
 
 class GreenVerification(BaseModel):
     GreenVerificationKey = models.BigIntegerField(primary_key=True)
-    GreenVerificationSystemLocale = models.CharField(max_length=255, null=True)
-    GreenVerificationSubSystemLocale = models.CharField(max_length=255, null=True)
+    GreenVerificationSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
+    GreenVerificationSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
     GreenVerificationListingKey = models.CharField(max_length=255, null=True)
     GreenVerificationBody = models.CharField(max_length=255, null=True)
     GreenVerificationProgramType = models.CharField(max_length=255, null=True)
@@ -1409,7 +1626,7 @@ class GreenVerification(BaseModel):
     GreenVerificationRating = models.CharField(max_length=255, null=True)
     GreenVerificationScore = models.IntegerField(null=True)
     GreenVerificationStatus = models.CharField(max_length=255, null=True)
-    County = models.CharField(max_length=255, null=True)
+    County = DictionaryField(dictionary="County", max_length=255, null=True)
     ListingSourceRecordKey = models.CharField(max_length=30, null=True)
     GreenVerificationModificationTimestamp = models.DateTimeField(null=True)
 
@@ -1428,7 +1645,9 @@ class History(BaseModel):
     PropHistListingKey = models.CharField(max_length=255, null=True)
     PropHistRecordKey = models.CharField(max_length=255, null=True)
     PropHistPartyKey = models.CharField(max_length=255, null=True)
-    PropHistChangeType = models.CharField(max_length=20, null=True)
+    PropHistChangeType = DictionaryField(
+        dictionary="PropHistChangeType", max_length=20, null=True
+    )
     PropHistChangeTypeLkp = models.CharField(max_length=255, null=True)
     PropHistChangeTimestamp = models.DateTimeField(null=True)
     PropHistColumnName = models.CharField(max_length=64, null=True)
@@ -1438,8 +1657,12 @@ class History(BaseModel):
     PropHistOriginalPickListValue = models.CharField(max_length=4000, null=True)
     PropHistNewPickListValue = models.CharField(max_length=4000, null=True)
     PropHistItemNumber = models.IntegerField(null=True)
-    PropHistSubSystemLocale = models.CharField(max_length=255, null=True)
-    PropHistSystemLocale = models.CharField(max_length=255, null=True)
+    PropHistSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
+    PropHistSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
     ListingID = models.CharField(max_length=20, null=True)
     FullStreetAddress = models.CharField(max_length=80, null=True)
     SystemName = models.CharField(max_length=50, null=True)
@@ -1492,9 +1715,13 @@ class PartyPermissions(BaseModel):
     PartyPermPermissionType = models.CharField(max_length=255, null=True)
     PartyPermGrantorPartyKey = models.CharField(max_length=255, null=True)
     PartyPermGranteePartyKey = models.CharField(max_length=255, null=True)
-    PartyPermSystemLocale = models.CharField(max_length=255, null=True)
+    PartyPermSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
     PpPermissionGroup = models.CharField(max_length=255, null=True)
-    PartyPermSubSystemLocale = models.CharField(max_length=255, null=True)
+    PartyPermSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
     PartyPermModificationTimestamp = models.DateTimeField(null=True)
 
     class Meta:
@@ -1543,7 +1770,7 @@ class RelatedLookup(BaseModel):
 class Room(BaseModel):
     RoomKey = models.BigIntegerField(primary_key=True)
     RoomListingKey = models.CharField(max_length=255, null=True)
-    County = models.CharField(max_length=255, null=True)
+    County = DictionaryField(dictionary="County", max_length=255, null=True)
     RoomType = models.CharField(max_length=255, null=True)
     RoomLength = models.IntegerField(null=True)
     RoomWidth = models.IntegerField(null=True)
@@ -1554,8 +1781,12 @@ class Room(BaseModel):
     RoomArea = models.IntegerField(null=True)
     RoomDimensions = models.CharField(max_length=50, null=True)
     RoomFeatures = models.JSONField(default=list)
-    RoomSystemLocale = models.CharField(max_length=255, null=True)
-    RoomSubSystemLocale = models.CharField(max_length=255, null=True)
+    RoomSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
+    RoomSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
     ListingSourceRecordKey = models.CharField(max_length=30, null=True)
     RoomModificationTimestamp = models.DateTimeField(null=True)
     RoomDescription = models.CharField(max_length=1024, null=True)
@@ -1650,8 +1881,12 @@ class SysAgentMedia(BaseModel):
     SysMediaURL = models.URLField(max_length=4000, null=True)
     SysMediaCreationTimestamp = models.DateTimeField(null=True)
     SysMediaModificationTimestamp = models.DateTimeField(null=True)
-    SysMediaSystemLocale = models.CharField(max_length=255, null=True)
-    SysMediaSubSystemLocale = models.CharField(max_length=255, null=True)
+    SysMediaSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
+    SysMediaSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
     SysMediaProcessingStatus = models.CharField(max_length=255, null=True)
     SysMediaPendingFileName = models.CharField(max_length=3000, null=True)
     SysMediaExtSysProcessingCode = models.CharField(max_length=100, null=True)
@@ -1688,8 +1923,12 @@ class SysOfficeMedia(BaseModel):
     SysMediaURL = models.URLField(max_length=4000, null=True)
     SysMediaCreationTimestamp = models.DateTimeField(null=True)
     SysMediaModificationTimestamp = models.DateTimeField(null=True)
-    SysMediaSystemLocale = models.CharField(max_length=255, null=True)
-    SysMediaSubSystemLocale = models.CharField(max_length=255, null=True)
+    SysMediaSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
+    SysMediaSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
     SysMediaProcessingStatus = models.CharField(max_length=255, null=True)
     SysMediaPendingFileName = models.CharField(max_length=3000, null=True)
     SysMediaExtSysProcessingCode = models.CharField(max_length=100, null=True)
@@ -1718,8 +1957,12 @@ class SysPartyLicense(BaseModel):
     SysPartyLicensePartyKey = models.CharField(max_length=255, null=True)
     SysPartyLicenseType = models.CharField(max_length=255, null=True)
     SysPartyLicenseModificationTimestamp = models.DateTimeField(null=True)
-    SysPartyLicenseSystemLocale = models.CharField(max_length=255, null=True)
-    SysPartyLicenseSubSystemLocale = models.CharField(max_length=255, null=True)
+    SysPartyLicenseSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
+    SysPartyLicenseSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
 
     class Meta:
         verbose_name_plural = "SysPartyLicense"
@@ -1734,8 +1977,12 @@ class SysPartyLicense(BaseModel):
 class Team(BaseModel):
     TeamKey = models.BigIntegerField(primary_key=True)
     TeamName = models.CharField(max_length=80, null=True)
-    TeamSystemLocale = models.CharField(max_length=255, null=True)
-    TeamSubSystemLocale = models.CharField(max_length=255, null=True)
+    TeamSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
+    TeamSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
     TeamLeadMemberKey = models.CharField(max_length=255, null=True)
     TeamModificationTimestamp = models.DateTimeField(null=True)
     TeamStatus = models.CharField(max_length=255, null=True)
@@ -1776,7 +2023,7 @@ class Unit(BaseModel):
     requests.exceptions.JSONDecodeError: Expecting ':' delimiter: line 1 column 15994 (char 15993)
     """
 
-    County = models.CharField(max_length=255, null=True)
+    County = DictionaryField(dictionary="County", max_length=255, null=True)
     UnitTypeKey = models.BigIntegerField(primary_key=True)
     UnitTypeListingKey = models.CharField(max_length=255, null=True)
     UnitTypeItemNumber = models.IntegerField(null=True)
@@ -1798,8 +2045,12 @@ class Unit(BaseModel):
     UnitTypeSecurityDeposit = models.CharField(max_length=255, null=True)
     ListingSourceRecordKey = models.CharField(max_length=30, null=True)
     PropUnitModificationTimestamp = models.DateTimeField(null=True)
-    UnitSystemLocale = models.CharField(max_length=255, null=True)
-    UnitSubSystemLocale = models.CharField(max_length=255, null=True)
+    UnitSystemLocale = DictionaryField(
+        dictionary="SystemLocale", max_length=255, null=True
+    )
+    UnitSubSystemLocale = DictionaryField(
+        dictionary="SubSystemLocale", max_length=255, null=True
+    )
     UnitTypeSourceRecordKey = models.CharField(max_length=50, null=True)
 
     class Meta:
@@ -1812,6 +2063,113 @@ class Unit(BaseModel):
         return str(self.UnitTypeKey)
 
 
+# --------- Ingestion queue ------------
+
+
+class IngestionTask(models.Model):
+    """
+    Work queue of ingestion partitions, see brightmls.services.queue.
+    Workers on any node claim pending tasks (or tasks with an expired lease)
+    with SELECT ... FOR UPDATE SKIP LOCKED, the database is the only coordinator.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    MODE_INSERT = "insert"
+    MODE_UPSERT = "upsert"
+    MODE_CHOICES = [
+        (MODE_INSERT, "Insert, skip existing records"),
+        (MODE_UPSERT, "Insert or update existing records"),
+    ]
+
+    entity = models.CharField(max_length=100)
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default=MODE_INSERT)
+    # partition resume token (key range and the last written key)
+    token = models.JSONField()
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempt = models.IntegerField(default=0)
+    worker = models.CharField(max_length=255, null=True)
+    lease_expires_at = models.DateTimeField(null=True)
+    inserted = models.BigIntegerField(default=0)
+    error = models.TextField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "lease_expires_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.entity} #{self.token.get('index')} ({self.status})"
+
+
+class Checkpoint(models.Model):
+    """
+    Named progress markers of incremental jobs (e.g. the watermark of mls_apply_deletions)
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    value = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class RequestBudget(models.Model):
+    """
+    Token bucket shared by all processes calling the Bright MLS API,
+    see brightmls.services.ratelimit. Counters are kept as metrics.
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    tokens = models.FloatField()
+    updated_at = models.DateTimeField()
+    granted = models.BigIntegerField(default=0)
+    waits = models.BigIntegerField(default=0)
+    wait_seconds = models.FloatField(default=0)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class DictionaryCode(models.Model):
+    """
+    Codes of the values of DictionaryField columns, one dictionary can be shared by
+    columns of several models. Codes are assigned by the brightmls_dictionary_encode()
+    DB function and never change.
+    """
+
+    dictionary = models.CharField(max_length=64)
+    code = models.SmallIntegerField()
+    value = models.CharField(max_length=1024)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dictionary", "value"], name="dictionarycode_value_uniq"
+            ),
+            models.UniqueConstraint(
+                fields=["dictionary", "code"], name="dictionarycode_code_uniq"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.dictionary} {self.code}: {self.value}"
+
+
 # --------- Prohibited models ------------
 
 
@@ -4,8 +4,11 @@ import time
 # from requests.adapters import HTTPAdapter
 # from requests.packages.urllib3.util.retry import Retry
 from odata import ODataService
+from odata.cache import ResponseCache
 from authlib.integrations.requests_client import OAuth2Session
 from django.conf import settings
+from brightmls.services.pagesize import AdaptivePageSize
+from brightmls.services.ratelimit import TokenBucket
 
 
 class BrightMLSSession(requests.Session):
@@ -15,13 +18,21 @@ class BrightMLSSession(requests.Session):
     It was done because of systematic errors with the previous implementation.
     """
 
-    def __init__(self, maxpagesize=10000):
+    def __init__(
+        self, maxpagesize=10000, page_size_controller=None, rate_limiter=None
+    ):
         """
         Initialize the BrightMLSSession instance.
 
         :param maxpagesize: The maximum page size for API requests, default is 100.
+        :param page_size_controller: AdaptivePageSize tuning the page size instead of maxpagesize.
+        :param rate_limiter: TokenBucket shared with other processes, to stay within the API quota.
         """
         super().__init__()
+        self.rate_limiter = rate_limiter
+        self.page_size_controller = page_size_controller
+        if page_size_controller is not None:
+            self.hooks["response"].append(page_size_controller.response_hook)
         self.token_url = settings.BRIGHT_MLS_AUTH_URL
         self.client_id = settings.BRIGHT_MLS_CLIENT_ID
         self.client_secret = settings.BRIGHT_MLS_CLIENT_SECRET
@@ -75,15 +86,24 @@ class BrightMLSSession(requests.Session):
         """
         Override to inject headers into every request.
         """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
         self._ensure_token_valid()
+        maxpagesize = self.maxpagesize
+        if self.page_size_controller is not None:
+            maxpagesize = self.page_size_controller.page_size
         request.headers.update(
             {
                 "User-Agent": "Bright WebAPI/1.0",
                 "Authorization": f"Bearer {self.access_token}",
-                "Prefer": f"odata.maxpagesize={self.maxpagesize}",
+                "Prefer": f"odata.maxpagesize={maxpagesize}",
             }
         )
-        return super().prepare_request(request)
+        prepared = super().prepare_request(request)
+        if "$metadata" not in prepared.url:
+            # measured by the page size controller
+            prepared.page_size = maxpagesize
+        return prepared
 
 
 class BrightMLSBaseService:
@@ -94,17 +114,57 @@ class BrightMLSBaseService:
     offset = 0
     stop = None
     max_workers = 20
+    use_cache = True
+    # tune the page size with AdaptivePageSize instead of using the fixed limit
+    adaptive_page_size = False
+    page_size_controller = None
+    # share the request budget of BRIGHT_MLS_RATE_LIMIT with other processes
+    use_rate_limit = True
+    rate_limiter = None
 
     def __init__(self):
         self.api_url = settings.BRIGHT_MLS_API_URL
 
+    def get_response_cache(self):
+        if not self.use_cache:
+            return None
+        return ResponseCache(
+            settings.BRIGHT_MLS_CACHE_DIR, ttls=settings.BRIGHT_MLS_CACHE_TTLS
+        )
+
+    def get_page_size_controller(self):
+        if not self.adaptive_page_size:
+            return None
+        return AdaptivePageSize(**settings.BRIGHT_MLS_ADAPTIVE_PAGE_SIZE)
+
+    def get_rate_limiter(self):
+        if not self.use_rate_limit or not settings.BRIGHT_MLS_RATE_LIMIT["rate"]:
+            return None
+        return TokenBucket(**settings.BRIGHT_MLS_RATE_LIMIT)
+
     def get_client(self):
-        session = BrightMLSSession(maxpagesize=self.limit)
+        self.page_size_controller = self.get_page_size_controller()
+        self.rate_limiter = self.get_rate_limiter()
+        session = BrightMLSSession(
+            maxpagesize=self.limit,
+            page_size_controller=self.page_size_controller,
+            rate_limiter=self.rate_limiter,
+        )
 
         service = ODataService(
             self.api_url,
             session=session,
             reflect_entities=True,
+            response_cache=self.get_response_cache(),
         )
 
         return service
+
+    def get_entity_resource(self, service):
+        try:
+            return service.entities[self.entity_name]
+        except KeyError:
+            raise ValueError(
+                f"Entity {self.entity_name} not found. "
+                f"Provide the name in camel case as it specified on Bright MLS website"
+            )
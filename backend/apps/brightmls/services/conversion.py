@@ -0,0 +1,129 @@
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import models
+from django.utils.dateparse import parse_datetime
+
+# kinds of conversion applied to the raw JSON values in the worker processes
+CONVERT_VALUE = 0
+CONVERT_DATETIME = 1
+
+
+def get_conversion_fields(model_class):
+    """
+    Conversion specs of the concrete fields of the model and its parts, in the order
+    expected by the positional arguments of their constructors (see split_row):
+    (odata field, kind, default) tuples.
+    Plain tuples, so they can be sent to the worker processes.
+    """
+    fields = []
+    for part_class in model_class.get_part_models():
+        for field in part_class._meta.concrete_fields:
+            kind = CONVERT_VALUE
+            if isinstance(field, models.DateTimeField):
+                kind = CONVERT_DATETIME
+            odata_field = part_class._map_field_name_to_odata(field.name)
+            fields.append((odata_field, kind, field.get_default()))
+    return tuple(fields)
+
+
+def split_row(model_class, row):
+    """
+    Split a converted row into the values of the model and of each of its parts
+
+    :return: List of (model class, values) pairs
+    """
+    parts = []
+    start = 0
+    for part_class in model_class.get_part_models():
+        end = start + len(part_class._meta.concrete_fields)
+        parts.append((part_class, row[start:end]))
+        start = end
+    return parts
+
+
+def convert_page(fields, payload):
+    """
+    Convert a serialized page of JSON rows to tuples of model field values.
+    Runs in the worker processes, so it must stay importable without Django setup.
+
+    :param fields: Conversion specs from get_conversion_fields
+    :param payload: Page serialized with serialize_page
+    :return: List of tuples, one value per model field
+    """
+    rows = json.loads(payload)
+    converted = []
+    for row in rows:
+        values = []
+        for odata_field, kind, default in fields:
+            value = row.get(odata_field, default)
+            if kind == CONVERT_DATETIME and isinstance(value, str):
+                value = parse_datetime(value)
+            values.append(value)
+        converted.append(tuple(values))
+    return converted
+
+
+def serialize_page(rows):
+    """
+    Compact form of a page to pass it between processes: a single JSON string
+    is pickled much faster than thousands of dicts with hundreds of keys each.
+    """
+    return json.dumps(rows, separators=(",", ":"))
+
+
+class PageConversionPool:
+    """
+    Converts pages of raw JSON rows in a pool of processes, so the CPU-bound conversion
+    of wide entities (BrightProperties) runs on all cores while the main process keeps
+    fetching pages and writing results to the DB.
+    Results are returned in the order of the submitted pages. At most max_pending pages
+    are in flight, so memory stays bounded when the DB writer is slower than the API.
+
+    usage:
+        with PageConversionPool(model_class, workers=4) as pool:
+            for page in query.pages():
+                for rows in pool.submit(page):
+                    write(rows)
+            for rows in pool.drain():
+                write(rows)
+    """
+
+    def __init__(self, model_class, workers=4, max_pending=None):
+        self.fields = get_conversion_fields(model_class)
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self.executor = None
+        self.pending = deque()
+
+    def __enter__(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.executor.shutdown(wait=exc_type is None, cancel_futures=exc_type is not None)
+        self.executor = None
+        self.pending.clear()
+
+    def submit(self, rows):
+        """
+        Submit a page for conversion.
+
+        :return: Generator of converted pages which are ready to be written,
+            it blocks while too many pages are in flight
+        """
+        self.pending.append(
+            self.executor.submit(convert_page, self.fields, serialize_page(rows))
+        )
+        while len(self.pending) > self.max_pending or (
+            self.pending and self.pending[0].done()
+        ):
+            yield self.pending.popleft().result()
+
+    def drain(self):
+        """
+        :return: Generator of all converted pages left in flight
+        """
+        while self.pending:
+            yield self.pending.popleft().result()
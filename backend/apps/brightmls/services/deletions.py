@@ -0,0 +1,163 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from brightmls import models as bright_models
+from brightmls.models import Checkpoint, Deletion
+
+
+class BrightMLSDeletionService:
+    """
+    Service replaying the Deletion feed: records listed in Deletion rows newer than the
+    watermark are deleted from their tables. Deletes are set based, one
+    DELETE ... WHERE pk = ANY(...) per table and batch, and every batch is committed
+    together with the new watermark, so an interrupted run continues where it stopped.
+    """
+
+    checkpoint_name = "deletions"
+    batch_size = 5000
+    # every run starts this long before the watermark, so Deletion rows ingested late
+    # (with an older DeletionTimestamp) are applied too, the records of the rows
+    # already applied are gone and deleting them again changes nothing
+    overlap = timedelta(hours=1)
+
+    # Deletion.TableName -> model name, tables named like the models are found without it
+    table_models = {
+        "Property": "BrightProperties",
+        "Media": "BrightMedia",
+        "Member": "BrightMembers",
+        "Office": "BrightOffices",
+        "OpenHouse": "BrightOpenHouses",
+    }
+
+    def __init__(self):
+        self.deleted = Counter()
+        self.unknown_tables = Counter()
+        self.processed = 0
+
+    def get_model(self, table_name):
+        model_name = self.table_models.get(table_name, table_name)
+        model_class = getattr(bright_models, model_name or "", None)
+        if not isinstance(model_class, type) or not issubclass(
+            model_class, bright_models.BaseModel
+        ):
+            return None
+        return model_class
+
+    def get_watermark(self):
+        """
+        :return: (DeletionTimestamp, UniversalKey) of the last applied Deletion row, or None
+        """
+        checkpoint = Checkpoint.objects.filter(name=self.checkpoint_name).first()
+        if checkpoint is None:
+            return None
+        timestamp = checkpoint.value["timestamp"]
+        return parse_datetime(timestamp) if timestamp else None, checkpoint.value["key"]
+
+    def reset_watermark(self):
+        Checkpoint.objects.filter(name=self.checkpoint_name).delete()
+
+    def _save_watermark(self, timestamp, key):
+        Checkpoint.objects.update_or_create(
+            name=self.checkpoint_name,
+            defaults={
+                "value": {
+                    "timestamp": timestamp.isoformat() if timestamp else None,
+                    "key": key,
+                }
+            },
+        )
+
+    def _new_deletions(self, watermark, overlap=None):
+        """
+        Deletion rows after the watermark, ordered by (DeletionTimestamp, UniversalKey).
+        Rows without a timestamp come first.
+
+        :param overlap: Also the rows with a DeletionTimestamp this much older than the watermark
+        """
+        queryset = Deletion.objects.all()
+        if watermark is not None:
+            timestamp, key = watermark
+            if timestamp is None:
+                queryset = queryset.filter(
+                    Q(DeletionTimestamp__isnull=True, UniversalKey__gt=key)
+                    | Q(DeletionTimestamp__isnull=False)
+                )
+            elif overlap:
+                queryset = queryset.filter(DeletionTimestamp__gte=timestamp - overlap)
+            else:
+                queryset = queryset.filter(
+                    Q(DeletionTimestamp__gt=timestamp)
+                    | Q(DeletionTimestamp=timestamp, UniversalKey__gt=key)
+                )
+        return queryset.order_by(
+            F("DeletionTimestamp").asc(nulls_first=True), "UniversalKey"
+        ).values_list("UniversalKey", "TableName", "DeleteKey", "DeletionTimestamp")
+
+    def apply(self):
+        """
+        Apply all Deletion rows after the watermark, batch by batch
+
+        :return: Count of deleted records by model name
+        """
+        watermark = self.get_watermark()
+        if watermark is None:
+            print(">> No watermark, replaying the whole Deletion feed")
+        else:
+            print(
+                f">> Replaying Deletion rows after {watermark[0]} (key {watermark[1]})"
+            )
+
+        overlap = self.overlap
+        while True:
+            rows = list(self._new_deletions(watermark, overlap)[: self.batch_size])
+            if not rows:
+                break
+            # the following batches continue after the last row
+            overlap = None
+
+            with transaction.atomic():
+                self._delete_batch(rows)
+                last = rows[-1]
+                watermark = (last[3], last[0])
+                self._save_watermark(*watermark)
+
+            self.processed += len(rows)
+            print(".", end="", flush=True)
+
+        if self.processed:
+            print()
+        for table_name, count in self.unknown_tables.items():
+            print(f">> skipped {count:,} deletions of unknown table {table_name}")
+        for model_name, count in self.deleted.items():
+            print(f">> deleted {count:,} records of {model_name}")
+        print(f">> {self.processed:,} Deletion rows applied")
+        return dict(self.deleted)
+
+    def _delete_batch(self, rows):
+        keys = defaultdict(list)
+        for universal_key, table_name, delete_key, _ in rows:
+            model_class = self.get_model(table_name)
+            if model_class is None or delete_key is None:
+                self.unknown_tables[table_name] += 1
+                continue
+            try:
+                key = model_class._meta.pk.to_python(delete_key)
+            except ValidationError:
+                self.unknown_tables[f"{table_name} (invalid keys)"] += 1
+            else:
+                keys[model_class].append(key)
+
+        for model_class, values in keys.items():
+            # parts of the records first, the count is the one of the model itself
+            for part_class in reversed(model_class.get_part_models()):
+                table = connection.ops.quote_name(part_class._meta.db_table)
+                pk_column = connection.ops.quote_name(part_class._meta.pk.column)
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"DELETE FROM {table} WHERE {pk_column} = ANY(%s)", [values]
+                    )
+            self.deleted[model_class.__name__] += cursor.rowcount
@@ -0,0 +1,213 @@
+from django.apps import apps
+from django.db import connection, transaction
+from brightmls.fields import DictionaryField
+
+VIEW_SUFFIX = "_decoded"
+
+
+def get_encoded_models():
+    """
+    :return: {model class: its DictionaryField fields} of models whose columns can be
+    encoded (see is_encoded, encode_model)
+    """
+    encoded = {}
+    for model_class in apps.get_app_config("brightmls").get_models():
+        fields = [
+            field
+            for field in model_class._meta.concrete_fields
+            if isinstance(field, DictionaryField)
+        ]
+        if fields:
+            encoded[model_class] = fields
+    return encoded
+
+
+def get_dictionaries():
+    return sorted(
+        {
+            field.dictionary
+            for fields in get_encoded_models().values()
+            for field in fields
+        }
+    )
+
+
+def _column_types(table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s
+            """,
+            [table],
+        )
+        return dict(cursor.fetchall())
+
+
+def get_encoded_fields(model_class):
+    """
+    :return: DictionaryField fields of the model whose columns are stored as codes
+    """
+    column_types = _column_types(model_class._meta.db_table)
+    return [
+        field
+        for field in get_encoded_models().get(model_class, [])
+        if column_types.get(field.column) == "smallint"
+    ]
+
+
+def _alter_columns(model_class, encode):
+    fields = get_encoded_models().get(model_class)
+    if not fields:
+        raise ValueError(f"{model_class.__name__} has no dictionary fields")
+    encoded = get_encoded_fields(model_class)
+    fields = [field for field in fields if (field in encoded) != encode]
+    if not fields:
+        state = "encoded" if encode else "text"
+        raise ValueError(f"{model_class.__name__} columns are {state} already")
+
+    quote = connection.ops.quote_name
+    table = quote(model_class._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        # the decoded views read the columns, they are recreated after
+        drop_views()
+        alters = []
+        for field in fields:
+            column = quote(field.column)
+            if encode:
+                # codes of existing values are assigned in alphabetical order
+                cursor.execute(
+                    f"SELECT brightmls_dictionary_encode(%s, value) FROM "
+                    f"(SELECT DISTINCT {column} AS value FROM {table} "
+                    f"WHERE {column} IS NOT NULL ORDER BY 1) AS existing",
+                    [field.dictionary],
+                )
+                alters.append(
+                    f"ALTER COLUMN {column} TYPE smallint "
+                    f"USING brightmls_dictionary_encode('{field.dictionary}', {column})"
+                )
+            else:
+                alters.append(
+                    f"ALTER COLUMN {column} TYPE varchar({field.max_length}) "
+                    f"USING brightmls_dictionary_decode('{field.dictionary}', {column})"
+                )
+        # one rewrite of the table for all the columns
+        print(
+            f">> {'Encoding' if encode else 'Decoding'} {len(fields)} columns of {table}"
+        )
+        cursor.execute(f"ALTER TABLE {table} {', '.join(alters)}")
+        create_views()
+    DictionaryField.reset_encoded_columns()
+    return [field.name for field in fields]
+
+
+def encode_model(model_class):
+    """
+    Store the text columns of the model's DictionaryField fields as dictionary codes.
+    Rewrites the table holding it locked, other processes see the new column types
+    once restarted.
+
+    :return: Names of the encoded fields
+    """
+    return _alter_columns(model_class, encode=True)
+
+
+def decode_model(model_class):
+    """
+    Store the codes of the model's DictionaryField fields as text again, e.g. before
+    a migration altering them
+
+    :return: Names of the decoded fields
+    """
+    return _alter_columns(model_class, encode=False)
+
+
+def drop_views():
+    """
+    Drop the "<table>_decoded" views, columns they read can not be altered or dropped
+    """
+    with connection.cursor() as cursor:
+        for model_class in get_encoded_models():
+            view = f"{model_class._meta.db_table}{VIEW_SUFFIX}"
+            cursor.execute(f"DROP VIEW IF EXISTS {connection.ops.quote_name(view)}")
+
+
+def create_views():
+    """
+    (Re)create a "<table>_decoded" view of every table with encoded columns, showing
+    the text values instead of the codes, for SQL Explorer and other SQL clients.
+    Views of tables without encoded columns are dropped.
+    """
+    quote = connection.ops.quote_name
+    if "brightmls_dictionarycode" not in connection.introspection.table_names():
+        return []
+
+    views = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model_class, fields in get_encoded_models().items():
+            table = model_class._meta.db_table
+            column_types = _column_types(table)
+            if not column_types:
+                continue
+            dictionaries = {
+                field.column: field.dictionary
+                for field in fields
+                if column_types.get(field.column) == "smallint"
+            }
+            view = quote(f"{table}{VIEW_SUFFIX}")
+            cursor.execute(f"DROP VIEW IF EXISTS {view}")
+            if not dictionaries:
+                continue
+
+            columns = []
+            for field in model_class._meta.concrete_fields:
+                column = quote(field.column)
+                if field.column in dictionaries:
+                    columns.append(
+                        f"brightmls_dictionary_decode('{dictionaries[field.column]}', "
+                        f"t.{column}) AS {column}"
+                    )
+                else:
+                    columns.append(f"t.{column}")
+
+            cursor.execute(
+                f"CREATE VIEW {view} AS SELECT {', '.join(columns)} FROM {quote(table)} t"
+            )
+            views.append(f"{table}{VIEW_SUFFIX}")
+    return views
+
+
+def seed_from_lookup():
+    """
+    Add the values of the Lookup entity to the dictionaries of the same name
+    (Lookup.LookupName), so codes exist before the records using them are ingested
+
+    :return: {dictionary: count of its codes}
+    """
+    counts = {}
+    with connection.cursor() as cursor:
+        for dictionary in get_dictionaries():
+            cursor.execute(
+                """
+                SELECT brightmls_dictionary_encode(%s, value) FROM (
+                    SELECT DISTINCT "LookupValue" AS value FROM brightmls_lookup
+                    WHERE "LookupName" = %s AND "LookupValue" IS NOT NULL
+                    ORDER BY 1
+                ) AS lookup_values
+                """,
+                [dictionary, dictionary],
+            )
+            cursor.execute(
+                "SELECT COUNT(*) FROM brightmls_dictionarycode WHERE dictionary = %s",
+                [dictionary],
+            )
+            counts[dictionary] = cursor.fetchone()[0]
+    return counts
+
+
+def drop_views_before_migrate(sender, **kwargs):
+    drop_views()
+
+
+def create_views_after_migrate(sender, **kwargs):
+    create_views()
@@ -0,0 +1,148 @@
+import io
+import json
+from datetime import date, datetime
+
+from django.db import connection, models, transaction
+from odata.property import PropertyBase
+from brightmls import models as bright_models
+from brightmls.fields import DictionaryField
+from brightmls.services.base import BrightMLSBaseService
+
+
+class BrightMLSExportService(BrightMLSBaseService):
+    """
+    Service to export an entity from Bright MLS API to a Parquet file and/or load it
+    into the database with COPY.
+    Pages are decoded straight into columns (odata columnar decoding), no entity objects
+    and no model instances are created, so it is much cheaper than mls_grab for wide
+    entities like BrightProperties.
+    COPY does not skip existing records, it is meant for loading into an empty table.
+    """
+
+    output = None
+    copy = False
+    total_exported = 0
+
+    def export(self):
+        if not self.output and not self.copy:
+            raise ValueError("Nothing to do, provide an output file or enable COPY")
+
+        service = self.get_client()
+
+        print(f">> Exporting entity: {self.entity_name}")
+
+        entity_resource = self.get_entity_resource(service)
+        model_class = getattr(bright_models, self.entity_name)
+
+        fields = self._get_export_fields(model_class, entity_resource)
+        print(f">> exporting {len(fields)} properties")
+
+        # the primary key is a field of every part, but it is requested once
+        odata_fields = list(dict.fromkeys(odata_field for odata_field, _ in fields))
+        query = service.query(entity_resource).select(
+            *[getattr(entity_resource, odata_field) for odata_field in odata_fields]
+        )
+
+        writer = None
+        try:
+            # Parquet needs Arrow batches, plain lists are enough for COPY
+            backend = "arrow" if self.output else "python"
+            for page in query.columns(backend=backend):
+                if self.output:
+                    writer = writer or self._get_parquet_writer(page.schema)
+                    writer.write_batch(page)
+                    count = page.num_rows
+                else:
+                    count = len(page[fields[0][0]])
+
+                if self.copy:
+                    columns = page.to_pydict() if self.output else page
+                    self._copy_columns(model_class, fields, columns)
+
+                self.total_exported += count
+                print(".", end="", flush=True)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        print(f"\n>> exported {self.total_exported:,} records")
+
+    def _get_export_fields(self, model_class, entity_resource):
+        """
+        (odata property name, model field) pairs of the fields of the model and of its
+        parts existing in the entity
+        """
+        fields = []
+        for part_class in model_class.get_part_models():
+            for field in part_class._meta.concrete_fields:
+                odata_field = part_class._map_field_name_to_odata(field.name)
+                prop = getattr(entity_resource, odata_field, None)
+                if isinstance(prop, PropertyBase):
+                    fields.append((odata_field, field))
+
+        if not fields:
+            raise ValueError(f"Model {model_class.__name__} has no fields to export")
+        return fields
+
+    def _get_parquet_writer(self, schema):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("pyarrow is required to write Parquet files")
+
+        return pq.ParquetWriter(self.output, schema)
+
+    def _copy_columns(self, model_class, fields, columns):
+        """
+        Load one page of columns into the tables of the model and of its parts with
+        COPY (text format), in one transaction
+        """
+        with transaction.atomic():
+            for part_class in model_class.get_part_models():
+                part_fields = [
+                    (odata_field, field)
+                    for odata_field, field in fields
+                    if field.model is part_class
+                ]
+                if part_fields:
+                    self._copy_part(part_class, part_fields, columns)
+
+    def _copy_part(self, model_class, fields, columns):
+        rows = zip(*[columns[odata_field] for odata_field, _ in fields])
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(
+                "\t".join(
+                    self._copy_value(value, field)
+                    for value, (_, field) in zip(row, fields)
+                )
+            )
+            buffer.write("\n")
+        buffer.seek(0)
+
+        table = connection.ops.quote_name(model_class._meta.db_table)
+        column_names = ", ".join(
+            connection.ops.quote_name(field.column) for _, field in fields
+        )
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({column_names}) FROM STDIN", buffer)
+
+    @staticmethod
+    def _copy_value(value, field):
+        if value is None:
+            return "\\N"
+        if isinstance(field, DictionaryField) and field.is_encoded(connection):
+            return str(field.get_db_prep_save(value, connection))
+        if isinstance(field, models.JSONField):
+            value = json.dumps(value)
+        elif isinstance(value, bool):
+            return "t" if value else "f"
+        elif isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
@@ -1,7 +1,15 @@
+import inspect
 import tracemalloc
+from collections import defaultdict
 from datetime import datetime
+
+from django.db import transaction
+from odata.property import PropertyBase
 from brightmls import models as bright_models
 from brightmls.services.base import BrightMLSBaseService
+from brightmls.services.conversion import PageConversionPool, split_row
+from brightmls.services.indexes import DeferredIndexes
+from brightmls.services.shadow import ShadowTable
 
 
 class BrightMLSGrabService(BrightMLSBaseService):
@@ -13,23 +21,53 @@ class BrightMLSGrabService(BrightMLSBaseService):
 
     last_pk = None
     total_inserted = 0
+    total_inserts = 0
     start_timestamp = None
+    use_select = True
+    # very long $select lists may exceed URL limits of the API gateway
+    max_select_length = 8000
+    # processes converting pages to model values, 0 converts in the main process
+    conversion_workers = 0
+    # load into a shadow table and swap it in at the end (full reload)
+    reload = False
+    # drop the secondary indexes while loading and rebuild them at the end
+    defer_indexes = False
 
     def populate(self):
         service = self.get_client()
 
         print(f">> Grabbing entity: {self.entity_name}")
 
-        try:
-            entity_resource = service.entities[self.entity_name]
-        except KeyError:
-            raise ValueError(
-                f"Entity {self.entity_name} not found. "
-                f"Provide the name in camel case as it specified on Bright MLS website"
-            )
+        entity_resource = self.get_entity_resource(service)
 
         model_class = getattr(bright_models, self.entity_name)
 
+        shadow = None
+        deferred_indexes = None
+        if self.reload:
+            # the shadow table has no indexes while loading anyway
+            shadow = self._get_shadow_table(model_class)
+            model_class = shadow.model
+        elif self.defer_indexes:
+            deferred_indexes = DeferredIndexes(model_class)
+            deferred_indexes.drop()
+
+        try:
+            self._load(service, entity_resource, model_class)
+        except BaseException as e:
+            if deferred_indexes is not None:
+                self._rebuild_after_failure(deferred_indexes, e)
+            raise
+
+        if shadow is not None:
+            print()
+            shadow.build_indexes()
+            shadow.swap()
+        if deferred_indexes is not None:
+            print()
+            deferred_indexes.rebuild()
+
+    def _load(self, service, entity_resource, model_class):
         tracemalloc.start()
         self.start_timestamp = datetime.now()
 
@@ -46,29 +84,107 @@ class BrightMLSGrabService(BrightMLSBaseService):
 
         query = service.query(entity_resource)
 
+        if self.use_select:
+            select_properties = self._get_select_properties(
+                model_class, entity_resource
+            )
+            if select_properties:
+                query = query.select(*select_properties)
+
         # set skip token if last pk is provided or exists in the database. Start from the beginning otherwise
         if self.last_pk:
-            skip_token = f"last_pk:{self.last_pk},odata.maxpagesize:{self.limit}"
-            query.skiptoken(skip_token)
+            skip_token = (
+                f"last_pk:{self.last_pk},odata.maxpagesize:{self._get_page_size()}"
+            )
+            query = query.skiptoken(skip_token)
+
+        if self.conversion_workers:
+            self._populate_with_pool(query, model_class)
+        else:
+            entities = []
+            for entity in query:
+                # print(entity.__dict__)
+                entities.append(entity)
 
-        entities = []
-        for entity in query:
-            # print(entity.__dict__)
-            entities.append(entity)
+                if len(entities) >= self._get_page_size():
+                    self._insert_entities(model_class, entities)
+                    entities = []
 
-            if len(entities) >= self.limit:
+            if entities:
                 self._insert_entities(model_class, entities)
-                entities = []
 
-        if entities:
-            self._insert_entities(model_class, entities)
+    def _rebuild_after_failure(self, deferred_indexes, error):
+        """
+        Restore the indexes dropped for a load which raised, so the table is not left
+        without them. An interrupted load only reports how to rebuild them, a rebuild
+        can take long.
+        """
+        recovery = f"python manage.py mls_indexes {self.entity_name}"
+        if not isinstance(error, Exception):
+            print(
+                f"\n>> WARNING: load interrupted, the indexes of {deferred_indexes.table} "
+                f"are missing, rebuild them with: {recovery}"
+            )
+            return
+        print(f"\n>> Load failed, rebuilding the indexes of {deferred_indexes.table}")
+        try:
+            deferred_indexes.rebuild()
+        except Exception as e:
+            print(
+                f">> WARNING: rebuild failed ({e}), the indexes of "
+                f"{deferred_indexes.table} are missing, rebuild them with: {recovery}"
+            )
+
+    def _get_shadow_table(self, model_class):
+        shadow = ShadowTable(model_class)
+        if shadow.exists():
+            print(f">> continuing the reload in {shadow.shadow_table}")
+        else:
+            print(f">> reloading into {shadow.shadow_table}")
+            shadow.create()
+        return shadow
+
+    def _populate_with_pool(self, query, model_class):
+        """
+        Fetch raw pages in this process, convert them in a process pool and write
+        the converted rows from this process only
+        """
+        print(f">> converting pages in {self.conversion_workers} processes")
+
+        pk_index = model_class._meta.concrete_fields.index(model_class._meta.pk)
+        with PageConversionPool(model_class, workers=self.conversion_workers) as pool:
+            for page in query.pages():
+                for rows in pool.submit(page):
+                    self._insert_rows(model_class, rows, pk_index)
+            for rows in pool.drain():
+                self._insert_rows(model_class, rows, pk_index)
+
+    def _insert_rows(self, model_class, rows, pk_index):
+        if not rows:
+            return
+        instances = defaultdict(list)
+        for row in rows:
+            for part_class, values in split_row(model_class, row):
+                # positional arguments are the cheapest way to build model instances
+                instances[part_class].append(part_class(*values))
+        self._bulk_create_parts(instances)
+        self._report_inserted(len(rows), rows[-1][pk_index])
 
     def _insert_entities(self, model_class, entities):
         self._bulk_create_simple(model_class, entities)
-        self.total_inserted += len(entities)
+
+        pk_field = self._get_models_pk_name(model_class)
+        last_pk = model_class._get_odata_value(
+            entities[-1], model_class._map_field_name_to_odata(pk_field)
+        )
+        self._report_inserted(len(entities), last_pk)
+
+    def _report_inserted(self, count, last_pk):
+        self.total_inserted += count
+        self.total_inserts += 1
         print(".", end="", flush=True)
 
-        if self.total_inserted % (self.limit * 10) == 0:
+        if self.total_inserts % 10 == 0:
             # gc.collect()
 
             # memory usage
@@ -79,8 +195,6 @@ class BrightMLSGrabService(BrightMLSBaseService):
             memory = f"(mem usage: {current_mb:.1f}MB; peak {peak_mb:.1f}MB)"
 
             # last inserted pk
-            pk_field = self._get_models_pk_name(model_class)
-            last_pk = getattr(entities[-1], pk_field)
             last_pk_str = f"(last pk: {last_pk})"
 
             # time from start
@@ -94,13 +208,64 @@ class BrightMLSGrabService(BrightMLSBaseService):
             )
 
     def _bulk_create_simple(self, model_class, entities_block):
-        instances = []
+        instances = defaultdict(list)
         for entity in entities_block:
-            instances.append(model_class.from_python_odata(entity))
+            for part_class in model_class.get_part_models():
+                instances[part_class].append(part_class.from_python_odata(entity))
+
+        self._bulk_create_parts(instances)
+
+    def _bulk_create_parts(self, instances):
+        """
+        Write the instances of the model and of its parts in one transaction,
+        so the parts of a record are never written without each other
+        """
+        with transaction.atomic():
+            for part_class, part_instances in instances.items():
+                part_class.objects.bulk_create(
+                    part_instances,
+                    batch_size=self._get_batch_size(),
+                    ignore_conflicts=True,
+                )
+
+    def _get_select_properties(self, model_class, entity_resource):
+        """
+        Properties of the entity which are stored by the model. Returns an empty list
+        (select everything) when the model stores all of them or the list is too long.
+        """
+        entity_properties = [
+            prop
+            for _, prop in inspect.getmembers(entity_resource)
+            if isinstance(prop, PropertyBase)
+        ]
+        select_properties = []
+        for odata_field in model_class.get_odata_field_names():
+            prop = getattr(entity_resource, odata_field, None)
+            if isinstance(prop, PropertyBase):
+                select_properties.append(prop)
 
-        model_class.objects.bulk_create(
-            instances, batch_size=500, ignore_conflicts=True
+        if not select_properties or len(select_properties) >= len(entity_properties):
+            return []
+
+        select_length = sum(len(prop.name) + 1 for prop in select_properties)
+        if select_length > self.max_select_length:
+            print(f">> $select is too long ({select_length} chars), selecting all")
+            return []
+
+        print(
+            f">> selecting {len(select_properties)} of {len(entity_properties)} properties"
         )
+        return select_properties
+
+    def _get_page_size(self):
+        if self.page_size_controller is not None:
+            return self.page_size_controller.page_size
+        return self.limit
+
+    def _get_batch_size(self):
+        if self.page_size_controller is not None:
+            return self.page_size_controller.batch_size
+        return 500
 
     def _get_models_pk_name(self, model_class):
         return model_class._meta.pk.name
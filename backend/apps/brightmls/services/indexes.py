@@ -0,0 +1,132 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, connections
+from brightmls.services.partitions import is_partitioned
+
+
+def get_build_settings():
+    """
+    :return: Session settings for index builds (SET statements)
+    """
+    return [
+        f"SET maintenance_work_mem = '{settings.BRIGHT_MLS_INDEX_BUILD['maintenance_work_mem']}'",
+        "SET max_parallel_maintenance_workers = "
+        f"{int(settings.BRIGHT_MLS_INDEX_BUILD['parallel_workers'])}",
+    ]
+
+
+def run_statements(statements, workers=4, setup=()):
+    """
+    Run independent statements (index builds) in parallel, each thread on its own
+    DB connection, outside of any transaction
+
+    :param statements: SQL statements to run
+    :param workers: Count of statements run at the same time
+    :param setup: Statements run on every connection first (session settings)
+    """
+
+    def run(sql):
+        started = time.monotonic()
+        try:
+            with connections["default"].cursor() as cursor:
+                for setup_sql in setup:
+                    cursor.execute(setup_sql)
+                cursor.execute(sql)
+        finally:
+            connections["default"].close()
+        print(f">> {time.monotonic() - started:.1f}s: {sql}")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(run, statements))
+
+
+class DeferredIndexes:
+    """
+    Drops the secondary indexes of a model (Meta.indexes) before a bulk load and
+    rebuilds them afterwards, so rows are inserted without maintaining every index.
+    The primary key stays, upserts and the resume point (last pk) rely on it.
+
+    Plain builds run in parallel (they only block writes, and the load is over).
+    CREATE INDEX CONCURRENTLY does not block writes, but two of them can not run on
+    the same table at once, so concurrent builds run one after another.
+    Both use maintenance_work_mem and parallel maintenance workers from
+    settings.BRIGHT_MLS_INDEX_BUILD. The rebuild ends with ANALYZE.
+
+    usage:
+        indexes = DeferredIndexes(bright_models.History)
+        indexes.drop()
+        load()
+        indexes.rebuild()
+    """
+
+    workers = 4
+    concurrently = False
+
+    def __init__(self, model_class):
+        self.model_class = model_class
+        self.table = model_class._meta.db_table
+
+    def _existing(self):
+        """
+        :return: {index name: is valid} of the table (a failed concurrent build leaves an invalid index)
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT c.relname, i.indisvalid
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = %s::regclass
+                """,
+                [connection.ops.quote_name(self.table)],
+            )
+            return dict(cursor.fetchall())
+
+    def _check_concurrently(self):
+        if self.concurrently and is_partitioned(self.model_class):
+            raise ValueError(
+                f"{self.table} is partitioned, its indexes can not be changed concurrently"
+            )
+
+    def _sql(self, method, index):
+        with connection.schema_editor(atomic=False, collect_sql=True) as editor:
+            return str(
+                getattr(index, method)(
+                    self.model_class, editor, concurrently=self.concurrently
+                )
+            )
+
+    def drop(self):
+        self._check_concurrently()
+        existing = self._existing()
+        dropped = 0
+        for index in self.model_class._meta.indexes:
+            if index.name in existing:
+                with connection.cursor() as cursor:
+                    cursor.execute(self._sql("remove_sql", index))
+                dropped += 1
+        print(f">> {dropped} indexes of {self.table} dropped until the rebuild")
+
+    def rebuild(self):
+        self._check_concurrently()
+        existing = self._existing()
+        statements = []
+        for index in self.model_class._meta.indexes:
+            if existing.get(index.name):
+                continue
+            if index.name in existing:
+                # leftover of an interrupted concurrent build
+                with connection.cursor() as cursor:
+                    cursor.execute(self._sql("remove_sql", index))
+            statements.append(self._sql("create_sql", index))
+
+        print(f">> Building {len(statements)} indexes of {self.table}")
+        run_statements(
+            statements,
+            workers=1 if self.concurrently else self.workers,
+            setup=get_build_settings(),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(self.table)}")
@@ -0,0 +1,139 @@
+import logging
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptivePageSize:
+    """
+    Tunes the odata.maxpagesize of the API requests and the bulk insert batch size
+    while an entity is grabbed, so narrow entities (RelatedLookup) and wide ones
+    (BrightProperties) run at their own best throughput without hand-tuned limits.
+
+    Every page response is measured (latency, bytes, traced memory). The page size
+    climbs towards the best throughput in bytes per second: it keeps moving in the same
+    direction while throughput improves and turns around with a smaller step when it
+    drops. Pages which are too slow, too big or push the memory over the limit halve
+    the page size at once.
+    The insert batch size follows the measured bytes per row.
+
+    usage:
+        controller = AdaptivePageSize(initial=2000, min_page_size=100, max_page_size=10000)
+        session = BrightMLSSession(page_size_controller=controller)
+    """
+
+    step = 1.25
+    # the step narrows down to this one on every turn around the optimum
+    min_step = 1.05
+    # relative throughput drop treated as noise
+    tolerance = 0.05
+
+    def __init__(
+        self,
+        initial=2000,
+        min_page_size=100,
+        max_page_size=10000,
+        max_page_bytes=64 * 10**6,
+        max_latency=60,
+        max_memory=2 * 10**9,
+        min_batch_size=100,
+        max_batch_size=5000,
+        batch_bytes=8 * 10**6,
+    ):
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.max_page_bytes = max_page_bytes
+        self.max_latency = max_latency
+        self.max_memory = max_memory
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.batch_bytes = batch_bytes
+
+        self.page_size = self._clamp(initial, min_page_size, max_page_size)
+        self.batch_size = min_batch_size
+        self.direction = 1
+        self.current_step = self.step
+        self.last_throughput = None
+        self.pages = 0
+
+    @staticmethod
+    def _clamp(value, low, high):
+        return max(low, min(high, int(value)))
+
+    def observe(self, page_size, elapsed, size_bytes):
+        """
+        Record one page response and pick the next page size.
+
+        :param page_size: Page size requested for this response
+        :param elapsed: Seconds from sending the request to reading the body
+        :param size_bytes: Size of the response body
+        """
+        self.pages += 1
+        memory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        throughput = size_bytes / elapsed if elapsed > 0 else None
+
+        bytes_per_row = size_bytes / page_size if page_size else 0
+        if bytes_per_row:
+            self.batch_size = self._clamp(
+                self.batch_bytes / bytes_per_row, self.min_batch_size, self.max_batch_size
+            )
+
+        if elapsed > self.max_latency:
+            self._shrink(f"latency {elapsed:.1f}s > {self.max_latency}s")
+        elif size_bytes > self.max_page_bytes:
+            self._shrink(
+                f"page of {size_bytes / 10**6:.1f}MB > {self.max_page_bytes / 10**6:.1f}MB"
+            )
+        elif memory > self.max_memory:
+            self._shrink(
+                f"memory {memory / 10**6:.1f}MB > {self.max_memory / 10**6:.1f}MB"
+            )
+        elif throughput is not None:
+            if (
+                self.last_throughput is not None
+                and throughput < self.last_throughput * (1 - self.tolerance)
+            ):
+                self.direction = -self.direction
+                self.current_step = max(self.min_step, self.current_step**0.5)
+            self.last_throughput = throughput
+            self._move(
+                f"{throughput / 10**6:.2f}MB/s, {elapsed:.2f}s per page, "
+                f"{bytes_per_row:,.0f} bytes per row"
+            )
+
+    def _shrink(self, reason):
+        previous = self.page_size
+        self.page_size = self._clamp(
+            previous / 2, self.min_page_size, self.max_page_size
+        )
+        # throughput of the smaller pages is measured from scratch
+        self.direction = -1
+        self.current_step = self.step
+        self.last_throughput = None
+        logger.info(f"page size {previous} -> {self.page_size}: {reason}")
+
+    def _move(self, reason):
+        previous = self.page_size
+        factor = self.current_step if self.direction > 0 else 1 / self.current_step
+        self.page_size = self._clamp(
+            previous * factor, self.min_page_size, self.max_page_size
+        )
+        if self.page_size == previous:
+            # stuck on a bound, try the other way next time
+            self.direction = -self.direction
+        logger.info(
+            f"page size {previous} -> {self.page_size} (batch size {self.batch_size}): {reason}"
+        )
+
+    def response_hook(self, response, *args, **kwargs):
+        """
+        requests response hook measuring the page responses of the session
+        """
+        page_size = getattr(response.request, "page_size", None)
+        if page_size is None or response.status_code != 200:
+            return
+        started = time.monotonic()
+        size_bytes = len(response.content)
+        elapsed = response.elapsed.total_seconds() + (time.monotonic() - started)
+        self.observe(page_size, elapsed, size_bytes)
@@ -0,0 +1,230 @@
+import re
+from datetime import date, datetime, timezone
+
+from django.db import connection, transaction
+from brightmls.services.dictionary import create_views, drop_views
+
+# model name -> column of the monthly range partitioning, a value which does not change
+# for a record (partitions are pruned by it and dropped when expired)
+PARTITION_KEYS = {
+    "History": "PropHistChangeTimestamp",
+    "BrightMedia": "MediaCreationTimestamp",
+    "BrightOpenHouses": "OpenHouseDate",
+}
+
+
+def is_partitioned(model_class):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+            [connection.ops.quote_name(model_class._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def get_unique_fields(model_class):
+    """
+    :return: Field names identifying a record in upserts (ON CONFLICT), the partition
+    key is part of the unique constraint of partitioned tables
+    """
+    unique_fields = [model_class._meta.pk.name]
+    if model_class.__name__ in PARTITION_KEYS and is_partitioned(model_class):
+        unique_fields.append(PARTITION_KEYS[model_class.__name__])
+    return unique_fields
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class MonthlyPartitions:
+    """
+    Monthly range partitioning of a model's table by the column in PARTITION_KEYS.
+
+    Partitions are named "<table>_pYYYYMM", records without a key or out of the
+    created months go to "<table>_default". Postgres requires the partition key in
+    every unique constraint, so the primary key is replaced with UNIQUE NULLS NOT
+    DISTINCT (pk, key) (Postgres 15+), which keeps the pk unique for records without
+    a key too: Django still uses the pk alone, upserts use get_unique_fields().
+
+    usage:
+        partitions = MonthlyPartitions(bright_models.History)
+        partitions.convert()  # once, rewrites the table
+        partitions.create_ahead(3)  # regularly
+        partitions.expire(24, drop=True)  # regularly
+    """
+
+    def __init__(self, model_class):
+        if model_class.__name__ not in PARTITION_KEYS:
+            raise ValueError(f"{model_class.__name__} has no partition key")
+        self.model_class = model_class
+        self.table = model_class._meta.db_table
+        self.key = model_class._meta.get_field(PARTITION_KEYS[model_class.__name__])
+
+    def _quote(self, name):
+        return connection.ops.quote_name(name)
+
+    def _bound(self, month):
+        if self.key.get_internal_type() == "DateField":
+            return month
+        return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+    def partition_name(self, month):
+        return f"{self.table}_p{month:%Y%m}"
+
+    @property
+    def default_name(self):
+        return f"{self.table}_default"
+
+    def partitions(self):
+        """
+        :return: {first day of month: partition name} of attached monthly partitions
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = %s::regclass
+                """,
+                [self._quote(self.table)],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+        pattern = re.compile(rf"^{re.escape(self.table)}_p(\d{{4}})(\d{{2}})$")
+        months = {}
+        for name in names:
+            match = pattern.match(name)
+            if match:
+                months[date(int(match[1]), int(match[2]), 1)] = name
+        return months
+
+    def convert(self):
+        """
+        Rewrite the table as a partitioned one with a partition for every month holding
+        records. Runs in one transaction holding the table locked, do not run it while
+        the entity is grabbed.
+        """
+        if is_partitioned(self.model_class):
+            raise ValueError(f"{self.table} is already partitioned")
+
+        key = self._quote(self.key.column)
+        pk = self._quote(self.model_class._meta.pk.column)
+        old_table = f"{self.table}__unpartitioned"
+        with transaction.atomic(), connection.cursor() as cursor:
+            # the decoded views read the table, they are recreated on the new one
+            drop_views()
+            cursor.execute(
+                f"ALTER TABLE {self._quote(self.table)} RENAME TO {self._quote(old_table)}"
+            )
+            cursor.execute(
+                f"CREATE TABLE {self._quote(self.table)} "
+                f"(LIKE {self._quote(old_table)} INCLUDING DEFAULTS) "
+                f"PARTITION BY RANGE ({key})"
+            )
+            cursor.execute(
+                f"CREATE TABLE {self._quote(self.default_name)} "
+                f"PARTITION OF {self._quote(self.table)} DEFAULT"
+            )
+            cursor.execute(
+                f"SELECT DISTINCT date_trunc('month', {key})::date "
+                f"FROM {self._quote(old_table)} WHERE {key} IS NOT NULL"
+            )
+            months = sorted(row[0] for row in cursor.fetchall())
+            for month in months:
+                self._create(cursor, month)
+
+            print(f">> Copying {self.table} into {len(months)} partitions")
+            cursor.execute(
+                f"INSERT INTO {self._quote(self.table)} SELECT * FROM {self._quote(old_table)}"
+            )
+            cursor.execute(f"DROP TABLE {self._quote(old_table)}")
+
+            # created on the partitioned table, so every partition gets them.
+            # NULL keys are equal here, otherwise records without a key (all in the
+            # default partition) could repeat the pk and upserts would never conflict
+            cursor.execute(
+                f"ALTER TABLE {self._quote(self.table)} "
+                f"ADD CONSTRAINT {self._quote(f'{self.table}_pk_key_uniq')} "
+                f"UNIQUE NULLS NOT DISTINCT ({pk}, {key})"
+            )
+            with connection.schema_editor(atomic=False, collect_sql=True) as editor:
+                indexes = [
+                    str(index.create_sql(self.model_class, editor))
+                    for index in self.model_class._meta.indexes
+                ]
+            for sql in indexes:
+                cursor.execute(sql)
+            cursor.execute(f"ANALYZE {self._quote(self.table)}")
+            create_views()
+
+    def _create(self, cursor, month):
+        name = self.partition_name(month)
+        cursor.execute(
+            f"CREATE TABLE {self._quote(name)} PARTITION OF {self._quote(self.table)} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [self._bound(month), self._bound(add_months(month, 1))],
+        )
+        return name
+
+    def create_ahead(self, months_ahead=3, today=None):
+        """
+        Create the partitions from the current month to months_ahead months ahead.
+        Records of these months already in the default partition are moved to the new one.
+
+        :return: Names of created partitions
+        """
+        today = today or date.today()
+        existing = self.partitions()
+        key = self._quote(self.key.column)
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(date(today.year, today.month, 1), offset)
+            if month in existing:
+                continue
+            bounds = [self._bound(month), self._bound(add_months(month, 1))]
+            name = self.partition_name(month)
+            with transaction.atomic(), connection.cursor() as cursor:
+                # attaching validates the default partition holds no records of the month
+                cursor.execute(
+                    f"CREATE TABLE {self._quote(name)} "
+                    f"(LIKE {self._quote(self.table)} INCLUDING DEFAULTS)"
+                )
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {self._quote(self.default_name)} "
+                    f"WHERE {key} >= %s AND {key} < %s RETURNING *) "
+                    f"INSERT INTO {self._quote(name)} SELECT * FROM moved",
+                    bounds,
+                )
+                cursor.execute(
+                    f"ALTER TABLE {self._quote(self.table)} ATTACH PARTITION {self._quote(name)} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    bounds,
+                )
+            created.append(name)
+        return created
+
+    def expire(self, retain_months, drop=False, today=None):
+        """
+        Detach (and drop) the partitions of months older than retain_months. Detached
+        partitions stay as standalone tables, e.g. to be archived with pg_dump.
+
+        :return: Names of detached partitions
+        """
+        today = today or date.today()
+        oldest = add_months(date(today.year, today.month, 1), -retain_months)
+        expired = []
+        for month, name in sorted(self.partitions().items()):
+            if month >= oldest:
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER TABLE {self._quote(self.table)} "
+                    f"DETACH PARTITION {self._quote(name)}"
+                )
+                if drop:
+                    cursor.execute(f"DROP TABLE {self._quote(name)}")
+            expired.append(name)
+        return expired
@@ -0,0 +1,296 @@
+import os
+import socket
+import threading
+import time
+import traceback
+import tracemalloc
+from datetime import datetime, timedelta
+
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from brightmls import models as bright_models
+from brightmls.models import IngestionTask
+from brightmls.services.base import BrightMLSBaseService
+from brightmls.services.grab_linear import BrightMLSGrabService
+from brightmls.services.refetch import BrightMLSRefetchService
+
+
+class LeaseLost(Exception):
+    """
+    The lease of the task expired and another worker claimed it
+    """
+
+
+class LeaseHeartbeat(threading.Thread):
+    """
+    Renews the lease of a task every third of the lease while the task is processed,
+    so a page slower than the lease does not hand the task to another worker.
+    Stops (lost is set) as soon as the task no longer belongs to the worker.
+
+    usage:
+        heartbeat = LeaseHeartbeat(task, worker_id, lease_seconds)
+        heartbeat.start()
+        process()
+        heartbeat.stop()
+    """
+
+    def __init__(self, task, worker_id, lease_seconds):
+        super().__init__(name=f"lease-{task.pk}", daemon=True)
+        self.task_id = task.pk
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = max(1, lease_seconds / 3)
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                if not self.renew():
+                    self.lost = True
+                    break
+        finally:
+            # the connection of this thread
+            connections.close_all()
+
+    def renew(self):
+        return IngestionTask.objects.filter(
+            pk=self.task_id,
+            worker=self.worker_id,
+            status=IngestionTask.STATUS_RUNNING,
+        ).update(
+            lease_expires_at=timezone.now() + timedelta(seconds=self.lease_seconds)
+        )
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class BrightMLSEnqueueService(BrightMLSBaseService):
+    """
+    Service to split an entity into key range partitions and store them as
+    IngestionTask rows, to be processed by any number of mls_worker processes.
+    """
+
+    partitions = 8
+    mode = IngestionTask.MODE_INSERT
+
+    def enqueue(self):
+        service = self.get_client()
+        entity_resource = self.get_entity_resource(service)
+        model_class = getattr(bright_models, self.entity_name)
+
+        key = get_partition_key(model_class, entity_resource)
+        print(f">> Splitting entity {self.entity_name} by {key.name}")
+
+        partitions = service.query(entity_resource).partitions(self.partitions, key=key)
+        tasks = IngestionTask.objects.bulk_create(
+            [
+                IngestionTask(
+                    entity=self.entity_name, mode=self.mode, token=partition.token
+                )
+                for partition in partitions
+            ]
+        )
+        for partition in partitions:
+            print(f">> {partition.key.name} in [{partition.lower}, {partition.upper})")
+        print(f">> {len(tasks)} tasks enqueued")
+        return tasks
+
+
+class BrightMLSWorkerService(BrightMLSGrabService):
+    """
+    Service processing IngestionTask rows. Tasks are claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED, so workers on any number of nodes never take
+    the same task. Every written chunk of records is checkpointed in the task token,
+    the lease is renewed by a heartbeat thread while the worker is alive; tasks whose
+    lease expired (killed worker) are claimed again and continue after the last
+    checkpoint. Failed tasks are retried up to max_attempts, tasks whose lease expired
+    on the last attempt are marked as failed.
+    """
+
+    lease_seconds = 600
+    max_attempts = 3
+    idle_sleep = 10
+    exit_when_empty = False
+    max_tasks = None
+    worker_id = None
+
+    def __init__(self):
+        super().__init__()
+        self.worker_id = self.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    def run(self):
+        print(f">> Worker {self.worker_id} started")
+        processed = 0
+        while self.max_tasks is None or processed < self.max_tasks:
+            task = self.claim()
+            if task is None:
+                if self.exit_when_empty:
+                    break
+                time.sleep(self.idle_sleep)
+                continue
+
+            self.process(task)
+            processed += 1
+
+        print(f">> Worker {self.worker_id} finished, {processed} tasks processed")
+        return processed
+
+    def _lease_expiry(self):
+        return timezone.now() + timedelta(seconds=self.lease_seconds)
+
+    def fail_expired(self):
+        """
+        Mark tasks whose lease expired on the last attempt (worker killed) as failed,
+        they are not claimed again
+
+        :return: Count of failed tasks
+        """
+        return IngestionTask.objects.filter(
+            status=IngestionTask.STATUS_RUNNING,
+            lease_expires_at__lt=timezone.now(),
+            attempt__gte=self.max_attempts,
+        ).update(
+            status=IngestionTask.STATUS_FAILED,
+            error="The lease expired on the last attempt, the worker was killed",
+            lease_expires_at=None,
+            updated_at=timezone.now(),
+        )
+
+    def claim(self):
+        """
+        Lock the oldest available task, mark it as running by this worker and return it
+        """
+        self.fail_expired()
+        with transaction.atomic():
+            task = (
+                IngestionTask.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=IngestionTask.STATUS_PENDING)
+                    | Q(
+                        status=IngestionTask.STATUS_RUNNING,
+                        lease_expires_at__lt=timezone.now(),
+                    )
+                )
+                .filter(attempt__lt=self.max_attempts)
+                .order_by("id")
+                .first()
+            )
+            if task is None:
+                return None
+
+            task.status = IngestionTask.STATUS_RUNNING
+            task.attempt += 1
+            task.worker = self.worker_id
+            task.lease_expires_at = self._lease_expiry()
+            task.save()
+        return task
+
+    def process(self, task):
+        print(f">> Processing task {task}, attempt {task.attempt}")
+        heartbeat = LeaseHeartbeat(task, self.worker_id, self.lease_seconds)
+        heartbeat.start()
+        try:
+            try:
+                self._process_task(task)
+            finally:
+                heartbeat.stop()
+        except LeaseLost:
+            print(f"\n>> Lease of task {task.pk} was lost to another worker")
+        except Exception:
+            status = IngestionTask.STATUS_PENDING
+            if task.attempt >= self.max_attempts:
+                status = IngestionTask.STATUS_FAILED
+            self._finish(task, status, error=traceback.format_exc())
+            print(f"\n>> Task {task.pk} failed:\n{traceback.format_exc()}")
+        except BaseException:
+            # interrupted, let another worker continue after the last checkpoint
+            self._finish(task, IngestionTask.STATUS_PENDING)
+            raise
+        else:
+            self._finish(task, IngestionTask.STATUS_DONE)
+            print(f"\n>> Task {task.pk} done, {task.inserted:,} records")
+
+    def _process_task(self, task):
+        self.entity_name = task.entity
+        # the client (token, reflected metadata) is shared by the tasks of this worker
+        if self.service is None:
+            self.service = self.get_client()
+        service = self.service
+        entity_resource = self.get_entity_resource(service)
+        model_class = getattr(bright_models, self.entity_name)
+
+        query = service.query(entity_resource)
+        if self.use_select:
+            select_properties = self._get_select_properties(
+                model_class, entity_resource
+            )
+            if select_properties:
+                query = query.select(*select_properties)
+
+        tracemalloc.start()
+        self.start_timestamp = datetime.now()
+        partition = query.partition(task.token)
+
+        entities = []
+        for entity in partition:
+            entities.append(entity)
+            if len(entities) >= self._get_page_size():
+                self._write(task, model_class, entities)
+                self._checkpoint(task, partition, len(entities))
+                entities = []
+
+        if entities:
+            self._write(task, model_class, entities)
+            self._checkpoint(task, partition, len(entities))
+
+    def _write(self, task, model_class, entities):
+        if task.mode == IngestionTask.MODE_UPSERT:
+            BrightMLSRefetchService._bulk_upsert(model_class, entities)
+            pk_field = model_class._map_field_name_to_odata(model_class._meta.pk.name)
+            self._report_inserted(
+                len(entities), model_class._get_odata_value(entities[-1], pk_field)
+            )
+        else:
+            self._insert_entities(model_class, entities)
+
+    def _checkpoint(self, task, partition, count):
+        """
+        Store the progress of the partition, as long as the task still belongs to this
+        worker (the lease is renewed by LeaseHeartbeat)
+        """
+        task.token = partition.token
+        task.inserted += count
+        updated = IngestionTask.objects.filter(
+            pk=task.pk, worker=self.worker_id, status=IngestionTask.STATUS_RUNNING
+        ).update(
+            token=task.token,
+            inserted=task.inserted,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            raise LeaseLost(task.pk)
+
+    def _finish(self, task, status, error=None):
+        task.status = status
+        task.error = error
+        IngestionTask.objects.filter(pk=task.pk, worker=self.worker_id).update(
+            status=status,
+            error=error,
+            lease_expires_at=None,
+            updated_at=timezone.now(),
+        )
+
+
+def get_partition_key(model_class, entity_resource):
+    """
+    Entity property matching the primary key of the model, used for key ranges
+    """
+    pk_name = model_class._map_field_name_to_odata(model_class._meta.pk.name)
+    key = getattr(entity_resource, pk_name, None)
+    if key is None:
+        raise ValueError(f"Entity {entity_resource} has no {pk_name} property")
+    return key
@@ -0,0 +1,93 @@
+import logging
+import threading
+import time
+
+from django.db import connection
+from brightmls.models import RequestBudget
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Request budget shared by every process and node calling the Bright MLS API
+    (mls_grab, mls_worker, ...), so together they stay within the API quota.
+
+    The bucket is a RequestBudget row. Every request takes a token with a single
+    upsert statement which refills the bucket from the elapsed DB time (one clock
+    for all nodes) and returns the balance. A negative balance is a reservation:
+    the caller sleeps until its token is due, no lock is held while waiting and
+    concurrent callers are served in order.
+
+    usage:
+        bucket = TokenBucket(rate=10, burst=20)
+        session = BrightMLSSession(rate_limiter=bucket)
+    """
+
+    def __init__(self, rate, burst, name="brightmls"):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.name = name
+        self.granted = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<TokenBucket {self.name}: {self.rate}/s, burst {self.burst}>"
+
+    def _take_token(self):
+        """
+        :return: Balance of the bucket after taking one token
+        """
+        table = connection.ops.quote_name(RequestBudget._meta.db_table)
+        # statements waiting for the row lock may have started before the last update
+        elapsed = (
+            f"GREATEST(0, EXTRACT(EPOCH FROM statement_timestamp() - {table}.updated_at))"
+        )
+        balance = (
+            f"LEAST(%(burst)s::float8, {table}.tokens + %(rate)s::float8 * {elapsed}) - 1"
+        )
+        sql = f"""
+            INSERT INTO {table} (name, tokens, updated_at, granted, waits, wait_seconds)
+            VALUES (%(name)s, %(burst)s - 1, statement_timestamp(), 1, 0, 0)
+            ON CONFLICT (name) DO UPDATE SET
+                tokens = {balance},
+                updated_at = GREATEST({table}.updated_at, statement_timestamp()),
+                granted = {table}.granted + 1,
+                waits = {table}.waits + CASE WHEN {balance} < 0 THEN 1 ELSE 0 END,
+                wait_seconds = {table}.wait_seconds
+                    + GREATEST(0, -({balance})) / %(rate)s::float8
+            RETURNING tokens
+        """
+        params = {"name": self.name, "rate": self.rate, "burst": self.burst}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+
+    def acquire(self):
+        """
+        Take one token, sleeping until it is available.
+
+        :return: Seconds waited
+        """
+        balance = self._take_token()
+        wait = max(0.0, -balance / self.rate)
+        with self._lock:
+            self.granted += 1
+            if wait:
+                self.waits += 1
+                self.wait_seconds += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def metrics(self) -> dict:
+        """
+        Metrics of this process, RequestBudget rows hold the totals of all processes
+        """
+        return {
+            "granted": self.granted,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
@@ -0,0 +1,56 @@
+from django.db import transaction
+from brightmls import models as bright_models
+from brightmls.services.base import BrightMLSBaseService
+from brightmls.services.partitions import get_unique_fields
+
+
+class BrightMLSRefetchService(BrightMLSBaseService):
+    """
+    Service to refetch specific records from Bright MLS API by primary key
+    and update them in the database (records missing locally are created).
+    Keys are requested in batches with `in (...)` filters, a few requests per thousand keys.
+    """
+
+    keys = None
+    chunk_size = 100
+    max_workers = 4
+
+    def refetch(self):
+        service = self.get_client()
+        entity_resource = self.get_entity_resource(service)
+        model_class = getattr(bright_models, self.entity_name)
+
+        print(f">> Refetching {len(self.keys):,} records of entity: {self.entity_name}")
+
+        results = service.query(entity_resource).get_many(
+            self.keys, chunk_size=self.chunk_size, max_workers=self.max_workers
+        )
+
+        self._bulk_upsert(model_class, list(results.values()))
+
+        missing = len(set(self.keys) - set(results.keys()))
+        print(f">> updated: {len(results):,}; not found in Bright MLS: {missing:,}")
+        return len(results), missing
+
+    @staticmethod
+    def _bulk_upsert(model_class, entities):
+        """
+        Create or update the records of the model and of its parts in one transaction
+
+        :param entities: python_odata entities or raw dict rows
+        """
+        with transaction.atomic():
+            for part_class in model_class.get_part_models():
+                unique_fields = get_unique_fields(part_class)
+                update_fields = [
+                    field.name
+                    for field in part_class._meta.concrete_fields
+                    if field.name not in unique_fields and not field.generated
+                ]
+                part_class.objects.bulk_create(
+                    [part_class.from_python_odata(entity) for entity in entities],
+                    batch_size=500,
+                    update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=update_fields,
+                )
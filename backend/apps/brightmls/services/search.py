@@ -0,0 +1,130 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import models
+from django.db.models import F, Q
+from brightmls import models as bright_models
+from brightmls.models import SEARCH_CONFIG, location_point
+
+
+def get_search_query(text):
+    """
+    :param text: Keywords as typed in a search box: words, "quoted phrases",
+    -excluded words, OR (websearch_to_tsquery syntax)
+    """
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+
+
+def search_documents(queryset, text, rank=False):
+    """
+    Records of a model with a SearchDocument (see models.search_document) matching the
+    keywords, found through the GIN index
+
+    :param rank: Annotate search_rank and order by it, best matches first
+    """
+    query = get_search_query(text)
+    queryset = queryset.filter(SearchDocument=query)
+    if rank:
+        queryset = queryset.annotate(
+            search_rank=SearchRank(F("SearchDocument"), query)
+        ).order_by("-search_rank")
+    return queryset
+
+
+# BrightProperties fields with a trigram index (see models.trigram_index)
+PROPERTY_SIMILAR_FIELDS = ["FullStreetAddress", "City", "PostalCode", "SubdivisionName"]
+
+
+def search_properties(text, queryset=None, similar=False):
+    """
+    Listings matching the keywords in the listing id and address (BrightProperties) or
+    in the remarks (BrightPropertiesDetails). Both tables are searched through their
+    own GIN index and the matching keys are combined with UNION.
+
+    usage: search_properties('"finished basement" -auction').filter(MlsStatus="Active")
+    :param similar: Also listings with an address, city, postal code or subdivision
+    similar to the text (search_similar on PROPERTY_SIMILAR_FIELDS), for partial and
+    misspelled names
+    """
+    if queryset is None:
+        queryset = bright_models.BrightProperties.objects.all()
+    keys = [
+        search_documents(bright_models.BrightProperties.objects.all(), text),
+        search_documents(bright_models.BrightPropertiesDetails.objects.all(), text),
+    ]
+    if similar:
+        keys.append(
+            search_similar(
+                bright_models.BrightProperties.objects.all(),
+                PROPERTY_SIMILAR_FIELDS,
+                text,
+            )
+        )
+    keys = [keys_queryset.values("ListingKey") for keys_queryset in keys]
+    return queryset.filter(ListingKey__in=keys[0].union(*keys[1:]))
+
+
+def search_similar(queryset, field_names, text):
+    """
+    Records with a value similar to the text in any of the fields with a trigram index
+    (see models.trigram_index): partial and misspelled words match (word similarity
+    over pg_trgm.word_similarity_threshold, 0.6 by default)
+
+    usage: search_similar(BrightMembers.objects.all(), ["MemberFullName"], "jon smit")
+    """
+    condition = Q()
+    for field_name in field_names:
+        condition |= Q(**{f"{field_name}__trigram_word_similar": text})
+    return queryset.filter(condition)
+
+
+def autocomplete(queryset, field_name, text, limit=10):
+    """
+    Distinct values of a field with a trigram index (see models.trigram_index) most
+    similar to the typed text, for suggestions while typing a name or an address
+
+    usage: autocomplete(BrightOffices.objects.all(), "OfficeName", "keler wiliams")
+    :return: [(value, similarity)], most similar first
+    """
+    return list(
+        search_similar(queryset, [field_name], text)
+        .annotate(similarity=TrigramWordSimilarity(text, field_name))
+        .values_list(field_name, "similarity")
+        .distinct()
+        .order_by("-similarity", field_name)[:limit]
+    )
+
+
+def in_bounding_box(
+    queryset,
+    west,
+    south,
+    east,
+    north,
+    longitude="LongitudeNumeric",
+    latitude="LatitudeNumeric",
+):
+    """
+    Records located in a map area, found through the GiST index of
+    models.location_point (point <@ box)
+
+    usage: in_bounding_box(BrightProperties.objects.all(), -77.10, 38.85, -76.95, 38.95)
+    """
+    corners = [
+        models.Func(
+            models.Value(float(x), output_field=models.FloatField()),
+            models.Value(float(y), output_field=models.FloatField()),
+            function="point",
+        )
+        for x, y in ((west, south), (east, north))
+    ]
+    contained = models.Func(
+        location_point(longitude, latitude),
+        models.Func(*corners, function="box"),
+        template="%(expressions)s",
+        arg_joiner=" <@ ",
+        output_field=models.BooleanField(),
+    )
+    return queryset.filter(contained)
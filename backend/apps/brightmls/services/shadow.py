@@ -0,0 +1,220 @@
+import re
+import time
+
+from django.apps.registry import Apps
+from django.db import OperationalError, connection, transaction
+from brightmls.models import BaseModel
+from brightmls.services.dictionary import create_views, drop_views
+from brightmls.services.indexes import get_build_settings, run_statements
+from brightmls.services.partitions import is_partitioned
+
+
+def shadow_model(model_class, db_table, apps=None):
+    """
+    Copy of the model class stored in another table, registered in a private app
+    registry so it does not clash with the real model (migrations ignore it).
+    Shadow models of the parts of a model share one registry (apps), so the shadow
+    model resolves its parts (BaseModel.get_part_models) to their shadow models.
+    """
+    attrs = {"__module__": model_class.__module__, "parts": model_class.parts}
+    for field in model_class._meta.local_fields:
+        attrs[field.name] = field.clone()
+    attrs["Meta"] = type(
+        "Meta",
+        (),
+        {
+            "app_label": model_class._meta.app_label,
+            "db_table": db_table,
+            "managed": False,
+            "apps": apps or Apps(),
+        },
+    )
+    return type(model_class.__name__, (BaseModel,), attrs)
+
+
+class ShadowTable:
+    """
+    Full reload of a model's table without downtime for readers.
+
+    Records are loaded into "<table>__shadow", an UNLOGGED copy of the table without
+    indexes, through shadow_model(). After the load the shadow table is made durable
+    (SET LOGGED), the indexes of the live table are rebuilt on it in parallel, and it
+    replaces the live table in one short transaction (drop and rename), so readers
+    see the old records until the commit and the new ones right after it.
+    Models split into several tables (BaseModel.parts) get a shadow table per part,
+    written together by the shadow model and swapped in the same transaction.
+
+    usage:
+        shadow = ShadowTable(bright_models.BrightProperties)
+        shadow.create()
+        load(shadow.model)
+        shadow.build_indexes()
+        shadow.swap()
+    """
+
+    suffix = "__shadow"
+    index_workers = 4
+    # the swap waits this long for readers before retrying, so it does not block them
+    lock_timeout = "5s"
+    swap_attempts = 60
+
+    def __init__(self, model_class):
+        self.model_class = model_class
+        self.table = model_class._meta.db_table
+        self.shadow_table = f"{self.table}{self.suffix}"
+        apps = Apps()
+        # (part model, live table, shadow table), the model itself first
+        self.tables = []
+        for part_class in model_class.get_part_models():
+            table = part_class._meta.db_table
+            shadow_table = f"{table}{self.suffix}"
+            shadow_model(part_class, shadow_table, apps=apps)
+            self.tables.append((part_class, table, shadow_table))
+        self.model = apps.get_registered_model(
+            model_class._meta.app_label, model_class.__name__
+        )
+
+    def _quote(self, name):
+        return connection.ops.quote_name(name)
+
+    def exists(self):
+        """
+        :return: True if the shadow tables of all parts exist (a reload can continue)
+        """
+        with connection.cursor() as cursor:
+            table_names = connection.introspection.table_names(cursor)
+        return all(shadow_table in table_names for _, _, shadow_table in self.tables)
+
+    def create(self):
+        """
+        (Re)create the empty shadow tables: same columns and NOT NULL constraints as the
+        live tables, no primary key or other indexes and no WAL while loading
+        """
+        for part_class, table, _ in self.tables:
+            if is_partitioned(part_class):
+                raise ValueError(f"{table} is partitioned, it can not be reloaded")
+        self.drop()
+        with connection.cursor() as cursor:
+            for _, table, shadow_table in self.tables:
+                cursor.execute(
+                    f"CREATE UNLOGGED TABLE {self._quote(shadow_table)} "
+                    f"(LIKE {self._quote(table)} INCLUDING DEFAULTS INCLUDING GENERATED)"
+                )
+
+    def drop(self):
+        with connection.cursor() as cursor:
+            for _, _, shadow_table in self.tables:
+                cursor.execute(f"DROP TABLE IF EXISTS {self._quote(shadow_table)}")
+
+    def _live_indexes(self, table):
+        """
+        :return: (index name, CREATE INDEX statement, constraint type or None) of a live table
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT i.indexname, i.indexdef, c.contype
+                FROM pg_indexes i
+                LEFT JOIN pg_constraint c
+                    ON c.conname = i.indexname AND c.conrelid = %s::regclass
+                WHERE i.schemaname = current_schema() AND i.tablename = %s
+                """,
+                [self._quote(table), table],
+            )
+            return cursor.fetchall()
+
+    def _shadow_index_name(self, name):
+        # index names are unique per schema and limited to 63 characters
+        return f"{name[:55]}{self.suffix}"
+
+    def build_indexes(self):
+        """
+        Make the shadow tables durable and build the indexes and constraints of the
+        live tables on them, in parallel
+        """
+        cleanups = []
+        statements = []
+        constraints = []
+        for _, table, shadow_table in self.tables:
+            print(f">> Making {shadow_table} durable")
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {self._quote(shadow_table)} SET LOGGED")
+
+            for name, definition, contype in self._live_indexes(table):
+                shadow_name = self._shadow_index_name(name)
+                # leftovers of an interrupted build
+                cleanups.append(
+                    f"ALTER TABLE {self._quote(shadow_table)} "
+                    f"DROP CONSTRAINT IF EXISTS {self._quote(shadow_name)}"
+                )
+                cleanups.append(f"DROP INDEX IF EXISTS {self._quote(shadow_name)}")
+                # nobody reads the shadow table, so plain (faster) builds are used
+                statement = re.sub(
+                    r"^(CREATE (?:UNIQUE )?INDEX) \S+ ON (?:ONLY )?\S+",
+                    lambda m: (
+                        f"{m.group(1)} {self._quote(shadow_name)} "
+                        f"ON {self._quote(shadow_table)}"
+                    ),
+                    definition,
+                )
+                statements.append(statement)
+                if contype in ("p", "u"):
+                    kind = "PRIMARY KEY" if contype == "p" else "UNIQUE"
+                    constraints.append(
+                        f"ALTER TABLE {self._quote(shadow_table)} "
+                        f"ADD CONSTRAINT {self._quote(shadow_name)} "
+                        f"{kind} USING INDEX {self._quote(shadow_name)}"
+                    )
+
+        with connection.cursor() as cursor:
+            for sql in cleanups:
+                cursor.execute(sql)
+
+        print(f">> Building {len(statements)} indexes of {self.table}")
+        run_statements(
+            statements, workers=self.index_workers, setup=get_build_settings()
+        )
+        with connection.cursor() as cursor:
+            for sql in constraints:
+                cursor.execute(sql)
+            for _, _, shadow_table in self.tables:
+                cursor.execute(f"ANALYZE {self._quote(shadow_table)}")
+
+    def swap(self):
+        """
+        Replace the live tables with the shadow tables in one transaction. Retried while
+        readers hold a live table longer than lock_timeout
+        """
+        for attempt in range(1, self.swap_attempts + 1):
+            try:
+                self._swap()
+            except OperationalError as e:
+                # lock_not_available
+                if getattr(e.__cause__, "pgcode", None) != "55P03":
+                    raise
+                print(f">> Swap of {self.table} waits for readers (attempt {attempt})")
+                time.sleep(1)
+            else:
+                print(f">> {self.shadow_table} swapped in as {self.table}")
+                return
+        raise OperationalError(f"Cannot lock {self.table} to swap the shadow table")
+
+    def _swap(self):
+        indexes = {table: self._live_indexes(table) for _, table, _ in self.tables}
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = '{self.lock_timeout}'")
+            # the decoded views read the live tables, they are recreated on the new ones
+            drop_views()
+            for _, table, shadow_table in self.tables:
+                cursor.execute(f"DROP TABLE {self._quote(table)}")
+                cursor.execute(
+                    f"ALTER TABLE {self._quote(shadow_table)} "
+                    f"RENAME TO {self._quote(table)}"
+                )
+                for name, _, _ in indexes[table]:
+                    # renaming the index of a constraint renames the constraint too
+                    cursor.execute(
+                        f"ALTER INDEX {self._quote(self._shadow_index_name(name))} "
+                        f"RENAME TO {self._quote(name)}"
+                    )
+            create_views()
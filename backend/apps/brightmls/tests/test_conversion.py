@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from brightmls.services.conversion import (
+    CONVERT_DATETIME,
+    CONVERT_VALUE,
+    PageConversionPool,
+    convert_page,
+    get_conversion_fields,
+    serialize_page,
+    split_row,
+)
+
+
+class ConversionTestCase(SimpleTestCase):
+    def test_conversion_fields(self):
+        fields = get_conversion_fields(bright_models.BrightOffices)
+        self.assertEqual(
+            [odata_field for odata_field, _, _ in fields],
+            [
+                field.column
+                for field in bright_models.BrightOffices._meta.concrete_fields
+            ],
+        )
+        kinds = {odata_field: kind for odata_field, kind, _ in fields}
+        self.assertEqual(kinds["ModificationTimestamp"], CONVERT_DATETIME)
+        self.assertEqual(kinds["OfficeName"], CONVERT_VALUE)
+
+    def test_convert_page(self):
+        fields = (
+            ("OfficeKey", CONVERT_VALUE, None),
+            ("OfficeName", CONVERT_VALUE, "Unknown"),
+            ("ModificationTimestamp", CONVERT_DATETIME, None),
+        )
+        payload = serialize_page(
+            [
+                {"OfficeKey": "1", "ModificationTimestamp": "2024-10-01T12:30:00Z"},
+                {"OfficeKey": "2", "OfficeName": None, "Other": 1},
+            ]
+        )
+        self.assertEqual(
+            convert_page(fields, payload),
+            [
+                ("1", "Unknown", datetime(2024, 10, 1, 12, 30, tzinfo=timezone.utc)),
+                ("2", None, None),
+            ],
+        )
+
+    def test_split_row(self):
+        model_class = bright_models.BrightProperties
+        row = tuple(range(len(get_conversion_fields(model_class))))
+        parts = split_row(model_class, row)
+        self.assertEqual(
+            [part_class for part_class, _ in parts], model_class.get_part_models()
+        )
+        self.assertEqual(sum((values for _, values in parts), ()), row)
+        for part_class, values in parts:
+            self.assertEqual(len(values), len(part_class._meta.concrete_fields))
+            instance = part_class(*values)
+            self.assertEqual(
+                [
+                    getattr(instance, field.attname)
+                    for field in part_class._meta.concrete_fields
+                ],
+                list(values),
+            )
+
+
+@mock.patch("brightmls.services.conversion.ProcessPoolExecutor", ThreadPoolExecutor)
+class PageConversionPoolTestCase(SimpleTestCase):
+    def test_pages_in_order(self):
+        fields = get_conversion_fields(bright_models.BrightOffices)
+        index = [odata_field for odata_field, _, _ in fields].index("OfficeKey")
+        pages = [[{"OfficeKey": str(key)}] for key in range(6)]
+        converted = []
+        with PageConversionPool(
+            bright_models.BrightOffices, workers=2, max_pending=2
+        ) as pool:
+            for page in pages:
+                converted += pool.submit(page)
+                self.assertLessEqual(len(pool.pending), 2)
+            converted += pool.drain()
+        self.assertEqual(
+            [rows[0][index] for rows in converted], ["0", "1", "2", "3", "4", "5"]
+        )
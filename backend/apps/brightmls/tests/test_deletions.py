@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from brightmls.services import deletions
+from brightmls.services.deletions import BrightMLSDeletionService
+
+
+class DeletionModelTestCase(SimpleTestCase):
+    def setUp(self):
+        self.service = BrightMLSDeletionService()
+
+    def test_mapped_tables(self):
+        self.assertIs(
+            self.service.get_model("Property"), bright_models.BrightProperties
+        )
+        self.assertIs(self.service.get_model("Member"), bright_models.BrightMembers)
+
+    def test_tables_named_like_the_models(self):
+        self.assertIs(
+            self.service.get_model("BrightOffices"), bright_models.BrightOffices
+        )
+
+    def test_unknown_tables(self):
+        self.assertIsNone(self.service.get_model("Unknown"))
+        self.assertIsNone(self.service.get_model(None))
+        # not an MLS table
+        self.assertIsNone(self.service.get_model("Checkpoint"))
+
+
+class DeleteBatchTestCase(SimpleTestCase):
+    def setUp(self):
+        self.service = BrightMLSDeletionService()
+        patcher = mock.patch.object(deletions, "connection")
+        self.connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection.ops.quote_name.side_effect = lambda name: f'"{name}"'
+        self.cursor = self.connection.cursor.return_value.__enter__.return_value
+        self.cursor.rowcount = 2
+
+    def test_one_statement_per_table(self):
+        timestamp = datetime(2024, 10, 1, tzinfo=timezone.utc)
+        self.service._delete_batch(
+            [
+                (1, "Property", "10", timestamp),
+                (2, "Property", "11", timestamp),
+                (3, "Member", "5", timestamp),
+                (4, "Unknown", "1", timestamp),
+                (5, "Member", None, timestamp),
+                (6, "Office", "invalid", timestamp),
+            ]
+        )
+        self.assertEqual(
+            [call.args for call in self.cursor.execute.call_args_list],
+            [
+                (
+                    'DELETE FROM "brightmls_brightpropertiesdetails" '
+                    'WHERE "ListingKey" = ANY(%s)',
+                    [[10, 11]],
+                ),
+                (
+                    'DELETE FROM "brightmls_brightproperties" '
+                    'WHERE "ListingKey" = ANY(%s)',
+                    [[10, 11]],
+                ),
+                (
+                    'DELETE FROM "brightmls_brightmembers" WHERE "MemberKey" = ANY(%s)',
+                    [[5]],
+                ),
+            ],
+        )
+        self.assertEqual(
+            self.service.deleted, {"BrightProperties": 2, "BrightMembers": 2}
+        )
+        self.assertEqual(
+            self.service.unknown_tables,
+            {"Unknown": 1, "Member": 1, "Office (invalid keys)": 1},
+        )
+
+
+class DeletionFeedTestCase(SimpleTestCase):
+    def setUp(self):
+        self.service = BrightMLSDeletionService()
+        self.watermark = (datetime(2024, 10, 1, 12, 0, tzinfo=timezone.utc), 100)
+
+    def get_sql(self, watermark, overlap=None):
+        return self.service._new_deletions(watermark, overlap).query.sql_with_params()
+
+    def test_after_the_watermark(self):
+        sql, params = self.get_sql(self.watermark)
+        self.assertIn('"DeletionTimestamp" > %s', sql)
+        self.assertEqual(params[:3], (self.watermark[0], self.watermark[0], 100))
+
+    def test_overlap_before_the_watermark(self):
+        sql, params = self.get_sql(self.watermark, timedelta(hours=1))
+        self.assertIn('"DeletionTimestamp" >= %s', sql)
+        self.assertEqual(params, (datetime(2024, 10, 1, 11, 0, tzinfo=timezone.utc),))
+
+    @mock.patch.object(deletions, "transaction")
+    @mock.patch.object(BrightMLSDeletionService, "_save_watermark")
+    @mock.patch.object(BrightMLSDeletionService, "_delete_batch")
+    def test_late_rows_applied_once_per_run(self, delete_batch, save_watermark, _):
+        timestamp = self.watermark[0]
+        # a row ingested after the watermark was saved, with an older timestamp
+        late = (90, "Member", "5", timestamp - timedelta(minutes=10))
+        newer = (101, "Member", "6", timestamp + timedelta(minutes=1))
+        self.service.batch_size = 2
+        batches = [[late, newer], []]
+        with mock.patch.object(
+            self.service, "get_watermark", return_value=self.watermark
+        ), mock.patch.object(
+            self.service, "_new_deletions", side_effect=batches
+        ) as new_deletions:
+            self.service.apply()
+
+        self.assertEqual(
+            new_deletions.call_args_list,
+            [
+                mock.call(self.watermark, self.service.overlap),
+                mock.call((newer[3], 101), None),
+            ],
+        )
+        delete_batch.assert_called_once_with([late, newer])
+        save_watermark.assert_called_once_with(newer[3], 101)
@@ -0,0 +1,128 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from brightmls.fields import UNKNOWN_CODE, Dictionary, DictionaryField
+
+
+def get_dictionary(codes):
+    dictionary = Dictionary("MlsStatus")
+    for value, code in codes.items():
+        dictionary._add(code, value)
+    return dictionary
+
+
+class DictionaryTestCase(SimpleTestCase):
+    def setUp(self):
+        self.dictionary = get_dictionary({"Active": 1, "Closed": 2})
+        patcher = mock.patch.object(Dictionary, "load")
+        self.load = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_known_values(self):
+        self.assertEqual(self.dictionary.encode("Closed", connection), 2)
+        self.assertEqual(self.dictionary.decode(1), "Active")
+        self.load.assert_not_called()
+
+    def test_unknown_value_of_lookup(self):
+        self.assertEqual(
+            self.dictionary.encode("Pending", connection, create=False), UNKNOWN_CODE
+        )
+        self.load.assert_called_once()
+
+    @mock.patch("brightmls.fields.transaction.on_commit")
+    def test_new_code_cached_on_commit(self, on_commit):
+        db = mock.MagicMock(alias="default")
+        db.cursor.return_value.__enter__.return_value.fetchone.return_value = (3,)
+
+        self.assertEqual(self.dictionary.encode("Pending", db), 3)
+        db.cursor.return_value.__enter__.return_value.execute.assert_called_once_with(
+            "SELECT brightmls_dictionary_encode(%s, %s)", ["MlsStatus", "Pending"]
+        )
+        self.assertNotIn("Pending", self.dictionary.codes)
+
+        callback = on_commit.call_args.args[0]
+        self.assertEqual(on_commit.call_args.kwargs, {"using": "default"})
+        callback()
+        self.assertEqual(self.dictionary.codes["Pending"], 3)
+        self.assertEqual(self.dictionary.values[3], "Pending")
+
+
+class DictionaryFieldTestCase(SimpleTestCase):
+    def setUp(self):
+        self.field = bright_models.BrightProperties._meta.get_field("MlsStatus")
+        dictionary = get_dictionary({"Active": 1, "Closed": 2})
+        for patcher in [
+            mock.patch.object(Dictionary, "get", return_value=dictionary),
+            mock.patch.object(Dictionary, "load"),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def encoded(self, encoded=True):
+        return mock.patch.object(DictionaryField, "is_encoded", return_value=encoded)
+
+    def test_text_column(self):
+        with self.encoded(False):
+            self.assertEqual(
+                self.field.get_db_prep_save("Active", connection), "Active"
+            )
+            self.assertEqual(
+                self.field.get_db_prep_value("Active", connection), "Active"
+            )
+        self.assertEqual(self.field.from_db_value("Active", None, connection), "Active")
+        self.assertEqual(self.field.db_type(connection), "varchar(255)")
+
+    def test_encoded_column(self):
+        with self.encoded():
+            self.assertEqual(self.field.get_db_prep_save("Closed", connection), 2)
+            self.assertEqual(self.field.get_db_prep_value("Closed", connection), 2)
+            self.assertEqual(
+                self.field.get_db_prep_value("Pending", connection), UNKNOWN_CODE
+            )
+            self.assertIsNone(self.field.get_db_prep_save(None, connection))
+        self.assertEqual(self.field.from_db_value(1, None, connection), "Active")
+        self.assertEqual(self.field.to_python(2), "Closed")
+
+    def test_exact_and_in_lookups_compare_codes(self):
+        queryset = bright_models.BrightProperties.objects.only("ListingKey")
+        with self.encoded():
+            sql, params = queryset.filter(MlsStatus="Active").query.sql_with_params()
+            self.assertIn('"MlsStatus" = %s', sql)
+            self.assertEqual(params, (1,))
+
+            sql, params = queryset.filter(
+                MlsStatus__in=["Active", "Closed"]
+            ).query.sql_with_params()
+            self.assertEqual(params, (1, 2))
+
+    def test_text_lookups_of_encoded_column_match_dictionary_values(self):
+        queryset = bright_models.BrightProperties.objects.only("ListingKey")
+        with self.encoded():
+            sql, params = queryset.filter(
+                MlsStatus__icontains="act"
+            ).query.sql_with_params()
+        self.assertIn(
+            '"MlsStatus" IN (SELECT "brightmls_dictionarycode"."code" '
+            'FROM "brightmls_dictionarycode"',
+            sql,
+        )
+        self.assertIn('"brightmls_dictionarycode"."dictionary" = %s', sql)
+        self.assertEqual(params, ("MlsStatus", "%act%"))
+
+    def test_text_lookups_of_text_column(self):
+        queryset = bright_models.BrightProperties.objects.only("ListingKey")
+        with self.encoded(False):
+            sql, params = queryset.filter(
+                MlsStatus__startswith="Act"
+            ).query.sql_with_params()
+        self.assertNotIn("brightmls_dictionarycode", sql)
+        self.assertEqual(params, ("Act%",))
+
+    def test_deconstruct(self):
+        name, path, args, kwargs = self.field.deconstruct()
+        self.assertEqual(path, "brightmls.fields.DictionaryField")
+        self.assertEqual(
+            kwargs, {"dictionary": "MlsStatus", "max_length": 255, "null": True}
+        )
@@ -0,0 +1,180 @@
+from datetime import date, datetime, timezone
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from brightmls.fields import Dictionary, DictionaryField
+from brightmls.services import export
+from brightmls.services.export import BrightMLSExportService
+
+
+def get_fields(model_class, *names):
+    return [(name, model_class._meta.get_field(name)) for name in names]
+
+
+class ExportCommandTestCase(SimpleTestCase):
+    def test_nothing_to_do(self):
+        with self.assertRaisesRegex(CommandError, "Nothing to do"):
+            call_command("mls_export", "BrightOffices")
+
+    def test_missing_pyarrow(self):
+        error = ImportError(
+            "The 'arrow' columnar backend requires pyarrow to be installed"
+        )
+        with mock.patch.object(BrightMLSExportService, "export", side_effect=error):
+            with self.assertRaisesRegex(CommandError, "requires pyarrow"):
+                call_command(
+                    "mls_export", "BrightOffices", "--output", "offices.parquet"
+                )
+
+
+class CopyValueTestCase(SimpleTestCase):
+    def copy_value(self, value, model_class, name):
+        return BrightMLSExportService._copy_value(
+            value, model_class._meta.get_field(name)
+        )
+
+    def test_null(self):
+        self.assertEqual(
+            self.copy_value(None, bright_models.BrightMembers, "MemberFullName"), "\\N"
+        )
+
+    def test_text_escaping(self):
+        self.assertEqual(
+            self.copy_value(
+                "C:\\Homes\tA\nB\rC", bright_models.BrightMembers, "MemberFullName"
+            ),
+            "C:\\\\Homes\\tA\\nB\\rC",
+        )
+        # an "\N" in the data is not read as NULL
+        self.assertEqual(
+            self.copy_value("\\N", bright_models.BrightMembers, "MemberFullName"),
+            "\\\\N",
+        )
+
+    def test_booleans(self):
+        self.assertEqual(
+            self.copy_value(True, bright_models.BrightMembers, "MemberPreviewYN"), "t"
+        )
+        self.assertEqual(
+            self.copy_value(False, bright_models.BrightMembers, "MemberPreviewYN"), "f"
+        )
+
+    def test_dates(self):
+        self.assertEqual(
+            self.copy_value(
+                datetime(2024, 10, 1, 12, 30, tzinfo=timezone.utc),
+                bright_models.BrightMembers,
+                "ModificationTimestamp",
+            ),
+            "2024-10-01T12:30:00+00:00",
+        )
+        self.assertEqual(
+            self.copy_value(
+                date(2024, 10, 1), bright_models.BrightMembers, "ModificationTimestamp"
+            ),
+            "2024-10-01",
+        )
+
+    def test_json(self):
+        self.assertEqual(
+            self.copy_value(
+                ["CRS", 'A\t"B"'], bright_models.BrightMembers, "MemberDesignation"
+            ),
+            '["CRS", "A\\\\t\\\\"B\\\\""]',
+        )
+
+    def test_dictionary_values(self):
+        field = bright_models.BrightMedia._meta.get_field("PropertyType")
+        self.assertIsInstance(field, DictionaryField)
+        with mock.patch.object(DictionaryField, "is_encoded", return_value=False):
+            self.assertEqual(
+                BrightMLSExportService._copy_value("Residential", field), "Residential"
+            )
+        with mock.patch.object(DictionaryField, "is_encoded", return_value=True):
+            with mock.patch.object(Dictionary, "encode", return_value=7) as encode:
+                self.assertEqual(
+                    BrightMLSExportService._copy_value("Residential", field), "7"
+                )
+        encode.assert_called_once_with("Residential", connection)
+
+
+class CopyPageTestCase(SimpleTestCase):
+    def setUp(self):
+        # statements are quoted by the real connection, nothing is run on it
+        patcher = mock.patch.object(export, "connection", mock.Mock(wraps=connection))
+        self.connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection.cursor = mock.MagicMock()
+        self.cursor = self.connection.cursor.return_value.__enter__.return_value
+        self.copied = []
+        self.cursor.copy_expert.side_effect = lambda sql, buffer: self.copied.append(
+            (sql, buffer.read())
+        )
+        patcher = mock.patch.object(export, "transaction")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_copy_buffer(self):
+        fields = get_fields(
+            bright_models.BrightMembers,
+            "MemberKey",
+            "MemberFullName",
+            "MemberPreviewYN",
+            "ModificationTimestamp",
+            "MemberDesignation",
+        )
+        columns = {
+            "MemberKey": [1, 2],
+            "MemberFullName": ["Jane\tDoe", None],
+            "MemberPreviewYN": [True, None],
+            "ModificationTimestamp": [
+                datetime(2024, 10, 1, 12, 30, tzinfo=timezone.utc),
+                None,
+            ],
+            "MemberDesignation": [["CRS"], []],
+        }
+        BrightMLSExportService()._copy_columns(
+            bright_models.BrightMembers, fields, columns
+        )
+        self.assertEqual(
+            self.copied,
+            [
+                (
+                    'COPY "brightmls_brightmembers" ("MemberKey", "MemberFullName", '
+                    '"MemberPreviewYN", "ModificationTimestamp", "MemberDesignation") '
+                    "FROM STDIN",
+                    '1\tJane\\tDoe\tt\t2024-10-01T12:30:00+00:00\t["CRS"]\n'
+                    "2\t\\N\t\\N\t\\N\t[]\n",
+                )
+            ],
+        )
+
+    def test_parts_copied_to_their_tables(self):
+        model_class = bright_models.BrightProperties
+        details = bright_models.BrightPropertiesDetails
+        fields = get_fields(model_class, "ListingKey", "City") + get_fields(
+            details, "ListingKey", "PublicRemarks"
+        )
+        columns = {
+            "ListingKey": [10],
+            "City": ["Baltimore"],
+            "PublicRemarks": ["Finished\nbasement"],
+        }
+        BrightMLSExportService()._copy_columns(model_class, fields, columns)
+        self.assertEqual(
+            self.copied,
+            [
+                (
+                    'COPY "brightmls_brightproperties" ("ListingKey", "City") FROM STDIN',
+                    "10\tBaltimore\n",
+                ),
+                (
+                    'COPY "brightmls_brightpropertiesdetails" ("ListingKey", '
+                    '"PublicRemarks") FROM STDIN',
+                    "10\tFinished\\nbasement\n",
+                ),
+            ],
+        )
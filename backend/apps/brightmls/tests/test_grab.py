@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import SimpleTestCase
+from odata.property import BooleanProperty, StringProperty
+from odata.service import ODataService
+from brightmls import models as bright_models
+from brightmls.services import grab_linear
+from brightmls.services.grab_linear import BrightMLSGrabService
+
+Service = ODataService(
+    "http://odata.example.com/", reflect_entities=False, quiet_progress=True
+)
+
+
+class Office(Service.Entity):
+    __odata_type__ = "Example.Office"
+    __odata_collection__ = "Office"
+
+    OfficeKey = StringProperty("OfficeKey", primary_key=True)
+    OfficeName = StringProperty("OfficeName")
+    IDXOfficeParticipationYN = BooleanProperty("IDXOfficeParticipationYN")
+    # not stored by BrightOffices
+    OfficeMotto = StringProperty("OfficeMotto")
+
+
+class SelectPropertiesTestCase(SimpleTestCase):
+    def setUp(self):
+        self.service = BrightMLSGrabService()
+
+    def get_names(self, model_class, entity_resource):
+        return [
+            prop.name
+            for prop in self.service._get_select_properties(
+                model_class, entity_resource
+            )
+        ]
+
+    def test_stored_properties_only(self):
+        self.assertEqual(
+            sorted(self.get_names(bright_models.BrightOffices, Office)),
+            ["IDXOfficeParticipationYN", "OfficeKey", "OfficeName"],
+        )
+
+    def test_all_properties_stored(self):
+        class Member(Service.Entity):
+            __odata_type__ = "Example.Member"
+            __odata_collection__ = "Member"
+
+            OfficeKey = StringProperty("OfficeKey", primary_key=True)
+            OfficeName = StringProperty("OfficeName")
+
+        self.assertEqual(self.get_names(bright_models.BrightOffices, Member), [])
+
+    def test_too_long(self):
+        self.service.max_select_length = 20
+        self.assertEqual(self.get_names(bright_models.BrightOffices, Office), [])
+
+    def test_odata_field_names_of_split_model(self):
+        names = bright_models.BrightProperties.get_odata_field_names()
+        self.assertIn("ListingKey", names)
+        self.assertIn("PublicRemarks", names)
+        self.assertEqual(len(names), len(set(names)))
+
+
+class RawRowTestCase(SimpleTestCase):
+    def test_from_dict_row(self):
+        office = bright_models.BrightOffices.from_python_odata(
+            {
+                "OfficeKey": "1",
+                "OfficeName": "Keller Williams",
+                "IDXOfficeParticipationYN": None,
+                "ModificationTimestamp": "2024-10-01T12:30:00Z",
+            }
+        )
+        self.assertEqual(office.OfficeName, "Keller Williams")
+        self.assertIsNone(office.IDXOfficeParticipationYN)
+        self.assertEqual(
+            office.ModificationTimestamp,
+            datetime(2024, 10, 1, 12, 30, tzinfo=timezone.utc),
+        )
+
+    def test_update_from_dict_row(self):
+        office = bright_models.BrightOffices(OfficeKey="1", OfficeName="Old")
+        office.update_from_odata({"OfficeKey": "2", "OfficeName": "New"})
+        self.assertEqual(office.OfficeKey, "1")
+        self.assertEqual(office.OfficeName, "New")
+
+
+class DeferredIndexesLoadTestCase(SimpleTestCase):
+    def setUp(self):
+        self.service = BrightMLSGrabService()
+        self.service.entity_name = "BrightOffices"
+        self.service.defer_indexes = True
+        self.indexes = mock.MagicMock(table="brightmls_brightoffices")
+        for name, value in (
+            ("get_client", mock.MagicMock()),
+            ("get_entity_resource", Office),
+        ):
+            patcher = mock.patch.object(self.service, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            grab_linear, "DeferredIndexes", return_value=self.indexes
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rebuilt_after_the_load(self):
+        with mock.patch.object(self.service, "_load"):
+            self.service.populate()
+        self.indexes.drop.assert_called_once()
+        self.indexes.rebuild.assert_called_once()
+
+    def test_rebuilt_when_the_load_fails(self):
+        error = ValueError("API error")
+        with mock.patch.object(self.service, "_load", side_effect=error):
+            with self.assertRaises(ValueError):
+                self.service.populate()
+        self.indexes.rebuild.assert_called_once()
+
+    def test_recovery_reported_when_the_rebuild_fails(self):
+        self.indexes.rebuild.side_effect = OperationalError("connection lost")
+        with mock.patch.object(self.service, "_load", side_effect=ValueError):
+            with mock.patch("builtins.print") as print_:
+                with self.assertRaises(ValueError):
+                    self.service.populate()
+        self.assertIn(
+            "python manage.py mls_indexes BrightOffices",
+            print_.call_args.args[0],
+        )
+
+    def test_not_rebuilt_when_interrupted(self):
+        with mock.patch.object(self.service, "_load", side_effect=KeyboardInterrupt):
+            with mock.patch("builtins.print") as print_:
+                with self.assertRaises(KeyboardInterrupt):
+                    self.service.populate()
+        self.indexes.rebuild.assert_not_called()
+        self.assertIn(
+            "python manage.py mls_indexes BrightOffices",
+            print_.call_args.args[0],
+        )
@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from brightmls import models as bright_models
+from brightmls.services import indexes
+from brightmls.services.indexes import DeferredIndexes, get_build_settings
+
+
+class BuildSettingsTestCase(SimpleTestCase):
+    @override_settings(
+        BRIGHT_MLS_INDEX_BUILD={"maintenance_work_mem": "2GB", "parallel_workers": 3}
+    )
+    def test_settings(self):
+        self.assertEqual(
+            get_build_settings(),
+            [
+                "SET maintenance_work_mem = '2GB'",
+                "SET max_parallel_maintenance_workers = 3",
+            ],
+        )
+
+
+@override_settings(
+    BRIGHT_MLS_INDEX_BUILD={"maintenance_work_mem": "1GB", "parallel_workers": 2}
+)
+class DeferredIndexesTestCase(SimpleTestCase):
+    def setUp(self):
+        self.indexes = DeferredIndexes(bright_models.History)
+        self.names = [index.name for index in bright_models.History._meta.indexes]
+        # statements are compiled by the real connection, nothing is run on it
+        patcher = mock.patch.object(indexes, "connection", mock.Mock(wraps=connection))
+        self.connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection.cursor = mock.MagicMock()
+        self.cursor = self.connection.cursor.return_value.__enter__.return_value
+        patcher = mock.patch.object(indexes, "run_statements")
+        self.run_statements = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def executed(self):
+        return [call.args[0] for call in self.cursor.execute.call_args_list]
+
+    def test_drop_existing_indexes(self):
+        existing = {self.names[0]: True, self.names[1]: True}
+        with mock.patch.object(self.indexes, "_existing", return_value=existing):
+            self.indexes.drop()
+        self.assertEqual(
+            self.executed(),
+            [f'DROP INDEX IF EXISTS "{name}"' for name in self.names[:2]],
+        )
+
+    def test_rebuild_missing_and_invalid_indexes(self):
+        existing = {name: True for name in self.names[2:]}
+        existing[self.names[1]] = False
+        with mock.patch.object(self.indexes, "_existing", return_value=existing):
+            self.indexes.rebuild()
+
+        (statements,) = self.run_statements.call_args.args
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(statements[0].startswith(f'CREATE INDEX "{self.names[0]}"'))
+        self.assertTrue(statements[1].startswith(f'CREATE INDEX "{self.names[1]}"'))
+        self.assertEqual(self.run_statements.call_args.kwargs["workers"], 4)
+        self.assertEqual(
+            self.executed(),
+            [
+                f'DROP INDEX IF EXISTS "{self.names[1]}"',
+                'ANALYZE "brightmls_history"',
+            ],
+        )
+
+    def test_concurrent_rebuild_one_at_a_time(self):
+        self.indexes.concurrently = True
+        with mock.patch.object(indexes, "is_partitioned", return_value=False):
+            with mock.patch.object(self.indexes, "_existing", return_value={}):
+                self.indexes.rebuild()
+        (statements,) = self.run_statements.call_args.args
+        self.assertTrue(statements[0].startswith("CREATE INDEX CONCURRENTLY"))
+        self.assertEqual(self.run_statements.call_args.kwargs["workers"], 1)
+
+    def test_concurrently_refused_on_partitioned_tables(self):
+        self.indexes.concurrently = True
+        with mock.patch.object(indexes, "is_partitioned", return_value=True):
+            with self.assertRaises(ValueError):
+                self.indexes.drop()
@@ -0,0 +1,43 @@
+import re
+
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from brightmls.models import COORDINATE_PATTERN, PRICE_PATTERN
+from brightmls.services.search import in_bounding_box
+
+
+class NumericPatternsTestCase(SimpleTestCase):
+    def test_prices(self):
+        for value in ["349900", "349900.00", "0", "-1.5"]:
+            self.assertRegex(value, PRICE_PATTERN)
+        for value in ["", "N/A", "349,900", "1e6", "1234567890123"]:
+            self.assertIsNone(re.match(PRICE_PATTERN, value), value)
+
+    def test_coordinates(self):
+        for value in ["38.9072", "-77.0369", "0"]:
+            self.assertRegex(value, COORDINATE_PATTERN)
+        for value in ["", "38.9072N", "1234.5"]:
+            self.assertIsNone(re.match(COORDINATE_PATTERN, value), value)
+
+    def test_generated_columns(self):
+        field = bright_models.BrightProperties._meta.get_field("ListPriceNumeric")
+        self.assertTrue(field.generated)
+        self.assertTrue(field.db_persist)
+
+
+class BoundingBoxTestCase(SimpleTestCase):
+    def test_query_uses_the_indexed_expression(self):
+        queryset = in_bounding_box(
+            bright_models.BrightProperties.objects.all(), -77.1, 38.85, -76.95, 38.95
+        )
+        sql = str(queryset.query)
+        self.assertIn(
+            'point("brightmls_brightproperties"."LongitudeNumeric", '
+            '"brightmls_brightproperties"."LatitudeNumeric") '
+            "<@ box(point(-77.1, 38.85), point(-76.95, 38.95))",
+            sql,
+        )
+        index_names = [
+            index.name for index in bright_models.BrightProperties._meta.indexes
+        ]
+        self.assertIn("brightproperties_location_gist", index_names)
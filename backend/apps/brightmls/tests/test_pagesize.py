@@ -0,0 +1,48 @@
+from django.test import SimpleTestCase
+from brightmls.services.pagesize import AdaptivePageSize
+
+
+class AdaptivePageSizeTestCase(SimpleTestCase):
+    def setUp(self):
+        self.controller = AdaptivePageSize(
+            initial=1000, min_page_size=100, max_page_size=2000
+        )
+
+    def test_climbs_while_throughput_improves(self):
+        self.controller.observe(1000, 1.0, 10**6)
+        self.assertEqual(self.controller.page_size, 1250)
+        self.controller.observe(1250, 1.0, 2 * 10**6)
+        self.assertEqual(self.controller.page_size, 1562)
+
+    def test_turns_around_on_throughput_drop(self):
+        self.controller.observe(1000, 1.0, 10**6)
+        self.controller.observe(1250, 1.0, 5 * 10**5)
+        self.assertEqual(self.controller.direction, -1)
+        self.assertLess(self.controller.current_step, AdaptivePageSize.step)
+        self.assertLess(self.controller.page_size, 1250)
+
+    def test_noise_keeps_direction(self):
+        self.controller.observe(1000, 1.0, 10**6)
+        self.controller.observe(1250, 1.0, 0.97 * 10**6)
+        self.assertEqual(self.controller.direction, 1)
+
+    def test_shrinks_on_limits(self):
+        self.controller.observe(1000, 61, 10**6)
+        self.assertEqual(self.controller.page_size, 500)
+        self.assertIsNone(self.controller.last_throughput)
+        self.controller.observe(500, 1.0, 65 * 10**6)
+        self.assertEqual(self.controller.page_size, 250)
+
+    def test_bounds(self):
+        controller = AdaptivePageSize(initial=5000, max_page_size=2000)
+        self.assertEqual(controller.page_size, 2000)
+        controller.observe(2000, 1.0, 10**6)
+        self.assertEqual(controller.page_size, 2000)
+        self.assertEqual(controller.direction, -1)
+
+    def test_batch_size_follows_row_size(self):
+        self.controller.observe(1000, 1.0, 10**6)
+        # 1000 bytes per row
+        self.assertEqual(self.controller.batch_size, 5000)
+        self.controller.observe(1000, 1.0, 10**8)
+        self.assertEqual(self.controller.batch_size, 100)
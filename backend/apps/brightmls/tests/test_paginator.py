@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.db import OperationalError
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from backend.core import admin as core_admin
+from backend.core.admin import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTestCase(SimpleTestCase):
+    def setUp(self):
+        self.connection = mock.MagicMock()
+        self.cursor = self.connection.cursor.return_value.__enter__.return_value
+        patcher = mock.patch.object(
+            EstimatedCountPaginator,
+            "connection",
+            new_callable=mock.PropertyMock,
+            return_value=self.connection,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(core_admin, "transaction")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def paginator(self, queryset):
+        return EstimatedCountPaginator(queryset, 100)
+
+    def test_unfiltered_list_uses_the_table_estimate(self):
+        queryset = bright_models.BrightProperties.objects.order_by("pk")
+        paginator = self.paginator(queryset)
+        with mock.patch.object(paginator, "_table_estimate", return_value=2_000_000):
+            with mock.patch.object(queryset, "count") as count:
+                self.assertEqual(paginator.count, 2_000_000)
+        count.assert_not_called()
+        self.assertEqual(paginator.num_pages, 20_000)
+
+    def test_small_or_never_analyzed_tables_are_counted(self):
+        queryset = bright_models.BrightOffices.objects.order_by("pk")
+        for estimate in (None, 500):
+            paginator = self.paginator(queryset)
+            with mock.patch.object(paginator, "_table_estimate", return_value=estimate):
+                with mock.patch.object(queryset, "count", return_value=512):
+                    self.assertEqual(paginator.count, 512)
+
+    def test_filtered_list_counted_under_a_timeout(self):
+        queryset = bright_models.BrightProperties.objects.filter(
+            City="Baltimore"
+        ).order_by("pk")
+        paginator = self.paginator(queryset)
+        with mock.patch.object(paginator, "_table_estimate") as table_estimate:
+            with mock.patch.object(queryset, "count", return_value=42):
+                self.assertEqual(paginator.count, 42)
+        table_estimate.assert_not_called()
+        self.cursor.execute.assert_called_once_with("SET LOCAL statement_timeout = 500")
+
+    def test_canceled_count_uses_the_plan_estimate(self):
+        queryset = bright_models.BrightProperties.objects.filter(
+            City="Baltimore"
+        ).order_by("pk")
+        paginator = self.paginator(queryset)
+        self.cursor.fetchone.return_value = ('[{"Plan": {"Plan Rows": 1234}}]',)
+        with mock.patch.object(queryset, "count", side_effect=OperationalError):
+            self.assertEqual(paginator.count, 1234)
+        sql = self.cursor.execute.call_args.args[0]
+        self.assertTrue(sql.startswith("EXPLAIN (FORMAT JSON) SELECT"))
+
+    def test_table_estimate(self):
+        paginator = self.paginator(
+            bright_models.BrightProperties.objects.order_by("pk")
+        )
+        self.cursor.fetchone.return_value = (1500.0, 700.0)
+        self.assertEqual(paginator._table_estimate(), 1500)
+        # a partition never analyzed
+        self.cursor.fetchone.return_value = (799.0, -1.0)
+        self.assertIsNone(paginator._table_estimate())
+        self.cursor.fetchone.return_value = (None, None)
+        self.assertIsNone(paginator._table_estimate())
+
+
+class EstimatedCountAdminTestCase(SimpleTestCase):
+    def test_view_only_admins(self):
+        model_admin = admin.site._registry[bright_models.BrightProperties]
+        self.assertIs(model_admin.paginator, EstimatedCountPaginator)
+        self.assertFalse(model_admin.show_full_result_count)
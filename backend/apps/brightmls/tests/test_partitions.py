@@ -0,0 +1,44 @@
+from datetime import date, datetime, timezone
+
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from brightmls.services.partitions import (
+    MonthlyPartitions,
+    add_months,
+    get_unique_fields,
+)
+
+
+class AddMonthsTestCase(SimpleTestCase):
+    def test_add_months(self):
+        self.assertEqual(add_months(date(2024, 11, 1), 1), date(2024, 12, 1))
+        self.assertEqual(add_months(date(2024, 12, 1), 1), date(2025, 1, 1))
+        self.assertEqual(add_months(date(2024, 1, 1), -1), date(2023, 12, 1))
+        self.assertEqual(add_months(date(2024, 3, 1), -26), date(2022, 1, 1))
+
+
+class MonthlyPartitionsTestCase(SimpleTestCase):
+    def test_partition_names(self):
+        partitions = MonthlyPartitions(bright_models.History)
+        self.assertEqual(
+            partitions.partition_name(date(2024, 3, 1)), "brightmls_history_p202403"
+        )
+        self.assertEqual(partitions.default_name, "brightmls_history_default")
+
+    def test_bounds_of_timestamp_keys(self):
+        partitions = MonthlyPartitions(bright_models.BrightMedia)
+        self.assertEqual(
+            partitions._bound(date(2024, 3, 1)),
+            datetime(2024, 3, 1, tzinfo=timezone.utc),
+        )
+
+    def test_bounds_of_date_keys(self):
+        partitions = MonthlyPartitions(bright_models.BrightOpenHouses)
+        self.assertEqual(partitions._bound(date(2024, 3, 1)), date(2024, 3, 1))
+
+    def test_model_without_partition_key(self):
+        with self.assertRaises(ValueError):
+            MonthlyPartitions(bright_models.BrightOffices)
+
+    def test_unique_fields_of_models_without_partition_key(self):
+        self.assertEqual(get_unique_fields(bright_models.BrightOffices), ["OfficeKey"])
@@ -0,0 +1,36 @@
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+from brightmls.models import IngestionTask
+from brightmls.services.queue import LeaseHeartbeat
+
+
+class LeaseHeartbeatTestCase(SimpleTestCase):
+    def get_heartbeat(self):
+        heartbeat = LeaseHeartbeat(IngestionTask(pk=1), "worker:1", lease_seconds=3)
+        heartbeat.interval = 0.01
+        return heartbeat
+
+    def test_interval_is_a_third_of_the_lease(self):
+        heartbeat = LeaseHeartbeat(IngestionTask(pk=1), "worker:1", lease_seconds=600)
+        self.assertEqual(heartbeat.interval, 200)
+
+    def test_renews_until_stopped(self):
+        heartbeat = self.get_heartbeat()
+        with mock.patch.object(LeaseHeartbeat, "renew", return_value=1) as renew:
+            heartbeat.start()
+            time.sleep(0.1)
+            heartbeat.stop()
+        self.assertFalse(heartbeat.is_alive())
+        self.assertFalse(heartbeat.lost)
+        self.assertGreater(renew.call_count, 1)
+
+    def test_stops_when_the_task_was_taken(self):
+        heartbeat = self.get_heartbeat()
+        with mock.patch.object(LeaseHeartbeat, "renew", return_value=0) as renew:
+            heartbeat.start()
+            heartbeat.join(1)
+        self.assertFalse(heartbeat.is_alive())
+        self.assertTrue(heartbeat.lost)
+        self.assertEqual(renew.call_count, 1)
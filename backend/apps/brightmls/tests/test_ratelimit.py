@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from brightmls.services import ratelimit
+from brightmls.services.base import BrightMLSBaseService
+from brightmls.services.ratelimit import TokenBucket
+
+
+class TokenBucketTestCase(SimpleTestCase):
+    def setUp(self):
+        self.bucket = TokenBucket(rate=10, burst=20)
+        patcher = mock.patch.object(ratelimit.time, "sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_token_available(self):
+        with mock.patch.object(self.bucket, "_take_token", return_value=5.0):
+            self.assertEqual(self.bucket.acquire(), 0.0)
+        self.sleep.assert_not_called()
+        self.assertEqual(
+            self.bucket.metrics(), {"granted": 1, "waits": 0, "wait_seconds": 0.0}
+        )
+
+    def test_reservation_waits(self):
+        with mock.patch.object(self.bucket, "_take_token", return_value=-5.0):
+            self.assertEqual(self.bucket.acquire(), 0.5)
+        self.sleep.assert_called_once_with(0.5)
+        self.assertEqual(
+            self.bucket.metrics(), {"granted": 1, "waits": 1, "wait_seconds": 0.5}
+        )
+
+    def test_single_upsert(self):
+        with mock.patch.object(ratelimit, "connection") as connection:
+            connection.ops.quote_name.side_effect = lambda name: f'"{name}"'
+            cursor = connection.cursor
+            cursor.return_value.__enter__.return_value.fetchone.return_value = (19.0,)
+            self.assertEqual(self.bucket._take_token(), 19.0)
+        execute = cursor.return_value.__enter__.return_value.execute
+        execute.assert_called_once()
+        sql, params = execute.call_args.args
+        self.assertIn("ON CONFLICT (name) DO UPDATE", sql)
+        self.assertIn("RETURNING tokens", sql)
+        self.assertEqual(params, {"name": "brightmls", "rate": 10.0, "burst": 20.0})
+
+
+class RateLimiterSettingTestCase(SimpleTestCase):
+    @override_settings(BRIGHT_MLS_RATE_LIMIT={"rate": 5, "burst": 10})
+    def test_enabled(self):
+        bucket = BrightMLSBaseService().get_rate_limiter()
+        self.assertIsInstance(bucket, TokenBucket)
+        self.assertEqual((bucket.rate, bucket.burst), (5.0, 10.0))
+
+    @override_settings(BRIGHT_MLS_RATE_LIMIT={"rate": 0, "burst": 10})
+    def test_disabled(self):
+        self.assertIsNone(BrightMLSBaseService().get_rate_limiter())
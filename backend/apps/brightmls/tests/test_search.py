@@ -0,0 +1,124 @@
+from django.contrib import admin
+from django.db import connection
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from brightmls.services.search import (
+    search_documents,
+    search_properties,
+    search_similar,
+)
+from backend.core.admin import FullTextSearchAdminMixin
+
+
+def get_sql(queryset):
+    return queryset.query.sql_with_params()
+
+
+class SearchDocumentTestCase(SimpleTestCase):
+    def test_generated_weighted_vector(self):
+        field = bright_models.BrightPropertiesDetails._meta.get_field("SearchDocument")
+        self.assertTrue(field.db_persist)
+        sql, params = field.generated_sql(connection)
+        self.assertEqual(
+            sql,
+            '(setweight(to_tsvector(%s::regconfig, COALESCE("PublicRemarks", %s)), %s)'
+            ' || setweight(to_tsvector(%s::regconfig, COALESCE("SyndicationRemarks", %s)), %s))',
+        )
+        self.assertEqual(params, ["english", "", "A", "english", "", "B"])
+
+    def test_search_documents(self):
+        sql, params = get_sql(
+            search_documents(
+                bright_models.BrightPropertiesDetails.objects.all(), "pool -auction"
+            )
+        )
+        self.assertIn('"SearchDocument" @@ (websearch_to_tsquery', sql)
+        self.assertNotIn("ts_rank", sql)
+        self.assertIn("pool -auction", params)
+
+    def test_search_documents_ranked(self):
+        sql, _ = get_sql(
+            search_documents(
+                bright_models.BrightPropertiesDetails.objects.only("ListingKey"),
+                "pool",
+                rank=True,
+            )
+        )
+        self.assertIn(
+            'ts_rank("brightmls_brightpropertiesdetails"."SearchDocument"', sql
+        )
+        self.assertTrue(sql.endswith("ORDER BY 2 DESC"))
+
+
+class SearchTestCase(SimpleTestCase):
+    def test_search_properties_unions_keys_of_both_documents(self):
+        sql, params = get_sql(search_properties("finished basement"))
+        self.assertEqual(sql.count("websearch_to_tsquery"), 2)
+        self.assertIn("UNION", sql)
+        self.assertNotIn("%>", sql)
+        self.assertEqual(params.count("finished basement"), 2)
+
+    def test_search_properties_similar(self):
+        sql, params = get_sql(search_properties("main stret", similar=True))
+        self.assertEqual(sql.count("UNION"), 2)
+        for field_name in [
+            "FullStreetAddress",
+            "City",
+            "PostalCode",
+            "SubdivisionName",
+        ]:
+            self.assertIn(f'U0."{field_name}" %%> %s', sql)
+
+    def test_search_similar(self):
+        sql, params = get_sql(
+            search_similar(
+                bright_models.BrightMembers.objects.all(),
+                ["MemberFullName", "MemberEmail"],
+                "jon smit",
+            )
+        )
+        self.assertIn(" OR ", sql)
+        self.assertEqual(params, ("jon smit", "jon smit"))
+
+
+class OfficesAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
+    search_fields = ["OfficeName"]
+
+
+class FullTextSearchAdminMixinTestCase(SimpleTestCase):
+    def test_number_is_looked_up_as_pk(self):
+        model_admin = admin.site._registry[bright_models.BrightProperties]
+        queryset, may_have_duplicates = model_admin.get_search_results(
+            None, bright_models.BrightProperties.objects.all(), " 12345 "
+        )
+        self.assertFalse(may_have_duplicates)
+        sql, params = get_sql(queryset)
+        self.assertNotIn("websearch_to_tsquery", sql)
+        self.assertEqual(params, (12345,))
+
+    def test_keywords_use_full_text_search(self):
+        model_admin = admin.site._registry[bright_models.BrightProperties]
+        queryset, _ = model_admin.get_search_results(
+            None, bright_models.BrightProperties.objects.all(), "main st"
+        )
+        sql, params = get_sql(queryset)
+        self.assertIn("websearch_to_tsquery", sql)
+        self.assertIn('U0."City" %%> %s', sql)
+
+    def test_empty_term(self):
+        model_admin = admin.site._registry[bright_models.BrightProperties]
+        queryset = bright_models.BrightProperties.objects.all()
+        results, may_have_duplicates = model_admin.get_search_results(
+            None, queryset, "  "
+        )
+        self.assertIs(results, queryset)
+        self.assertFalse(may_have_duplicates)
+
+    def test_falls_back_to_search_fields(self):
+        model_admin = OfficesAdmin(bright_models.BrightOffices, admin.site)
+        queryset, _ = model_admin.get_search_results(
+            None, bright_models.BrightOffices.objects.all(), "keller"
+        )
+        sql, params = get_sql(queryset)
+        self.assertIn('UPPER("brightmls_brightoffices"."OfficeName"::text) LIKE', sql)
+        self.assertEqual(params, ("%keller%",))
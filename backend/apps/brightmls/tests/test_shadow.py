@@ -0,0 +1,137 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import SimpleTestCase
+from brightmls import models as bright_models
+from brightmls.services import shadow
+from brightmls.services.shadow import ShadowTable
+
+
+class ShadowTableTestCase(SimpleTestCase):
+    def test_single_table(self):
+        shadow = ShadowTable(bright_models.BrightOffices)
+        self.assertEqual(shadow.model._meta.db_table, "brightmls_brightoffices__shadow")
+        self.assertEqual(
+            [shadow_table for _, _, shadow_table in shadow.tables],
+            ["brightmls_brightoffices__shadow"],
+        )
+
+    def test_split_model_writes_every_part_to_its_shadow_table(self):
+        shadow = ShadowTable(bright_models.BrightProperties)
+        self.assertEqual(
+            [part._meta.db_table for part in shadow.model.get_part_models()],
+            [
+                "brightmls_brightproperties__shadow",
+                "brightmls_brightpropertiesdetails__shadow",
+            ],
+        )
+        self.assertEqual(
+            shadow.model.get_odata_field_names(),
+            bright_models.BrightProperties.get_odata_field_names(),
+        )
+
+    def test_shadow_models_do_not_replace_the_real_models(self):
+        ShadowTable(bright_models.BrightProperties)
+        self.assertEqual(
+            [
+                part._meta.db_table
+                for part in bright_models.BrightProperties.get_part_models()
+            ],
+            ["brightmls_brightproperties", "brightmls_brightpropertiesdetails"],
+        )
+
+
+class ShadowIndexesTestCase(SimpleTestCase):
+    def setUp(self):
+        self.shadow = ShadowTable(bright_models.BrightOffices)
+        patcher = mock.patch.object(shadow, "connection")
+        self.connection = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection.ops.quote_name.side_effect = lambda name: f'"{name}"'
+        self.cursor = self.connection.cursor.return_value.__enter__.return_value
+
+    def test_index_names(self):
+        self.assertEqual(self.shadow._shadow_index_name("idx"), "idx__shadow")
+        name = self.shadow._shadow_index_name("i" * 63)
+        self.assertEqual(len(name), 63)
+        self.assertTrue(name.endswith("__shadow"))
+
+    @mock.patch.object(shadow, "get_build_settings", return_value=[])
+    @mock.patch.object(shadow, "run_statements")
+    def test_live_indexes_rebuilt_on_the_shadow_table(self, run_statements, _):
+        live_indexes = [
+            (
+                "brightoffices_pkey",
+                'CREATE UNIQUE INDEX brightoffices_pkey ON public."brightmls_brightoffices"'
+                ' USING btree ("OfficeKey")',
+                "p",
+            ),
+            (
+                "office_name_idx",
+                'CREATE INDEX office_name_idx ON ONLY public."brightmls_brightoffices"'
+                ' USING btree ("OfficeName")',
+                None,
+            ),
+        ]
+        with mock.patch.object(self.shadow, "_live_indexes", return_value=live_indexes):
+            self.shadow.build_indexes()
+
+        self.assertEqual(
+            run_statements.call_args.args[0],
+            [
+                'CREATE UNIQUE INDEX "brightoffices_pkey__shadow" ON '
+                '"brightmls_brightoffices__shadow" USING btree ("OfficeKey")',
+                'CREATE INDEX "office_name_idx__shadow" ON '
+                '"brightmls_brightoffices__shadow" USING btree ("OfficeName")',
+            ],
+        )
+        executed = [call.args[0] for call in self.cursor.execute.call_args_list]
+        self.assertIn(
+            'ALTER TABLE "brightmls_brightoffices__shadow" SET LOGGED', executed
+        )
+        self.assertIn(
+            'ALTER TABLE "brightmls_brightoffices__shadow" ADD CONSTRAINT '
+            '"brightoffices_pkey__shadow" PRIMARY KEY USING INDEX '
+            '"brightoffices_pkey__shadow"',
+            executed,
+        )
+        self.assertEqual(executed[-1], 'ANALYZE "brightmls_brightoffices__shadow"')
+
+
+class ShadowSwapTestCase(SimpleTestCase):
+    def setUp(self):
+        self.shadow = ShadowTable(bright_models.BrightOffices)
+        patcher = mock.patch.object(shadow.time, "sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def lock_timeout(self):
+        error = OperationalError("canceling statement due to lock timeout")
+        error.__cause__ = Exception()
+        error.__cause__.pgcode = "55P03"
+        return error
+
+    def test_retried_while_readers_hold_the_table(self):
+        with mock.patch.object(
+            self.shadow, "_swap", side_effect=[self.lock_timeout(), None]
+        ) as swap:
+            self.shadow.swap()
+        self.assertEqual(swap.call_count, 2)
+
+    def test_other_errors_raised(self):
+        with mock.patch.object(
+            self.shadow, "_swap", side_effect=OperationalError("gone")
+        ) as swap:
+            with self.assertRaises(OperationalError):
+                self.shadow.swap()
+        self.assertEqual(swap.call_count, 1)
+
+    def test_gives_up(self):
+        self.shadow.swap_attempts = 2
+        with mock.patch.object(
+            self.shadow,
+            "_swap",
+            side_effect=[self.lock_timeout(), self.lock_timeout()],
+        ):
+            with self.assertRaisesMessage(OperationalError, "Cannot lock"):
+                self.shadow.swap()
@@ -238,18 +238,27 @@ class ActionBase(object):
             errmsg = errmsg.format(received_keys, expected_keys)
             raise TypeError(errmsg)
 
+    def _callable_url(self, url):
+        if not url.endswith("/"):
+            url += "/"
+        return url + self.name
+
     def _callable(self, connection, url, query, **kwargs):
         self._check_call_arguments(kwargs)
 
-        if not url.endswith("/"):
-            url += "/"
-        url += self.name
+        url = self._callable_url(url)
 
         query_options = None
         if query:
             query_options = query._get_options()
 
         response_data = self._execute_http(connection, url, query_options, kwargs)
+        return self._read_response_data(response_data)
+
+    def _read_response_data(self, response_data):
+        """
+        Convert the response of a call to the declared return type
+        """
         response_data = (response_data or {}).get("value")
 
         simple_types_values = self.__odata_service__.metadata.property_types.values()
@@ -287,6 +296,12 @@ class ActionBase(object):
     def _execute_http(self, connection, url, query_options, kwargs):
         raise NotImplementedError()
 
+    def _http_request(self, url, kwargs):
+        """
+        :return: HTTP method, url and body of the call
+        """
+        raise NotImplementedError()
+
 
 class Action(ActionBase):
     """
@@ -328,14 +343,18 @@ class Action(ActionBase):
     name = "ODataSchema.Action"
 
     def _execute_http(self, connection, url, query_options, kwargs):
-        # Execute http POST, encoding kwargs to json body
+        _, url, data = self._http_request(url, kwargs)
+        return connection.execute_post(url, data, params=query_options)
+
+    def _http_request(self, url, kwargs):
+        # http POST, encoding kwargs to json body
         data = OrderedDict()
         for key, value in kwargs.items():
             prop_type = self.parameters.get(key)
             escaped_value = prop_type("temp").serialize(value)
             data[key] = escaped_value
 
-        return connection.execute_post(url, data, params=query_options)
+        return "POST", url, data
 
 
 class Function(ActionBase):
@@ -378,7 +397,11 @@ class Function(ActionBase):
     name = "ODataSchema.Function"
 
     def _execute_http(self, connection, url, query_options, kwargs):
-        # Execute http GET, passing kwargs as parameters in url
+        _, url, _ = self._http_request(url, kwargs)
+        return connection.execute_get(url, params=query_options)
+
+    def _http_request(self, url, kwargs):
+        # http GET, passing kwargs as parameters in url
         kwargs_escaped = []
         for key, value in kwargs.items():
             prop_type = self.parameters.get(key)
@@ -390,4 +413,4 @@ class Function(ActionBase):
         params = ",".join(params)
         url += "({0})".format(params)
 
-        return connection.execute_get(url, params=query_options)
+        return "GET", url, None
@@ -0,0 +1,548 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch requests
+==============
+
+Queries, writes and action calls can be queued and sent to the service in a
+single ``$batch`` request. Every queued operation returns a future, which is
+resolved when the batch is sent at the end of the ``with`` block:
+
+.. code-block:: python
+
+    >>> with Service.batch() as batch:
+    ...     orders = batch.query(Service.query(Order).filter(Order.Name == 'Foo'))
+    ...     shipper = batch.get(Shipper.__odata_url__() + '(3)')
+    ...     batch.save(new_order)
+    ...     batch.delete(old_order)
+    ...     total = batch.call(Service.functions['GetTotal'], Date=today)
+    >>> orders.result()
+    [<Entity(Order(1))>, <Entity(Order(2))>]
+    >>> new_order.Id  # saved entities are updated like with Service.save()
+    1234
+
+The JSON batch format (OData 4.01) is used by default. Use
+``format="multipart"`` for OData 4.0 services. With ``atomic=True`` all
+writes are sent in one change set (atomicity group), so they either all
+succeed or all fail.
+
+A failed operation does not raise when the batch is sent, its future holds
+the :py:class:`~odata.exceptions.ODataError` instead. A failure of a whole
+``$batch`` request raises, and fails the futures of all operations not sent.
+"""
+
+import email.parser
+import email.policy
+import json
+import uuid
+from concurrent.futures import Future
+from urllib.parse import urlencode, quote, urljoin
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from odata.action import ActionCallable
+from odata.exceptions import ODataError
+
+
+class BatchFuture(Future):
+    """
+    Result of one batched operation. Available after the batch is sent
+    """
+
+    def result(self, timeout=None):
+        if not self.done():
+            raise ODataError("Batch has not been sent yet")
+        return super().result(timeout)
+
+    def exception(self, timeout=None):
+        if not self.done():
+            raise ODataError("Batch has not been sent yet")
+        return super().exception(timeout)
+
+
+class BatchOperation(object):
+    """
+    One request of a batch. ``handler`` converts the demultiplexed response
+    to the result of the future
+
+    :param method: HTTP method
+    :param url: Absolute url of the request
+    :param params: Query parameters
+    :param body: JSON body
+    :param handler: Callable receiving the Response object of this request
+    :param write: Request modifies data, goes to the change set in atomic batches
+    :param depends_on: Operation which has to be executed first
+    """
+
+    def __init__(
+        self,
+        method,
+        url,
+        params=None,
+        body=None,
+        handler=None,
+        write=False,
+        depends_on=None,
+    ):
+        self.method = method
+        self.url = url
+        self.params = params
+        self.body = body
+        self.handler = handler
+        self.write = write
+        self.depends_on = depends_on
+        self.content_id = None
+        self.future = BatchFuture()
+
+    def __repr__(self):
+        return "<BatchOperation {0} {1}>".format(self.method, self.url)
+
+    @property
+    def full_url(self):
+        if self.params:
+            return "{0}?{1}".format(self.url, urlencode(self.params, quote_via=quote))
+        return self.url
+
+
+class Batch(object):
+    """
+    Collects operations and sends them in ``$batch`` requests. Should not be
+    instantiated directly, use :py:func:`~odata.context.Context.batch`
+
+    :param context: Context whose connection sends the batch
+    :param url: ``$batch`` endpoint. Resolved from the first queued entity if None
+    :param format: ``json`` or ``multipart``
+    :param atomic: Send all writes in one change set
+    :param max_size: Maximum number of operations in one ``$batch`` request, ignored when atomic
+    """
+
+    formats = ("json", "multipart")
+    changeset_id = "changeset"
+
+    def __init__(self, context, url=None, format="json", atomic=False, max_size=None):
+        if format not in self.formats:
+            raise ODataError("Unknown batch format: {0}".format(format))
+
+        self.context = context
+        self.connection = context.connection
+        self.url = url
+        self.format = format
+        self.atomic = atomic
+        self.max_size = max_size
+        self.operations = []
+        self.sent = False
+
+    def __repr__(self):
+        return "<Batch of {0} operations to {1}>".format(
+            len(self.operations), self.url
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+        else:
+            for operation in self.operations:
+                operation.future.cancel()
+
+    # Queueing #################################################################
+
+    def _queue(self, operation, service=None):
+        if self.sent:
+            raise ODataError("Batch was already sent")
+        if self.url is None and service is not None:
+            self.url = urljoin(service.url, "$batch")
+
+        self.operations.append(operation)
+        operation.content_id = str(len(self.operations))
+        return operation.future
+
+    def get(self, url, params=None, allow_plain_response=False) -> BatchFuture:
+        """
+        Queue a GET request
+
+        :param url: Absolute url
+        :param params: Query parameters
+        :return: Future of the raw response data
+        """
+
+        def handler(response):
+            return self.connection._read_get_response(response, allow_plain_response)
+
+        return self._queue(BatchOperation("GET", url, params=params, handler=handler))
+
+    def query(self, query) -> BatchFuture:
+        """
+        Queue a query. Next pages, if there are any, are loaded after the
+        batch is sent
+
+        :param query: Query instance
+        :return: Future of the list of Entity instances
+        """
+        options = query._get_options()
+
+        def handler(response):
+            data = self.connection._read_get_response(response)
+            return list(query._iter_data(data, options))
+
+        operation = BatchOperation(
+            "GET", query._get_url(), params=options, handler=handler
+        )
+        return self._queue(operation, query.entity.__odata_service__)
+
+    def save(self, entity, force_refresh=True) -> BatchFuture:
+        """
+        Queue a POST or PATCH of the entity, see :py:func:`~odata.context.Context.save`
+
+        :param entity: Model instance to insert or update
+        :param force_refresh: Read full entity data again in the same batch after PATCH
+        :return: Future of the entity, which is updated when the batch is sent
+        """
+        context = self.context
+        service = entity.__odata_service__
+
+        if not context.is_entity_saved(entity):
+            url, insert_data = context._prepare_insert(entity)
+
+            def handler(response):
+                saved_data = self.connection._read_write_response(response)
+                context._apply_insert(entity, saved_data)
+                return entity
+
+            operation = BatchOperation(
+                "POST", url, body=insert_data, handler=handler, write=True
+            )
+            return self._queue(operation, service)
+
+        url, patch_data = context._prepare_update(entity)
+        if patch_data is None:
+            future = BatchFuture()
+            future.set_result(entity)
+            return future
+
+        def patch_handler(response):
+            saved_data = self.connection._read_write_response(response)
+            entity.__odata__.reset()
+            if saved_data is not None:
+                entity.__odata__.update(saved_data)
+            return entity
+
+        patch = BatchOperation(
+            "PATCH", url, body=patch_data, handler=patch_handler, write=True
+        )
+        future = self._queue(patch, service)
+        if not force_refresh:
+            return future
+
+        def refresh_handler(response):
+            # the refresh is only meaningful if the PATCH succeeded
+            patch.future.result()
+            saved_data = self.connection._read_get_response(response)
+            if saved_data is not None:
+                entity.__odata__.update(saved_data)
+            return entity
+
+        refresh = BatchOperation("GET", url, handler=refresh_handler, depends_on=patch)
+        return self._queue(refresh, service)
+
+    def delete(self, entity) -> BatchFuture:
+        """
+        Queue a DELETE of the entity
+
+        :param entity: Model instance to delete
+        :return: Future of None
+        """
+
+        def handler(response):
+            self.connection._handle_odata_error(response)
+            self.context._apply_delete(entity)
+
+        operation = BatchOperation(
+            "DELETE", entity.__odata__.instance_url, handler=handler, write=True
+        )
+        return self._queue(operation, entity.__odata_service__)
+
+    def call(self, action_or_function, **parameters) -> BatchFuture:
+        """
+        Queue a call of an Action or Function
+
+        :param action_or_function: Action/Function instance, unbound or from an Entity
+        :param parameters: Keyword parameters to pass to Action/Function
+        :return: Future of the return value
+        """
+        if isinstance(action_or_function, ActionCallable):
+            if action_or_function.errmsg is not None:
+                raise AttributeError(action_or_function.errmsg)
+            callable_ = action_or_function.actionbase_instance
+            url = action_or_function.url
+            query = action_or_function.query
+        else:
+            callable_ = action_or_function
+            url = callable_.__odata_service__.url
+            query = None
+
+        callable_._check_call_arguments(parameters)
+        method, url, body = callable_._http_request(
+            callable_._callable_url(url), parameters
+        )
+        params = query._get_options() if query else None
+
+        def handler(response):
+            if method == "GET":
+                data = self.connection._read_get_response(response)
+            else:
+                data = self.connection._read_write_response(response)
+            return callable_._read_response_data(data)
+
+        operation = BatchOperation(
+            method,
+            url,
+            params=params,
+            body=body,
+            handler=handler,
+            write=method != "GET",
+        )
+        return self._queue(operation, callable_.__odata_service__)
+
+    # Sending ##################################################################
+
+    def execute(self):
+        """
+        Send all queued operations and resolve their futures. Called
+        automatically at the end of the ``with`` block
+        """
+        if self.sent:
+            raise ODataError("Batch was already sent")
+        self.sent = True
+
+        if not self.operations:
+            return
+        if self.url is None:
+            raise ODataError("Cannot resolve the $batch url, pass it to batch()")
+
+        chunks = self._chunks()
+        for position, chunk in enumerate(chunks):
+            try:
+                responses = self._send(chunk)
+            except ODataError as e:
+                # operations of the following chunks are not sent either
+                for failed_chunk in chunks[position:]:
+                    for operation in failed_chunk:
+                        operation.future.set_exception(e)
+                raise
+
+            for operation, response in zip(chunk, responses):
+                if response is None:
+                    msg = "No response for batched request: {0}".format(operation)
+                    operation.future.set_exception(ODataError(msg))
+                    continue
+                try:
+                    operation.future.set_result(operation.handler(response))
+                except ODataError as e:
+                    operation.future.set_exception(e)
+
+    def _chunks(self):
+        if self.atomic or not self.max_size:
+            return [self.operations]
+        return [
+            self.operations[i : i + self.max_size]
+            for i in range(0, len(self.operations), self.max_size)
+        ]
+
+    def _send(self, operations) -> list:
+        if self.format == "json":
+            return self._send_json(operations)
+        return self._send_multipart(operations)
+
+    def _relative_url(self, operation):
+        # sub-request urls are relative to the service root
+        url = operation.full_url
+        root = self.url.rsplit("$batch", 1)[0]
+        if url.startswith(root):
+            return url[len(root) :]
+        return url
+
+    def _make_response(self, operation, status, reason, headers, content):
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers or {})
+        response.url = operation.full_url
+        response.encoding = "utf-8"
+        response._content = content
+        return response
+
+    # JSON format ##############################################################
+
+    def _send_json(self, operations) -> list:
+        batch_requests = []
+        for operation in operations:
+            item = {
+                "id": operation.content_id,
+                "method": operation.method,
+                "url": self._relative_url(operation),
+                "headers": {"accept": "application/json"},
+            }
+            if operation.body is not None:
+                item["headers"]["content-type"] = "application/json"
+                item["body"] = operation.body
+            if self.atomic and operation.write:
+                item["atomicityGroup"] = self.changeset_id
+            if operation.depends_on is not None:
+                depends_on = operation.depends_on
+                if self.atomic and depends_on.write:
+                    item["dependsOn"] = [self.changeset_id]
+                else:
+                    item["dependsOn"] = [depends_on.content_id]
+            batch_requests.append(item)
+
+        response = self.connection.execute_batch(
+            self.url, json.dumps({"requests": batch_requests}), "application/json"
+        )
+        data = response.json() or {}
+        by_id = {item.get("id"): item for item in data.get("responses", [])}
+
+        responses = []
+        for operation in operations:
+            item = by_id.get(operation.content_id)
+            if item is None:
+                responses.append(None)
+                continue
+
+            headers = CaseInsensitiveDict(item.get("headers") or {})
+            body = item.get("body")
+            if body is None:
+                content = b""
+            elif isinstance(body, str):
+                headers.setdefault("content-type", "text/plain")
+                content = body.encode("utf-8")
+            else:
+                headers.setdefault("content-type", "application/json")
+                content = json.dumps(body).encode("utf-8")
+            responses.append(
+                self._make_response(
+                    operation, int(item.get("status", 0)), None, headers, content
+                )
+            )
+        return responses
+
+    # Multipart format #########################################################
+
+    def _multipart_groups(self, operations) -> list:
+        """
+        Group operations into top level parts. Reads are sent alone, writes
+        are wrapped in change sets, one for all writes if the batch is atomic
+        """
+        groups = []
+        changeset = None
+        for operation in operations:
+            if not operation.write:
+                groups.append([operation])
+            elif self.atomic:
+                if changeset is None:
+                    changeset = []
+                    groups.append(changeset)
+                changeset.append(operation)
+            else:
+                groups.append([operation])
+        return groups
+
+    def _http_part(self, operation):
+        lines = [
+            "Content-Type: application/http",
+            "Content-Transfer-Encoding: binary",
+            "Content-ID: {0}".format(operation.content_id),
+            "",
+            "{0} {1} HTTP/1.1".format(operation.method, self._relative_url(operation)),
+            "Accept: application/json",
+        ]
+        if operation.body is not None:
+            lines += ["Content-Type: application/json", "", json.dumps(operation.body)]
+        else:
+            lines += ["", ""]
+        return "\r\n".join(lines)
+
+    def _send_multipart(self, operations) -> list:
+        boundary = "batch_{0}".format(uuid.uuid4())
+        groups = self._multipart_groups(operations)
+
+        body = []
+        for group in groups:
+            body.append("--{0}\r\n".format(boundary))
+            if group[0].write:
+                changeset = "changeset_{0}".format(uuid.uuid4())
+                body.append(
+                    "Content-Type: multipart/mixed; boundary={0}\r\n\r\n".format(
+                        changeset
+                    )
+                )
+                for operation in group:
+                    body.append("--{0}\r\n".format(changeset))
+                    body.append(self._http_part(operation) + "\r\n")
+                body.append("--{0}--\r\n".format(changeset))
+            else:
+                body.append(self._http_part(group[0]) + "\r\n")
+        body.append("--{0}--\r\n".format(boundary))
+
+        response = self.connection.execute_batch(
+            self.url,
+            "".join(body).encode("utf-8"),
+            "multipart/mixed; boundary={0}".format(boundary),
+        )
+
+        content_type = response.headers.get("content-type", "")
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n"
+            + response.content
+        )
+        parts = message.get_payload() if message.is_multipart() else []
+
+        # groups are not in queue order when an atomic change set gathers writes
+        # queued around reads, responses are put back at their operation's position
+        positions = {id(operation): i for i, operation in enumerate(operations)}
+        responses = [None] * len(operations)
+        for group, part in zip(groups, parts):
+            if part.is_multipart():
+                sub_parts = part.get_payload()
+            else:
+                # a failed change set is answered with a single response
+                sub_parts = [part] * len(group)
+
+            by_id = {}
+            for sub_part in sub_parts:
+                if sub_part["Content-ID"]:
+                    by_id[sub_part["Content-ID"].strip()] = sub_part
+
+            for position, operation in enumerate(group):
+                sub_part = by_id.get(operation.content_id)
+                if sub_part is None and position < len(sub_parts):
+                    sub_part = sub_parts[position]
+                if sub_part is None:
+                    continue
+                responses[positions[id(operation)]] = self._parse_http_response(
+                    operation, sub_part.get_payload(decode=True)
+                )
+        return responses
+
+    def _parse_http_response(self, operation, raw):
+        head, separator, content = raw.partition(b"\r\n\r\n")
+        if not separator:
+            head, _, content = raw.partition(b"\n\n")
+
+        lines = head.decode("utf-8").splitlines()
+        status_line = (lines[0].split(" ", 2) + [""] * 3)[:3]
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip()] = value.strip()
+
+        return self._make_response(
+            operation,
+            int(status_line[1]),
+            status_line[2],
+            headers,
+            content.rstrip(b"\r\n"),
+        )
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""
+Response cache
+==============
+
+GET responses of slowly changing EntitySets can be stored on disk and reused
+by later runs. Every EntitySet gets its own time to live, EntitySets without
+one are not cached:
+
+.. code-block:: python
+
+    >>> from odata.cache import ResponseCache
+    >>> cache = ResponseCache("/var/cache/odata", ttls={"Lookup": 86400})
+    >>> Service = ODataService(url, response_cache=cache)
+
+Fresh entries are returned without any network access. Expired entries are
+revalidated with ``If-None-Match`` / ``If-Modified-Since`` when the service
+sent an ``ETag`` or ``Last-Modified`` header, a ``304 Not Modified`` answer
+renews the entry without downloading the body again.
+
+Entries are keyed by url and query parameters and written atomically, so one
+cache directory can be shared by threads and processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from urllib.parse import urlencode, urlparse, quote
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CacheEntry(object):
+    """
+    One stored response
+
+    :param url: Requested url
+    :param params: Query parameters
+    :param stored_at: Timestamp of the last download or revalidation
+    :param headers: Response headers needed to rebuild the response and to revalidate it
+    :param content: Response body
+    """
+
+    kept_headers = ("content-type", "etag", "last-modified")
+
+    def __init__(self, url, params, stored_at, headers, content):
+        self.url = url
+        self.params = params
+        self.stored_at = stored_at
+        self.headers = headers
+        self.content = content
+
+    def __repr__(self):
+        return "<CacheEntry for {0}>".format(self.url)
+
+    @classmethod
+    def from_response(cls, url, params, response):
+        headers = {
+            name: response.headers[name]
+            for name in cls.kept_headers
+            if name in response.headers
+        }
+        return cls(url, params, time.time(), headers, response.text)
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def conditional_headers(self) -> dict:
+        """
+        :return: Headers to revalidate this entry, empty if the service did not send validators
+        """
+        headers = {}
+        if "etag" in self.headers:
+            headers["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def to_response(self):
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = self.url
+        response.encoding = "utf-8"
+        response._content = self.content.encode("utf-8")
+        return response
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "params": self.params,
+            "stored_at": self.stored_at,
+            "headers": self.headers,
+            "content": self.content,
+        }
+
+
+class ResponseCache(object):
+    """
+    On-disk cache of GET responses, see :py:mod:`odata.cache`
+
+    :param directory: Directory for the cache files, created if missing
+    :param ttls: Time to live in seconds by EntitySet name
+    :param default_ttl: Time to live of EntitySets missing from ttls, None to not cache them
+    """
+
+    log = logging.getLogger("odata.cache")
+
+    def __init__(self, directory, ttls: dict = None, default_ttl=None):
+        self.directory = str(directory)
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return "<ResponseCache at {0}>".format(self.directory)
+
+    def ttl_for(self, url):
+        """
+        Find the time to live of the EntitySet requested by url. The last path
+        segment naming a known EntitySet wins, so ``Property(1)/Rooms`` uses
+        the ttl of ``Rooms``
+
+        :return: Seconds, or None if responses of this url are not cached
+        """
+        for segment in reversed(urlparse(url).path.split("/")):
+            name = segment.split("(")[0]
+            if name in self.ttls:
+                return self.ttls[name]
+        return self.default_ttl
+
+    def _path(self, url, params):
+        if params and not isinstance(params, str):
+            params = urlencode(sorted(params.items()), quote_via=quote)
+        key = json.dumps([url, params or ""])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".json")
+
+    def get(self, url, params=None):
+        """
+        :return: Stored CacheEntry, fresh or expired, or None
+        """
+        try:
+            with open(self._path(url, params), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(**data)
+
+    def is_fresh(self, entry) -> bool:
+        ttl = self.ttl_for(entry.url)
+        return ttl is not None and entry.age() < ttl
+
+    def set(self, entry):
+        """
+        Store the entry, replacing the previous file atomically
+        """
+        path = self._path(entry.url, entry.params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            self.log.warning("Cannot write cache entry: {0}".format(path))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def renew(self, entry):
+        """
+        Mark the entry as fresh again after a ``304 Not Modified`` response
+        """
+        entry.stored_at = time.time()
+        self.set(entry)
+
+    def clear(self):
+        """
+        Remove all stored responses
+        """
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    os.remove(os.path.join(root, name))
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+"""
+Columnar decoding
+=================
+
+Exports and bulk loads do not need an Entity object per row. With
+:py:func:`~odata.query.Query.columns` every page of results is decoded
+straight into typed columns:
+
+.. code-block:: python
+
+    >>> query = Service.query(Property).select(Property.ListingKey, Property.ListPrice)
+    >>> for page in query.columns("numpy"):
+    ...     page["ListPrice"].mean()
+
+Backends:
+
+- ``python`` (default): dict of lists with deserialized values, no dependencies
+- ``numpy``: dict of NumPy arrays. Integers and booleans with missing values
+  are masked arrays, missing floats are NaN and missing datetimes NaT
+- ``arrow``: ``pyarrow.RecordBatch``, ready for ``pyarrow.parquet``
+
+NumPy and PyArrow are optional dependencies, they are only imported when
+their backend is used.
+
+Column types come from the EDM types of the reflected schema (see
+:py:attr:`~odata.metadata.MetaData.property_types`), or from the property
+classes of entities defined in code. ``Edm.Decimal`` columns are decoded to
+floats by default, ``decimal="decimal"`` keeps them exact.
+"""
+
+import datetime
+import importlib
+import json
+from decimal import Decimal
+
+from odata.property import (
+    BooleanProperty,
+    DatetimeProperty,
+    DecimalProperty,
+    FloatProperty,
+    IntegerProperty,
+    PropertyBase,
+)
+
+# column kinds by EDM type name
+EDM_KINDS = {
+    "Edm.Byte": "int",
+    "Edm.SByte": "int",
+    "Edm.Int16": "int",
+    "Edm.Int32": "int",
+    "Edm.Int64": "int",
+    "Edm.Boolean": "bool",
+    "Edm.Single": "float",
+    "Edm.Double": "float",
+    "Edm.Decimal": "decimal",
+    "Edm.DateTimeOffset": "datetime",
+    "Edm.Date": "date",
+}
+
+# column kinds by property class, for entities without a reflected schema
+PROPERTY_KINDS = (
+    (BooleanProperty, "bool"),
+    (IntegerProperty, "int"),
+    (FloatProperty, "float"),
+    (DecimalProperty, "decimal"),
+    (DatetimeProperty, "datetime"),
+)
+
+
+def _import_optional(module, backend):
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(
+            "The '{0}' columnar backend requires {1} to be installed".format(
+                backend, module
+            )
+        )
+
+
+def _parse_datetime(value):
+    # naive UTC, the representation of NumPy datetime64 and Arrow timestamps
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class ColumnarDecoder(object):
+    """
+    Decodes the ``value`` arrays of query responses into columns. Should not
+    be instantiated directly, use :py:func:`~odata.query.Query.columns`
+
+    :param entitycls: Entity class of the query
+    :param names: Property names to decode, all properties if None
+    :param backend: ``python`` (default), ``numpy`` or ``arrow``
+    :param decimal: ``float`` or ``decimal``, type of ``Edm.Decimal`` columns
+    """
+
+    backends = ("python", "numpy", "arrow")
+
+    def __init__(self, entitycls, names=None, backend="python", decimal="float"):
+        if backend not in self.backends:
+            raise ValueError("Unknown columnar backend: {0}".format(backend))
+        if decimal not in ("float", "decimal"):
+            raise ValueError("Unknown decimal mode: {0}".format(decimal))
+
+        self.entity = entitycls
+        self.backend = backend
+        self.decimal = decimal
+        self.columns = self._get_columns(entitycls, names)
+
+        self.numpy = None
+        self.pyarrow = None
+        if backend == "numpy":
+            self.numpy = _import_optional("numpy", backend)
+        elif backend == "arrow":
+            self.pyarrow = _import_optional("pyarrow", backend)
+
+    def __repr__(self):
+        return "<ColumnarDecoder of {0} columns to {1}>".format(
+            len(self.columns), self.backend
+        )
+
+    @staticmethod
+    def _get_columns(entitycls, names) -> list:
+        """
+        :return: List of (name, kind, is_collection) tuples
+        """
+        schema_types = {}
+        schema = entitycls.__odata_schema__ or {}
+        for schema_property in schema.get("properties", []):
+            schema_types[schema_property["name"]] = schema_property["type"]
+
+        properties = {}
+        for attr in dir(entitycls):
+            prop = getattr(entitycls, attr, None)
+            if isinstance(prop, PropertyBase):
+                properties[prop.name] = prop
+
+        columns = []
+        for name in names or sorted(properties):
+            prop = properties.get(name)
+            kind = EDM_KINDS.get(schema_types.get(name))
+            if kind is None and name not in schema_types and prop is not None:
+                for property_class, property_kind in PROPERTY_KINDS:
+                    if isinstance(prop, property_class):
+                        kind = property_kind
+                        break
+            is_collection = bool(prop is not None and prop.is_collection)
+            columns.append((name, kind or "string", is_collection))
+        return columns
+
+    def decode(self, rows):
+        """
+        :param rows: ``value`` array of a response
+        :return: Page of columns, type depends on the backend
+        """
+        if self.backend == "arrow":
+            arrays = [
+                self._to_arrow([row.get(name) for row in rows], kind, is_collection)
+                for name, kind, is_collection in self.columns
+            ]
+            names = [name for name, _, _ in self.columns]
+            return self.pyarrow.RecordBatch.from_arrays(arrays, names=names)
+
+        to_column = self._to_numpy if self.backend == "numpy" else self._to_python
+        return {
+            name: to_column([row.get(name) for row in rows], kind, is_collection)
+            for name, kind, is_collection in self.columns
+        }
+
+    # Backends #################################################################
+
+    def _to_python(self, values, kind, is_collection):
+        if is_collection:
+            return values
+        if kind == "datetime":
+            return [
+                datetime.datetime.fromisoformat(v) if v is not None else None
+                for v in values
+            ]
+        if kind == "date":
+            return [
+                datetime.date.fromisoformat(v) if v is not None else None
+                for v in values
+            ]
+        if kind == "decimal" and self.decimal == "decimal":
+            return [Decimal(str(v)) if v is not None else None for v in values]
+        if kind in ("decimal", "float"):
+            return [float(v) if v is not None else None for v in values]
+        return values
+
+    def _to_numpy(self, values, kind, is_collection):
+        np = self.numpy
+        if is_collection or kind == "string":
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            return column
+
+        if kind in ("int", "bool"):
+            dtype = np.int64 if kind == "int" else np.bool_
+            mask = [v is None for v in values]
+            if not any(mask):
+                return np.array(values, dtype=dtype)
+            data = np.array([0 if v is None else v for v in values], dtype=dtype)
+            return np.ma.masked_array(data, mask=mask)
+
+        if kind == "decimal" and self.decimal == "decimal":
+            return np.array(self._to_python(values, kind, False), dtype=object)
+        if kind in ("decimal", "float"):
+            return np.array(
+                [np.nan if v is None else float(v) for v in values], dtype=np.float64
+            )
+
+        if kind == "date":
+            return np.array(
+                ["NaT" if v is None else v for v in values], dtype="datetime64[D]"
+            )
+        # datetime
+        return np.array(
+            [None if v is None else _parse_datetime(v) for v in values],
+            dtype="datetime64[us]",
+        )
+
+    def _to_arrow(self, values, kind, is_collection):
+        pa = self.pyarrow
+        if is_collection:
+            try:
+                return pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                return pa.array(
+                    [json.dumps(v) if v is not None else None for v in values],
+                    pa.string(),
+                )
+
+        if kind == "int":
+            return pa.array(values, pa.int64())
+        if kind == "bool":
+            return pa.array(values, pa.bool_())
+        if kind == "decimal" and self.decimal == "decimal":
+            return pa.array(self._to_python(values, kind, False))
+        if kind in ("decimal", "float"):
+            return pa.array(self._to_python(values, kind, False), pa.float64())
+        if kind == "date":
+            return pa.array(self._to_python(values, kind, False), pa.date32())
+        if kind == "datetime":
+            return pa.array(
+                [None if v is None else _parse_datetime(v) for v in values],
+                pa.timestamp("us", tz="UTC"),
+            )
+        return pa.array(values, pa.string())
@@ -9,6 +9,7 @@ from requests.exceptions import RequestException
 from urllib.parse import urlencode, quote
 
 from odata import version
+from .cache import CacheEntry
 from .exceptions import ODataError, ODataConnectionError
 
 
@@ -30,6 +31,10 @@ class ODataConnection(object):
         "User-Agent": "python-odata {0}".format(version),
     }
     timeout = 90
+    # odata.identity.IdentityMap shared by queries and navigation loads
+    identity_map = None
+    # odata.cache.ResponseCache for GET responses
+    response_cache = None
 
     def __init__(self, session=None, auth=None, extra_headers: dict = None):
         if session is None:
@@ -46,8 +51,10 @@ class ODataConnection(object):
 
     def _apply_options(self, kwargs):
         kwargs["timeout"] = self.timeout
-        if "params" in kwargs and kwargs["params"]:
-            kwargs["params"] = urlencode(kwargs["params"], quote_via=quote)
+        params = kwargs.get("params")
+        if params and not isinstance(params, str):
+            # queries pass their options already encoded
+            kwargs["params"] = urlencode(params, quote_via=quote)
 
         if self.auth is not None:
             kwargs["auth"] = self.auth
@@ -139,7 +146,34 @@ class ODataConnection(object):
         if params:
             self.log.info("Query: {0}".format(params))
 
+        cache = self.response_cache
+        if cache is None or cache.ttl_for(url) is None:
+            response = self._do_get(url, params=params, headers=headers)
+            return self._read_get_response(response, allow_plain_response)
+
+        entry = cache.get(url, params)
+        if entry is not None:
+            if cache.is_fresh(entry):
+                cache.hits += 1
+                self.log.info("Cached response")
+                return self._read_get_response(
+                    entry.to_response(), allow_plain_response
+                )
+            headers.update(entry.conditional_headers())
+
         response = self._do_get(url, params=params, headers=headers)
+        not_modified = response.status_code == requests.codes.not_modified
+        if not_modified and entry is not None:
+            cache.revalidated += 1
+            self.log.info("Cached response is not modified")
+            cache.renew(entry)
+            response = entry.to_response()
+        elif response.status_code == requests.codes.ok:
+            cache.misses += 1
+            cache.set(CacheEntry.from_response(url, params, response))
+        return self._read_get_response(response, allow_plain_response)
+
+    def _read_get_response(self, response, allow_plain_response=False):
         self._handle_odata_error(response)
         response_ct = response.headers.get("content-type", "")
         if response.status_code == requests.codes.no_content:
@@ -171,6 +205,9 @@ class ODataConnection(object):
         self.log.info("Payload: {0}".format(data))
 
         response = self._do_post(url, data=data, headers=headers, params=params)
+        return self._read_write_response(response)
+
+    def _read_write_response(self, response):
         self._handle_odata_error(response)
         response_ct = response.headers.get("content-type", "")
         if response.status_code == requests.codes.no_content:
@@ -207,3 +244,24 @@ class ODataConnection(object):
 
         response = self._do_delete(url, headers=headers)
         self._handle_odata_error(response)
+
+    def execute_batch(self, url, data, content_type, extra_headers=None):
+        """
+        POST a ``$batch`` request body, prepared by :py:class:`~odata.batch.Batch`
+
+        :return: Response object of the whole batch
+        """
+        headers = {
+            "Content-Type": content_type,
+        }
+        headers.update(self.base_headers)
+
+        if extra_headers:
+            headers.update(extra_headers)
+
+        self.log.info("POST {0}".format(url))
+        self.log.info("Batch payload: {0}".format(data))
+
+        response = self._do_post(url, data=data, headers=headers)
+        self._handle_odata_error(response)
+        return response
@@ -1,23 +1,57 @@
 # -*- coding: utf-8 -*-
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
+from odata.batch import Batch
+from odata.identity import IdentityMap
 from odata.query import Query
 from odata.connection import ODataConnection
 from odata.exceptions import ODataError
 
 
 class Context:
-    def __init__(self, session=None, auth=None, extra_headers: dict = None):
+    def __init__(
+        self,
+        session=None,
+        auth=None,
+        extra_headers: dict = None,
+        identity_map=False,
+        identity_map_size=10000,
+        response_cache=None,
+    ):
         self.log = logging.getLogger("odata.context")
         self.connection = ODataConnection(
             session=session, auth=auth, extra_headers=extra_headers
         )
+        if identity_map:
+            self.connection.identity_map = IdentityMap(max_size=identity_map_size)
+        self.connection.response_cache = response_cache
+
+    @property
+    def identity_map(self):
+        """
+        :py:class:`~odata.identity.IdentityMap` of this Context, None if disabled
+        """
+        return self.connection.identity_map
 
     def query(self, entitycls):
         q = Query(entitycls, connection=self.connection)
         return q
 
+    def batch(self, url=None, format="json", atomic=False, max_size=None):
+        """
+        Start a batch using this Context's connection. Operations queued on the
+        batch are sent in one ``$batch`` request when the ``with`` block exits
+
+        :param url: ``$batch`` endpoint. Resolved from the first queued entity if None
+        :param format: ``json`` (OData 4.01) or ``multipart`` (OData 4.0)
+        :param atomic: Send all writes in one change set
+        :param max_size: Maximum number of operations in one ``$batch`` request, ignored when atomic
+        :return: Batch instance
+        """
+        return Batch(self, url=url, format=format, atomic=atomic, max_size=max_size)
+
     def call(self, action_or_function, **parameters):
         """
         Call a defined Action or Function using this Context's connection
@@ -48,9 +82,14 @@ class Context:
         self.log.info("Deleting entity: {0}".format(entity))
         url = entity.__odata__.instance_url
         self.connection.execute_delete(url)
-        entity.__odata__.persisted = False
+        self._apply_delete(entity)
         self.log.info("Success")
 
+    def _apply_delete(self, entity):
+        entity.__odata__.persisted = False
+        if self.identity_map is not None:
+            self.identity_map.discard(entity)
+
     def save(self, entity, force_refresh=True, extra_headers=None):
         """
         Creates a POST or PATCH call to the service. If the entity already has
@@ -71,6 +110,75 @@ class Context:
         else:
             self._insert_new(entity)
 
+    def save_many(
+        self,
+        entities,
+        force_refresh=False,
+        extra_headers=None,
+        max_workers=8,
+        use_batch=False,
+        batch_size=100,
+    ) -> list:
+        """
+        Save many entities, see :py:func:`save`. Writes are sent concurrently,
+        or in ``$batch`` requests with ``use_batch=True``. A failed write does
+        not stop the others
+
+        :param entities: Model instances to insert or update
+        :param force_refresh: Read full entity data again from service after PATCH calls
+        :param extra_headers: Add custom headers on patch, post. Not sent with ``use_batch``
+        :param max_workers: Number of writes sent at the same time
+        :param use_batch: Send writes in ``$batch`` requests instead
+        :param batch_size: Number of writes in one ``$batch`` request
+        :return: Futures in the order of entities, holding the saved entity or the error
+        """
+
+        def save(entity):
+            self.save(entity, force_refresh=force_refresh, extra_headers=extra_headers)
+            return entity
+
+        if use_batch:
+            return self._batch_many(
+                entities, batch_size, lambda b, e: b.save(e, force_refresh)
+            )
+        return self._submit_many(entities, save, max_workers)
+
+    def delete_many(self, entities, max_workers=8, use_batch=False, batch_size=100):
+        """
+        Delete many entities, see :py:func:`delete`. Deletes are sent
+        concurrently, or in ``$batch`` requests with ``use_batch=True``
+
+        :param entities: Model instances to delete
+        :param max_workers: Number of deletes sent at the same time
+        :param use_batch: Send deletes in ``$batch`` requests instead
+        :param batch_size: Number of deletes in one ``$batch`` request
+        :return: Futures in the order of entities, holding None or the error
+        """
+        if use_batch:
+            return self._batch_many(entities, batch_size, lambda b, e: b.delete(e))
+        return self._submit_many(entities, self.delete, max_workers)
+
+    def _submit_many(self, entities, fn, max_workers) -> list:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(fn, entity) for entity in entities]
+        self._log_many(futures)
+        return futures
+
+    def _batch_many(self, entities, batch_size, queue) -> list:
+        batch = self.batch(max_size=batch_size)
+        futures = [queue(batch, entity) for entity in entities]
+        try:
+            batch.execute()
+        except ODataError as e:
+            # futures of the operations not sent hold the error
+            self.log.error("Batch failed: {0}".format(e))
+        self._log_many(futures)
+        return futures
+
+    def _log_many(self, futures):
+        failed = len([f for f in futures if f.exception() is not None])
+        self.log.info("Wrote {0} entities, {1} failed".format(len(futures), failed))
+
     def is_entity_saved(self, entity):
         return entity.__odata__.persisted
 
@@ -80,6 +188,16 @@ class Context:
 
         :type entity: EntityBase
         """
+        url, insert_data = self._prepare_insert(entity)
+
+        self.log.info("Saving new entity")
+
+        saved_data = self.connection.execute_post(url, insert_data)
+        self._apply_insert(entity, saved_data)
+
+        self.log.info("Success")
+
+    def _prepare_insert(self, entity):
         url = entity.__odata_url__()
         if url is None:
             msg = "Cannot insert Entity that does not belong to EntitySet: {0}".format(
@@ -87,19 +205,18 @@ class Context:
             )
             raise ODataError(msg)
 
-        self.log.info("Saving new entity")
+        return url, entity.__odata__.data_for_insert()
 
+    def _apply_insert(self, entity, saved_data):
         es = entity.__odata__
-        insert_data = es.data_for_insert()
-        saved_data = self.connection.execute_post(url, insert_data)
         es.reset()
         es.connection = self.connection
         es.persisted = True
 
         if saved_data is not None:
             es.update(saved_data)
-
-        self.log.info("Success")
+        if self.identity_map is not None:
+            self.identity_map.merge(entity)
 
     def _update_existing(self, entity, force_refresh=True, extra_headers=None):
         """
@@ -107,27 +224,18 @@ class Context:
 
         :type entity: EntityBase
         """
-        es = entity.__odata__
-        if es.instance_url is None:
-            msg = "Cannot update Entity that does not belong to EntitySet: {0}".format(
-                entity
-            )
-            raise ODataError(msg)
+        url, patch_data = self._prepare_update(entity)
 
-        patch_data = es.data_for_update()
-
-        if len([i for i in patch_data if not i.startswith("@")]) == 0:
+        if patch_data is None:
             self.log.debug("Nothing to update: {0}".format(entity))
             return
 
         self.log.info("Updating existing entity: {0}".format(entity))
 
-        url = es.instance_url
-
         saved_data = self.connection.execute_patch(
             url, patch_data, extra_headers=extra_headers
         )
-        es.reset()
+        entity.__odata__.reset()
 
         if saved_data is None and force_refresh:
             self.log.info("Reloading entity from service")
@@ -137,3 +245,21 @@ class Context:
             entity.__odata__.update(saved_data)
 
         self.log.info("Success")
+
+    def _prepare_update(self, entity):
+        """
+        :return: Instance url and PATCH data, data is None if nothing changed
+        """
+        es = entity.__odata__
+        if es.instance_url is None:
+            msg = "Cannot update Entity that does not belong to EntitySet: {0}".format(
+                entity
+            )
+            raise ODataError(msg)
+
+        patch_data = es.data_for_update()
+
+        if len([i for i in patch_data if not i.startswith("@")]) == 0:
+            return es.instance_url, None
+
+        return es.instance_url, patch_data
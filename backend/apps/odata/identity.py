@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+Identity map
+============
+
+A Context can keep one shared instance per entity key. Entities read again by
+later queries, expanded or loaded through navigation properties resolve to the
+instance already in memory, which is updated with the fresh values:
+
+.. code-block:: python
+
+    >>> context = Service.create_context(identity_map=True)
+    >>> first = context.query(Order).get(1)
+    >>> again = context.query(Order).filter(Order.Id == 1).first()
+    >>> first is again
+    True
+
+Single navigation properties with a referential constraint are served from the
+map without a request when the related entity is already loaded.
+
+Entities are held by weak references, so the map does not keep them alive on
+its own. The most recently used ``max_size`` entities are also referenced
+strongly, so shared entities (an office referenced by many listings) survive
+between pages.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class IdentityMap(object):
+    """
+    Entity instances by :py:attr:`~odata.state.EntityState.id`. Should not be
+    instantiated directly, use ``identity_map=True`` when creating a Context
+
+    :param max_size: Number of recently used entities kept alive by the map
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entities = weakref.WeakValueDictionary()
+        self._recent = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return "<IdentityMap of {0} entities>".format(len(self))
+
+    def __len__(self):
+        return len(self._entities)
+
+    def __contains__(self, entity_id):
+        return entity_id in self._entities
+
+    def _touch(self, entity_id, entity):
+        self._recent[entity_id] = entity
+        self._recent.move_to_end(entity_id)
+        while len(self._recent) > self.max_size:
+            self._recent.popitem(last=False)
+
+    def get(self, entity_id):
+        """
+        :param entity_id: Entity id, for example ``Order(1)``
+        :return: Entity instance or None
+        """
+        with self._lock:
+            entity = self._entities.get(entity_id)
+            if entity is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(entity_id, entity)
+            return entity
+
+    def merge(self, entity):
+        """
+        Add the entity to the map. If an instance with the same id is already
+        in the map, it is updated with the values of the given entity and
+        returned instead. Values modified locally are kept
+
+        :param entity: Entity instance
+        :return: The shared Entity instance
+        """
+        entity_id = entity.__odata__.id
+        if entity_id is None:
+            return entity
+
+        with self._lock:
+            existing = self._entities.get(entity_id)
+            if existing is None or existing is entity:
+                self._entities[entity_id] = entity
+                self._touch(entity_id, entity)
+                return entity
+
+            es = existing.__odata__
+            new_es = entity.__odata__
+            for key, value in new_es.data.items():
+                if key not in es.dirty:
+                    es.data[key] = value
+            es.nav_cache.update(new_es.nav_cache)
+            es.persisted = es.persisted or new_es.persisted
+            if es.connection is None:
+                es.connection = new_es.connection
+
+            self._touch(entity_id, existing)
+            return existing
+
+    def discard(self, entity):
+        """
+        Remove the entity from the map, for example after it was deleted
+        """
+        entity_id = entity.__odata__.id
+        with self._lock:
+            if self._entities.get(entity_id) is entity:
+                del self._entities[entity_id]
+                self._recent.pop(entity_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
+            self._recent.clear()
@@ -0,0 +1,107 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from odata import ODataService
+from odata.metadata import MetaData, ET
+
+EDMX_HEADER = (
+    '<edmx:Edmx xmlns:edmx="http://docs.oasis-open.org/odata/ns/edmx" Version="4.0">'
+    "<edmx:DataServices>"
+    '<Schema xmlns="http://docs.oasis-open.org/odata/ns/edm" '
+    'Namespace="Bench.Schema" Alias="Bench">'
+)
+EDMX_FOOTER = "</Schema></edmx:DataServices></edmx:Edmx>"
+
+
+def build_metadata_document(entities, properties, navigations, seed=0):
+    """
+    Build a synthetic $metadata document shaped like the BrightMLS one:
+    many wide entity types, each with navigation properties and a bound
+    function pointing at random other types.
+    """
+    rnd = random.Random(seed)
+    parts = [EDMX_HEADER]
+    for i in range(entities):
+        parts.append(f'<EntityType Name="Entity{i}">')
+        parts.append('<Key><PropertyRef Name="Key"/></Key>')
+        parts.append('<Property Name="Key" Type="Edm.Int64" Nullable="false"/>')
+        for p in range(properties):
+            parts.append(f'<Property Name="Prop{p}" Type="Edm.String"/>')
+        for n in range(navigations):
+            target = rnd.randrange(entities)
+            type_ = f"Bench.Entity{target}"
+            if n % 2:
+                type_ = f"Collection({type_})"
+            parts.append(f'<NavigationProperty Name="Nav{n}" Type="{type_}"/>')
+        parts.append("</EntityType>")
+        parts.append(
+            f'<Function Name="Refresh{i}" IsBound="true">'
+            f'<Parameter Name="bindingParameter" Type="Bench.Schema.Entity{i}"/>'
+            f'<ReturnType Type="Bench.Schema.Entity{rnd.randrange(entities)}"/>'
+            f"</Function>"
+        )
+    parts.append('<EntityContainer Name="Container">')
+    for i in range(entities):
+        parts.append(
+            f'<EntitySet Name="Entity{i}" EntityType="Bench.Schema.Entity{i}"/>'
+        )
+    parts.append("</EntityContainer>")
+    parts.append(EDMX_FOOTER)
+    return "".join(parts).encode("utf-8")
+
+
+class SyntheticMetaData(MetaData):
+    document = None
+
+    def load_document(self):
+        return ET.fromstring(self.document)
+
+
+class Command(BaseCommand):
+    help = "Benchmark odata metadata reflection over synthetic documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--entities",
+            nargs="+",
+            type=int,
+            default=[100, 200, 400, 800],
+            help="Entity type counts to reflect (defaults to 100 200 400 800)",
+        )
+        parser.add_argument(
+            "--properties",
+            type=int,
+            default=50,
+            help="Properties per entity type (defaults to 50)",
+        )
+        parser.add_argument(
+            "--navigations",
+            type=int,
+            default=10,
+            help="Navigation properties per entity type (defaults to 10)",
+        )
+
+    def handle(self, *args, **options):
+        previous = None
+        for entities in options["entities"]:
+            document = build_metadata_document(
+                entities, options["properties"], options["navigations"]
+            )
+            service = ODataService(
+                "http://bench.local/odata/", reflect_entities=False, quiet_progress=True
+            )
+            metadata = SyntheticMetaData(service, console=service.console, quiet=True)
+            metadata.document = document
+
+            started = time.perf_counter()
+            _, sets, types = metadata.get_entity_sets(base=service.Entity)
+            elapsed = time.perf_counter() - started
+
+            growth = f"x{elapsed / previous:.2f}" if previous else "-"
+            previous = elapsed
+            self.stdout.write(
+                f"{entities:>6} entities, {len(sets):>6} sets, {len(types):>6} types: "
+                f"{elapsed * 1000:>9.1f} ms ({growth})"
+            )
@@ -0,0 +1,132 @@
+import datetime
+import gc
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from odata import ODataService
+from odata.property import (
+    DatetimeProperty,
+    DecimalProperty,
+    IntegerProperty,
+    StringProperty,
+)
+from odata.query import Query
+
+
+def build_property_entity(service, columns):
+    """
+    Entity shaped like BrightProperties: a numeric key, a modification
+    timestamp, a few filtered columns and many selected ones.
+    """
+    attrs = {
+        "__odata_type__": "Bench.Property",
+        "__odata_collection__": "Property",
+        "ListingKey": IntegerProperty("ListingKey", primary_key=True),
+        "ModificationTimestamp": DatetimeProperty("ModificationTimestamp"),
+        "StandardStatus": StringProperty("StandardStatus"),
+        "ListPrice": DecimalProperty("ListPrice"),
+        "City": StringProperty("City"),
+    }
+    for i in range(columns):
+        attrs[f"Column{i}"] = StringProperty(f"Column{i}")
+    return type("Property", (service.Entity,), attrs)
+
+
+class Command(BaseCommand):
+    help = "Benchmark odata query building and URL compilation over BrightMLS-like filters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=10000,
+            help="Requests to compile per scenario (defaults to 10000)",
+        )
+        parser.add_argument(
+            "--columns",
+            type=int,
+            default=100,
+            help="Selected columns (defaults to 100)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Runs per scenario, the best one is reported (defaults to 3)",
+        )
+
+    def handle(self, *args, **options):
+        service = ODataService(
+            "http://bench.local/odata/", reflect_entities=False, quiet_progress=True
+        )
+        Property = build_property_entity(service, options["columns"])
+        requests = options["requests"]
+        since = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        columns = [getattr(Property, f"Column{i}") for i in range(options["columns"])]
+
+        base = (
+            service.query(Property)
+            .select(Property.ListingKey, *columns)
+            .filter(Property.ModificationTimestamp >= since)
+            .filter(Property.StandardStatus.in_(["Active", "Pending", "Closed"]))
+            .filter(Property.ListPrice > Decimal("100000"))
+            .order_by(Property.ListingKey.asc())
+        )
+
+        def build(i):
+            query = (
+                service.query(Property)
+                .select(Property.ListingKey, *columns)
+                .filter(Property.ModificationTimestamp >= since)
+                .filter(Property.StandardStatus.in_(["Active", "Pending", "Closed"]))
+                .filter(Property.ListPrice > Decimal("100000"))
+                .order_by(Property.ListingKey.asc())
+                .filter(Property.ListingKey > i)
+            )
+            return query._get_query_string()
+
+        def page(i):
+            query = base._new_query({"$skip": i * 1000, "$top": 1000})
+            return query._get_query_string()
+
+        def page_uncompiled(i):
+            # a fresh query without the compiled fragments of the base query
+            query = Query(Property, connection=base.connection, options=base.options)
+            return query._new_query({"$skip": i * 1000, "$top": 1000})._get_query_string()
+
+        def key_range(i):
+            query = base.filter(Property.ListingKey > i)
+            return query._get_query_string()
+
+        def repeated(i):
+            return base._get_query_string()
+
+        scenarios = [
+            ("build and compile", build),
+            ("skip pages, uncompiled base", page_uncompiled),
+            ("skip pages, shared base", page),
+            ("key ranges, shared base", key_range),
+            ("same query", repeated),
+        ]
+        for name, fn in scenarios:
+            elapsed = min(
+                self.run_scenario(fn, requests) for _ in range(options["repeat"])
+            )
+            self.stdout.write(
+                f"{name:<30} {requests:>7} requests: "
+                f"{elapsed * 1000:>9.1f} ms ({elapsed / requests * 1e6:>7.1f} us each)"
+            )
+
+    @staticmethod
+    def run_scenario(fn, requests):
+        # like timeit, collector pauses are kept out of the measurement
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for i in range(requests):
+                fn(i)
+            return time.perf_counter() - started
+        finally:
+            gc.enable()
@@ -74,7 +74,24 @@ class MetaData(object):
             entity for entity in all_types.values() if issubclass(entity, EntityBase)
         ]
 
-    def _set_object_relationships(self, all_types):
+    def _build_entity_type_index(self, all_types):
+        """
+        Map every entity type name and its schema alias to the entity class,
+        so relationship and binding lookups are dict hits instead of scans
+        over all entities. Later entities win, as with the linear search.
+        """
+        index = {}
+        for entity in self._get_entities_from_types(all_types):
+            schema = entity.__odata_schema__
+            index[schema["type"]] = entity
+            type_alias = schema.get("type_alias")
+            if type_alias:
+                index[type_alias] = entity
+        return index
+
+    def _set_object_relationships(self, all_types, type_index=None):
+        if type_index is None:
+            type_index = self._build_entity_type_index(all_types)
         entities = self._get_entities_from_types(all_types)
         for entity in rich.progress.track(
             entities,
@@ -92,22 +109,22 @@ class MetaData(object):
                 name = schema_nav["name"]
                 type_ = schema_nav["type"]
                 foreign_key = schema_nav["foreign_key"]
+                referenced_key = schema_nav.get("referenced_key")
+                partner = schema_nav.get("partner")
 
                 is_collection, type_ = self._type_is_collection(type_)
 
-                for _search_entity in entities:
-                    _search_type = _search_entity.__odata_schema__["type"]
-                    _search_type_alias = _search_entity.__odata_schema__.get(
-                        "type_alias"
+                nav_entity = type_index.get(type_)
+                if nav_entity is not None:
+                    nav = NavigationProperty(
+                        name,
+                        nav_entity,
+                        collection=is_collection,
+                        foreign_key=foreign_key,
+                        partner=partner,
+                        referenced_key=referenced_key,
                     )
-                    if type_ in (_search_type, _search_type_alias):
-                        nav = NavigationProperty(
-                            name,
-                            _search_entity,
-                            collection=is_collection,
-                            foreign_key=foreign_key,
-                        )
-                        setattr(entity, name, nav)
+                    setattr(entity, name, nav)
 
     def _create_entities(self, all_types, entity_base_class, schemas, depth=1):
         orphan_entities = []
@@ -189,8 +206,11 @@ class MetaData(object):
                 depth += 1
                 self._create_entities(all_types, entity_base_class, schemas, depth)
 
-    def _create_actions(self, all_types, actions, get_entity_or_prop_from_type):
-        entities = self._get_entities_from_types(all_types)
+    def _create_actions(
+        self, all_types, actions, get_entity_or_prop_from_type, type_index=None
+    ):
+        if type_index is None:
+            type_index = self._build_entity_type_index(all_types)
         for action in rich.progress.track(
             actions,
             "Creating actions",
@@ -203,10 +223,7 @@ class MetaData(object):
             bound_to_collection = False
             if entity_type:
                 bound_to_collection, entity_type = self._type_is_collection(entity_type)
-                for entity in entities:
-                    schema = entity.__odata_schema__
-                    if entity_type in (schema["type"], schema.get("type_alias")):
-                        bind_entity = entity
+                bind_entity = type_index.get(entity_type)
 
             parameters_dict = {}
             for param in action["parameters"]:
@@ -231,8 +248,11 @@ class MetaData(object):
             else:
                 self.service.actions[action["name"]] = action_class()
 
-    def _create_functions(self, all_types, functions, get_entity_or_prop_from_type):
-        entities = self._get_entities_from_types(all_types)
+    def _create_functions(
+        self, all_types, functions, get_entity_or_prop_from_type, type_index=None
+    ):
+        if type_index is None:
+            type_index = self._build_entity_type_index(all_types)
         for function in rich.progress.track(
             functions,
             "Creating functions",
@@ -245,10 +265,7 @@ class MetaData(object):
             bound_to_collection = False
             if entity_type:
                 bound_to_collection, entity_type = self._type_is_collection(entity_type)
-                for entity in entities:
-                    schema = entity.__odata_schema__
-                    if entity_type in (schema["type"], schema.get("type_alias")):
-                        bind_entity = entity
+                bind_entity = type_index.get(entity_type)
 
             parameters_dict = {}
             for param in function["parameters"]:
@@ -286,6 +303,7 @@ class MetaData(object):
             if typename is None:
                 return
 
+            # all_types is keyed by both the full type name and its alias
             type_ = all_types.get(typename)
             if type_ is not None:
                 return type_
@@ -329,9 +347,14 @@ class MetaData(object):
             )
             sets[set_name] = set_class
 
-        self._set_object_relationships(all_types)
-        self._create_actions(all_types, actions, get_entity_or_prop_from_type)
-        self._create_functions(all_types, functions, get_entity_or_prop_from_type)
+        type_index = self._build_entity_type_index(all_types)
+        self._set_object_relationships(all_types, type_index)
+        self._create_actions(
+            all_types, actions, get_entity_or_prop_from_type, type_index
+        )
+        self._create_functions(
+            all_types, functions, get_entity_or_prop_from_type, type_index
+        )
 
         self.log.info(
             "Loaded {0} entity sets, total {1} types".format(len(sets), len(all_types))
@@ -474,17 +497,21 @@ class MetaData(object):
             p_name = nav_property.attrib["Name"]
             p_type = nav_property.attrib["Type"]
             p_foreign_key = None
+            p_referenced_key = None
 
             ref_constraint = xmlq(nav_property, "edm:ReferentialConstraint")
             if ref_constraint:
                 ref_constraint = ref_constraint[0]
                 p_foreign_key = ref_constraint.attrib["Property"]
+                p_referenced_key = ref_constraint.attrib.get("ReferencedProperty")
 
             entity["navigation_properties"].append(
                 {
                     "name": p_name,
                     "type": p_type,
                     "foreign_key": p_foreign_key,
+                    "referenced_key": p_referenced_key,
+                    "partner": nav_property.attrib.get("Partner"),
                 }
             )
         return entity
@@ -547,6 +574,13 @@ class MetaData(object):
 
             schemas.append(schema_dict)
 
+        entity_schemas = {}
+        for schema_ in schemas:
+            for entity in schema_.get("entities", []):
+                entity_schemas[entity["type"]] = entity
+                if entity.get("type_alias"):
+                    entity_schemas[entity["type_alias"]] = entity
+
         for schema in xmlq(doc, "edmx:DataServices/edm:Schema"):
             schema_name = schema.attrib["Namespace"]
             for entity_set in xmlq(schema, "edm:EntityContainer/edm:EntitySet"):
@@ -559,10 +593,7 @@ class MetaData(object):
                     "schema": None,
                 }
 
-                for schema_ in schemas:
-                    for entity in schema_.get("entities", []):
-                        if set_type in (entity.get("type"), entity.get("type_alias")):
-                            set_dict["schema"] = entity
+                set_dict["schema"] = entity_schemas.get(set_type)
 
                 container_sets[set_name] = set_dict
 
@@ -577,10 +608,7 @@ class MetaData(object):
                     "singleton": True,
                 }
 
-                for schema_ in schemas:
-                    for entity in schema_.get("entities", []):
-                        if set_type in (entity.get("type"), entity.get("type_alias")):
-                            set_dict["schema"] = entity
+                set_dict["schema"] = entity_schemas.get(set_type)
 
                 container_sets[set_name] = set_dict
 
@@ -28,8 +28,10 @@ properties:
     order.Shipper = my_shipper
     Service.save(order)
 """
+
 import copy
 import importlib
+import inspect
 from typing import Union
 
 from odata.exceptions import ODataReflectionError
@@ -55,6 +57,8 @@ class NavigationProperty(object):
         entity_package: str = None,
         collection=False,
         foreign_key=None,
+        partner=None,
+        referenced_key=None,
     ):
         from odata.property import PropertyBase
 
@@ -66,6 +70,10 @@ class NavigationProperty(object):
             self.foreign_key = foreign_key.name
         else:
             self.foreign_key = foreign_key
+        self.partner = partner
+        self.referenced_key = referenced_key
+        # parent entity class -> result of prefetch_keys, resolved once per class
+        self._prefetch_keys = {}
 
     def __repr__(self):
         return "<NavigationProperty to {0}>".format(self.entitycls)
@@ -77,6 +85,9 @@ class NavigationProperty(object):
         es = result.__odata__
         es.parent_navigation_url = parent_navigation_url
 
+        identity_map = getattr(connection, "identity_map", None)
+        if identity_map is not None:
+            result = identity_map.merge(result)
         return result
 
     @property
@@ -95,6 +106,60 @@ class NavigationProperty(object):
 
         return self.entityclass
 
+    def prefetch_keys(self, parent_cls):
+        """
+        Find the properties correlating parent and related entities, so the
+        relationship can be loaded for many parents at once. Uses the
+        referential constraint of this property, or of its partner for
+        collections
+
+        :param parent_cls: Entity class owning this navigation property
+        :return: Tuple of parent and related property, or None if unknown
+        """
+        if parent_cls not in self._prefetch_keys:
+            self._prefetch_keys[parent_cls] = self._resolve_prefetch_keys(parent_cls)
+        return self._prefetch_keys[parent_cls]
+
+    def _resolve_prefetch_keys(self, parent_cls):
+        related_cls = self.entitycls
+
+        if not self.is_collection and self.foreign_key:
+            parent_key = _find_property(parent_cls, self.foreign_key)
+            related_key = _find_property(related_cls, self.referenced_key)
+        elif self.partner:
+            partner = getattr(related_cls, self.partner, None)
+            if not isinstance(partner, NavigationProperty) or not partner.foreign_key:
+                return None
+            parent_key = _find_property(parent_cls, partner.referenced_key)
+            related_key = _find_property(related_cls, partner.foreign_key)
+        else:
+            return None
+
+        if parent_key is None or related_key is None:
+            return None
+        return parent_key, related_key
+
+    def _get_from_identity_map(self, instance, connection):
+        """
+        Find the related entity of a single navigation property in the
+        identity map, by the foreign key value of the instance
+        """
+        identity_map = getattr(connection, "identity_map", None)
+        if identity_map is None or self.is_collection or not self.foreign_key:
+            return None
+
+        keys = self.prefetch_keys(instance.__class__)
+        if keys is None or not keys[1].primary_key:
+            return None
+        parent_key, related_key = keys
+
+        value = instance.__odata__[parent_key.name]
+        collection = self.entitycls.__odata_collection__
+        if value is None or collection is None:
+            return None
+        entity_id = "{0}({1})".format(collection, related_key.escape_value(value))
+        return identity_map.get(entity_id)
+
     def instances_from_data(self, raw_data, connection, parent_navigation_url):
         if self.is_collection:
             return [
@@ -182,6 +247,11 @@ class NavigationProperty(object):
             return cache["collection"]
         else:
             if "single" not in cache:
+                cached = self._get_from_identity_map(instance, connection)
+                if cached is not None:
+                    cache["single"] = cached
+                    return cached
+
                 raw_data = connection.execute_get(nav_url)
                 if raw_data:
                     value = self.instances_from_data(raw_data, connection, nav_url)
@@ -189,3 +259,21 @@ class NavigationProperty(object):
                 else:
                     cache["single"] = None
             return cache["single"]
+
+
+def _find_property(entitycls, name):
+    """
+    Find a property of the entity class by its name, the single primary key
+    property if name is None
+    """
+    from odata.property import PropertyBase
+
+    props = [p for _, p in inspect.getmembers(entitycls) if isinstance(p, PropertyBase)]
+    if name is None:
+        pks = [p for p in props if p.primary_key]
+        return pks[0] if len(pks) == 1 else None
+
+    for prop in props:
+        if prop.name == name:
+            return prop
+    return None
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""
+Partitions
+==========
+
+A query can be split into independent partitions with
+:py:func:`~odata.query.Query.partitions`. Every partition is a plain iterable,
+so partitions can be consumed from separate threads, processes or async tasks:
+
+.. code-block:: python
+
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> query = Service.query(Property)
+    >>> partitions = query.partitions(8, key=Property.ListingKey)
+    >>> with ThreadPoolExecutor(8) as pool:
+    ...     pool.map(lambda p: [handle(row) for row in p], partitions)
+
+Range partitions filter the query by ``key >= lower and key < upper``, where
+the boundaries are probed from the service. Skip partitions page through
+``$skip`` windows of the ordered query.
+
+Each partition carries a resume token, a JSON serializable dict describing the
+partition and its progress. The token can be stored as a checkpoint, or sent
+to another process which rebuilds the partition with its own service:
+
+.. code-block:: python
+
+    >>> token = partition.token
+    >>> partition = Service.query(Property).partition(token)
+    >>> for row in partition:  # continues after the last yielded row
+    ...     pass
+"""
+
+from odata.exceptions import ODataQueryError
+
+
+class QueryPartition(object):
+    """
+    One independent slice of a :py:class:`~odata.query.Query`. Should not be
+    instantiated directly, use :py:func:`~odata.query.Query.partitions`.
+
+    :param query: Query to partition
+    :param index: Position of this partition among its siblings
+    :param strategy: ``range`` or ``skip``
+    :param key: Orderable Property used for ranges and ordering
+    :param lower: Inclusive lower bound (JSON value) of a range partition
+    :param upper: Exclusive upper bound (JSON value) of a range partition
+    :param start: First offset of a skip partition
+    :param stop: Offset where a skip partition ends, None to read until the end
+    :param page_size: Rows requested at once by skip partitions
+    :param last: Progress of the partition. Last key value read for range
+        partitions, offset of the next row for skip partitions
+    """
+
+    strategies = ("range", "skip")
+
+    def __init__(
+        self,
+        query,
+        index=0,
+        strategy="range",
+        key=None,
+        lower=None,
+        upper=None,
+        start=0,
+        stop=None,
+        page_size=1000,
+        last=None,
+    ):
+        if strategy not in self.strategies:
+            raise ODataQueryError(f"Unknown partitioning strategy: {strategy}")
+        if strategy == "range" and key is None:
+            raise ODataQueryError("Range partitions require a key property")
+
+        self.query = query
+        self.index = index
+        self.strategy = strategy
+        self.key = key
+        self.lower = lower
+        self.upper = upper
+        self.start = start
+        self.stop = stop
+        self.page_size = page_size
+        self.last = last
+
+    def __repr__(self):
+        if self.strategy == "range":
+            bounds = f"{self.key.name} in [{self.lower}, {self.upper})"
+        else:
+            bounds = f"$skip in [{self.start}, {self.stop})"
+        return f"<QueryPartition {self.index} for {self.query.entity}: {bounds}>"
+
+    def __iter__(self):
+        if self.strategy == "range":
+            return self._iter_range()
+        return self._iter_skip()
+
+    @property
+    def token(self) -> dict:
+        """
+        JSON serializable resume token. Pass it to
+        :py:func:`~odata.query.Query.partition` to continue this partition
+        """
+        return {
+            "index": self.index,
+            "strategy": self.strategy,
+            "key": self.key.name if self.key is not None else None,
+            "lower": self.lower,
+            "upper": self.upper,
+            "start": self.start,
+            "stop": self.stop,
+            "page_size": self.page_size,
+            "last": self.last,
+        }
+
+    def _to_python(self, value):
+        return self.key.deserialize(value)
+
+    def _row_key_value(self, row):
+        if isinstance(row, dict):
+            return row.get(self.key.name)
+        return row.__odata__[self.key.name]
+
+    def _ordered_query(self):
+        q = self.query._new_query()
+        if self.key is not None:
+            q = q._new_query({"$orderby": (self.key.asc(),)})
+            select = q.options["$select"]
+            if select and self.key.name not in select:
+                q = q.select(self.key)
+        return q
+
+    def _range_query(self):
+        q = self._ordered_query()
+        if self.last is not None:
+            q = q.filter(self.key > self._to_python(self.last))
+        elif self.lower is not None:
+            q = q.filter(self.key >= self._to_python(self.lower))
+        if self.upper is not None:
+            q = q.filter(self.key < self._to_python(self.upper))
+        return q
+
+    def _iter_range(self):
+        for row in self._range_query():
+            # progress is recorded before yielding, so a token taken while
+            # handling the row resumes after it
+            self.last = self._row_key_value(row)
+            yield row
+
+    def _iter_skip(self):
+        base = self._ordered_query()
+        offset = self.last if self.last is not None else self.start
+        while self.stop is None or offset < self.stop:
+            top = self.page_size
+            if self.stop is not None:
+                top = min(top, self.stop - offset)
+
+            # pages share the compiled options of the base query
+            q = base._new_query({"$skip": offset, "$top": top})
+            rows = list(q)
+            if not rows:
+                break
+
+            # the service may cap the page size, so only an empty page ends it
+            for row in rows:
+                offset += 1
+                self.last = offset
+                yield row
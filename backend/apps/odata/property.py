@@ -271,6 +271,11 @@ class PropertyBase(object):
         value = self.escape_value(value)
         return ParameterizedQueryFilter(self.name, "contains", value)
 
+    def in_(self, values):
+        """Is one of the values (OData 4.01 ``in`` operator)"""
+        escaped = ",".join(str(self.escape_value(value)) for value in values)
+        return SimpleQueryFilter(self.name, "in", f"({escaped})")
+
     def lacks(self, value):
         """Does not contain"""
         value = self.escape_value(value)
@@ -18,6 +18,10 @@ given directives:
     >>> query.filter(Order.Name == 'Foo')
     <Query for <Order>>
 
+Query objects are immutable. Derived queries share the unchanged options of
+their parent and the compiled query strings of those options, so building
+many similar queries (like the pages of a partition) is cheap.
+
 This makes object chaining possible:
 
 .. code-block:: python
@@ -37,6 +41,15 @@ Navigation properties (one level deep) can be loaded in the same request with
     >>> query.expand(Order.Shipper, Order.Customer)
     >>> order = query.first()
 
+Navigation properties of many entities can be loaded in bulk with
+:py:func:`~Query.prefetch`, one request per page of results (or per chunk of
+keys) instead of one request per entity:
+
+.. code-block:: python
+
+    >>> for order in query.prefetch(Order.Details):
+    ...     order.Details  # no request here
+
 Geting navigation properties multiple layers deep is performed by just referencing those inner members.
 
 .. code-block:: python
@@ -44,15 +57,38 @@ Geting navigation properties multiple layers deep is performed by just referenci
     >>> query.filter((OrderDetails.Order.Employee.HomePhone.contains("555"))
     >>> details = query.first()
 
+Large queries can be split into partitions and read in parallel with
+:py:func:`~Query.partitions`:
+
+.. code-block:: python
+
+    >>> for partition in query.partitions(4, key=Order.OrderID):
+    ...     executor.submit(list, partition)
+
+Bulk exports can skip Entity objects and decode every page into typed columns
+(NumPy arrays or Arrow record batches) with :py:func:`~Query.columns`:
+
+.. code-block:: python
+
+    >>> for page in query.select(Order.OrderID, Order.Freight).columns("numpy"):
+    ...     page["Freight"].sum()
+
 
 ----
 
 API
 ---
 """
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from urllib.parse import urlencode, quote
 from typing import TypeVar, Generic
 
+from odata.columnar import ColumnarDecoder
 from odata.property import CompoundQueryFilter
+from odata.partition import QueryPartition
 
 try:
     # noinspection PyUnresolvedReferences
@@ -73,40 +109,111 @@ class Query(Generic[Q]):
     :py:class:`~odata.service.ODataService` object.
     """
 
+    log = logging.getLogger("odata.query")
+
+    # options holding several values, stored as tuples
+    list_options = ("$select", "$filter", "$expand", "$orderby", "prefetch")
+
     def __init__(
         self, entitycls: Q, connection=None, options=None, compound_expand=True
     ):
         self.entity: Q = entitycls
-        self.options = options or dict()
+        self.options = {
+            name: tuple(value) if isinstance(value, list) else value
+            for name, value in (options or dict()).items()
+        }
         self.connection = connection
         self.compound_expand = compound_expand
+        # [compiled, url encoded] strings of list options. The cells are
+        # shared with derived queries keeping the option, whichever query
+        # compiles it first fills it for all of them
+        self._fragments = {name: [None, None] for name in self.list_options}
+        self._compiled_options = None
+        self._query_string = None
 
     def __iter__(self) -> Q:
         url = self._get_url()
         options = self._get_options()
-        # print("----------- ooptions", options)
-        while True:
-            data = self.connection.execute_get(url, options)
-            if "value" in data:
-                value = data.get("value", [])
-                for row in value:
-                    yield self._create_model(row)
-
-                if (
-                    "@odata.nextLink" in data and "$top" not in options.keys()
-                ):  # do not load next page on userpaging:
-                    url = urljoin(
-                        self.entity.__odata_url_base__, data["@odata.nextLink"]
-                    )
-                    options = {}  # we get all options in the nextLink url
-                else:
-                    break
-            elif self.entity.__odata_singleton__:
+        data = self.connection.execute_get(url, self._get_query_string())
+        yield from self._iter_data(data, options)
+
+    def _iter_data(self, data, options):
+        """
+        Create models from an already fetched response, then load the next
+        pages if there are any
+        """
+        if "value" not in data:
+            if self.entity.__odata_singleton__:
                 yield self._create_model(data)
-                break
+            return
+
+        for page in self._iter_pages(data, options):
+            rows = [self._create_model(row) for row in page]
+            if self.options.get("prefetch"):
+                self._prefetch_rows(rows)
+            yield from rows
+
+    def _iter_pages(self, data, options):
+        """
+        Yield the raw ``value`` arrays of an already fetched response and of
+        the next pages if there are any
+        """
+        while "value" in data:
+            yield data.get("value", [])
+
+            if (
+                "@odata.nextLink" in data and "$top" not in options.keys()
+            ):  # do not load next page on userpaging:
+                url = urljoin(self.entity.__odata_url_base__, data["@odata.nextLink"])
+                options = {}  # we get all options in the nextLink url
+                data = self.connection.execute_get(url, options)
             else:
                 break
 
+    def _prefetch_rows(self, rows):
+        """
+        Fill navigation caches of a page of Entities with related entities
+        fetched in bulk
+        """
+        if rows and isinstance(rows[0], dict):
+            raise exc.ODataQueryError(
+                "Cannot prefetch navigation properties with $select"
+            )
+
+        for prefetch in self.options["prefetch"]:
+            nav, parent_key, related_key = prefetch[:3]
+            chunk_size, max_workers, max_filter_length = prefetch[3:]
+
+            values = []
+            for row in rows:
+                raw_value = row.__odata__[parent_key.name]
+                if raw_value is not None:
+                    values.append(parent_key.deserialize(raw_value))
+            values = list(dict.fromkeys(values))
+
+            related = {}
+            if values:
+                q = Query(nav.entitycls, connection=self.connection)
+                for related_row in q._fetch_by_values(
+                    related_key, values, chunk_size, max_workers, max_filter_length
+                ):
+                    value = related_key.deserialize(
+                        related_row.__odata__[related_key.name]
+                    )
+                    related.setdefault(value, []).append(related_row)
+
+            for row in rows:
+                raw_value = row.__odata__[parent_key.name]
+                matches = []
+                if raw_value is not None:
+                    matches = related.get(parent_key.deserialize(raw_value), [])
+
+                cache = nav._get_parent_cache(row)
+                if nav.is_collection:
+                    cache["collection"] = list(matches)
+                else:
+                    cache["single"] = matches[0] if matches else None
+
     def __repr__(self):
         return "<Query for {0}>".format(self.entity)
 
@@ -118,12 +225,48 @@ class Query(Generic[Q]):
 
     def _get_options(self):
         """
-        Format current query options to a dict that can be passed to requests
+        Format current query options to a dict that can be passed to requests.
+        Compiled once, the query is immutable
+
         :return: Dictionary
         """
-        options = dict()
+        if self._compiled_options is None:
+            self._compiled_options = self._compile_options()
+        return dict(self._compiled_options)
+
+    def _get_query_string(self) -> str:
+        """
+        :return: Url encoded query options, compiled once
+        """
+        if self._query_string is None:
+            parts = []
+            for name, value in self._get_options().items():
+                if name not in self.list_options:
+                    parts.append(urlencode({name: value}, quote_via=quote))
+                    continue
+                cell = self._fragments[name]
+                if cell[1] is None:
+                    cell[1] = urlencode({name: value}, quote_via=quote)
+                parts.append(cell[1])
+            self._query_string = "&".join(parts)
+        return self._query_string
+
+    def _fragment(self, name):
+        """
+        Compiled string of a list option, cached and shared with derived
+        queries that do not change the option
+        """
+        cell = self._fragments[name]
+        if cell[0] is None:
+            values = self.options.get(name)
+            if name == "$filter":
+                cell[0] = " and ".join([f"({str(x)})" for x in values])
+            else:
+                cell[0] = ",".join([str(x) for x in values])
+        return cell[0]
 
-        # print("self.options = ", self.options)
+    def _compile_options(self) -> dict:
+        options = dict()
 
         _top = self.options.get("$top")
         if _top is not None:
@@ -137,21 +280,9 @@ class Query(Generic[Q]):
         if _apply is not None:
             options["$apply"] = _apply
 
-        _select = self.options.get("$select")
-        if _select:
-            options["$select"] = ",".join(_select)
-
-        _filters = self.options.get("$filter")
-        if _filters:
-            options["$filter"] = " and ".join([f"({str(x)})" for x in _filters])
-
-        _expand = self.options.get("$expand")
-        if _expand:
-            options["$expand"] = ",".join(_expand)
-
-        _order_by = self.options.get("$orderby")
-        if _order_by:
-            options["$orderby"] = ",".join([str(x) for x in _order_by])
+        for name in ("$select", "$filter", "$expand", "$orderby"):
+            if self.options.get(name):
+                options[name] = self._fragment(name)
 
         _skiptoken = self.options.get("$skiptoken")
         if _skiptoken:
@@ -166,13 +297,11 @@ class Query(Generic[Q]):
             e = self.entity.__new__(
                 self.entity, from_data=row, connection=self.connection
             )
+            identity_map = self.connection.identity_map
+            if identity_map is not None:
+                e = identity_map.merge(e)
             return e
 
-    def _get_or_create_option(self, name) -> list:
-        if name not in self.options:
-            self.options[name] = []
-        return self.options[name]
-
     def _format_params(self, options) -> str:
         return "&".join(
             [
@@ -182,23 +311,38 @@ class Query(Generic[Q]):
             ]
         )
 
-    def _new_query(self) -> "Query[Q]":
+    def _new_query(self, options: dict = None) -> "Query[Q]":
         """
-        Create copy of this query without mutable values. All query builders
-        should use this first.
+        Create a new query with the given options replaced. Option values are
+        immutable, so the unchanged ones are shared with this query together
+        with their compiled strings. All query builders should use this.
 
+        :param options: Option values to replace
         :return: Query instance
         """
+        options = options or dict()
         o = dict()
         o["$skiptoken"] = self.options.get("$skiptoken", None)
         o["$top"] = self.options.get("$top", None)
         o["$skip"] = self.options.get("$skip", None)
         o["$apply"] = self.options.get("$apply", None)
-        o["$select"] = self.options.get("$select", [])[:]
-        o["$filter"] = self.options.get("$filter", [])[:]
-        o["$expand"] = self.options.get("$expand", [])[:]
-        o["$orderby"] = self.options.get("$orderby", [])[:]
-        return self.__class__[Q](self.entity, options=o, connection=self.connection)
+        for name in self.list_options:
+            o[name] = self.options.get(name, ())
+        o.update(options)
+
+        q = self.__class__[Q](
+            self.entity,
+            options=o,
+            connection=self.connection,
+            compound_expand=self.compound_expand,
+        )
+        for name in self.list_options:
+            if name not in options:
+                q._fragments[name] = self._fragments[name]
+        return q
+
+    def _append_options(self, name, values) -> "Query[Q]":
+        return self._new_query({name: self.options.get(name, ()) + tuple(values)})
 
     def as_string(self) -> str:
         query = self._format_params(self._get_options())
@@ -212,11 +356,7 @@ class Query(Generic[Q]):
 
         :return: Raw JSON values for given properties
         """
-        q = self._new_query()
-        option = q._get_or_create_option("$select")
-        for prop in values:
-            option.append(prop.name)
-        return q
+        return self._append_options("$select", [prop.name for prop in values])
 
     def filter(self, value) -> "Query[Q]":
         """
@@ -226,9 +366,11 @@ class Query(Generic[Q]):
         :param value: Property comparison. For example, ``Entity.Property == 2``
         :return: Query instance
         """
-        q = self._new_query()
-        option = q._get_or_create_option("$filter")
-        option.append(value)
+        q = self._append_options("$filter", [value])
+        fragment = self._fragments["$filter"][0]
+        if fragment:
+            # extend the compiled filter instead of compiling it again
+            q._fragments["$filter"][0] = f"{fragment} and ({str(value)})"
         return q
 
     def __compound_expand_name(self, name):
@@ -250,11 +392,45 @@ class Query(Generic[Q]):
         :param values: ``Entity.Property`` instance
         :return: Query instance
         """
+        names = [self.__compound_expand_name(prop.name) for prop in values]
+        return self._append_options("$expand", names)
+
+    def prefetch(
+        self, *values, chunk_size=100, max_workers=4, max_filter_length=2000
+    ) -> "Query[Q]":
+        """
+        Load navigation properties for every page of results at once, instead
+        of one request per Entity when the property is first accessed. Related
+        entities are fetched from their own EntitySet with ``key in (...)``
+        filters. Relationships without a referential constraint are loaded
+        with ``$expand`` instead
+
+        :param values: ``Entity.NavigationProperty`` instance
+        :param chunk_size: Maximum number of keys in one request
+        :param max_workers: Number of chunks requested at the same time
+        :param max_filter_length: Maximum length of the key filter
+        :return: Query instance
+        """
         q = self._new_query()
-        option = q._get_or_create_option("$expand")
-        for prop in values:
-            name = self.__compound_expand_name(prop.name)
-            option.append(name)
+        for nav in values:
+            keys = nav.prefetch_keys(self.entity)
+            if keys is None:
+                q = q.expand(nav)
+                continue
+            parent_key, related_key = keys
+            q = q._append_options(
+                "prefetch",
+                [
+                    (
+                        nav,
+                        parent_key,
+                        related_key,
+                        chunk_size,
+                        max_workers,
+                        max_filter_length,
+                    )
+                ],
+            )
         return q
 
     def order_by(self, *values) -> "Query[Q]":
@@ -264,10 +440,7 @@ class Query(Generic[Q]):
         :param values: One of more of Property.asc() or Property.desc()
         :return: Query instance
         """
-        q = self._new_query()
-        option = q._get_or_create_option("$orderby")
-        option.extend(values)
-        return q
+        return self._append_options("$orderby", values)
 
     def limit(self, value) -> "Query[Q]":
         """
@@ -276,9 +449,7 @@ class Query(Generic[Q]):
         :param value: Number of records to return
         :return: Query instance
         """
-        q = self._new_query()
-        q.options["$top"] = value
-        return q
+        return self._new_query({"$top": value})
 
     def offset(self, value) -> "Query[Q]":
         """
@@ -287,9 +458,7 @@ class Query(Generic[Q]):
         :param value: Number of records to skip
         :return: Query instance
         """
-        q = self._new_query()
-        q.options["$skip"] = value
-        return q
+        return self._new_query({"$skip": value})
 
     def apply(self, value) -> "Query[Q]":
         """
@@ -298,9 +467,7 @@ class Query(Generic[Q]):
         :param values: Apply string
         :return: Query instance
         """
-        q = self._new_query()
-        q.options["$apply"] = value
-        return q
+        return self._new_query({"$apply": value})
 
     def skiptoken(self, value) -> "Query[Q]":
         """
@@ -309,9 +476,7 @@ class Query(Generic[Q]):
         :param values: Apply string
         :return: Query instance
         """
-        q = self._new_query()
-        self.options["$skiptoken"] = value
-        return q
+        return self._new_query({"$skiptoken": value})
 
     @staticmethod
     def and_(value1, value2) -> CompoundQueryFilter:
@@ -337,16 +502,47 @@ class Query(Generic[Q]):
         """
         return list(iter(self))
 
+    def columns(self, backend="python", decimal="float"):
+        """
+        Iterate the results page by page, decoded into typed columns instead
+        of Entity instances. See :py:mod:`odata.columnar`
+
+        :param backend: ``python`` (default), ``numpy`` or ``arrow``
+        :param decimal: ``float`` or ``decimal``, type of ``Edm.Decimal`` columns
+        :return: Generator of pages, one per response
+        :raises ImportError: NumPy or PyArrow is required by the backend but not installed
+        """
+        if self.options.get("$expand") or self.options.get("prefetch"):
+            raise exc.ODataQueryError(
+                "Cannot decode columns of expanded navigation properties"
+            )
+        decoder = ColumnarDecoder(
+            self.entity,
+            names=list(self.options.get("$select") or ()) or None,
+            backend=backend,
+            decimal=decimal,
+        )
+        return (decoder.decode(page) for page in self.pages())
+
+    def pages(self):
+        """
+        Iterate the results page by page as raw JSON rows (the ``value``
+        array of every response), without creating Entity instances. Useful
+        to hand pages over to other processes
+
+        :return: Generator of lists of dicts, one per response
+        """
+        options = self._get_options()
+        data = self.connection.execute_get(self._get_url(), self._get_query_string())
+        yield from self._iter_pages(data, options)
+
     def first(self) -> Q:
         """
         Return the first Entity instance that matches current query
 
         :return: Entity instance or None
         """
-        oldvalue = self.options.get("$top", None)
-        self.options["$top"] = 1
-        data = list(iter(self))
-        self.options["$top"] = oldvalue
+        data = list(iter(self._new_query({"$top": 1})))
         if data:
             return data[0]
 
@@ -358,12 +554,8 @@ class Query(Generic[Q]):
         :raises NoResultsFound: Zero results returned
         :raises MultipleResultsFound: Multiple results returned
         """
-        oldlimit = self.options.get("$top", None)
+        data = self._new_query({"$top": 1}).all()
 
-        self.options["$top"] = 1
-        data = self.all()
-
-        self.options["$top"] = oldlimit
         if len(data) == 0:
             raise exc.NoResultsFound()
         if len(data) > 1:
@@ -391,8 +583,6 @@ class Query(Generic[Q]):
         i = self.entity.__new__(self.entity)
         es = i.__odata__
 
-        oldfilters = self._get_or_create_option("$filter")
-
         tempfilters = []
 
         if pk:
@@ -403,14 +593,241 @@ class Query(Generic[Q]):
             for _, prop in es.primary_key_properties:
                 tempfilters.append(prop == composite_keys[prop.name])
 
-        self.options["$filter"] = tempfilters
-        data = list(iter(self))
+        data = list(iter(self._new_query({"$filter": tuple(tempfilters)})))
 
-        self.options["$filter"] = oldfilters
         if len(data) > 0:
             return data[0]
         raise exc.NoResultsFound()
 
+    def get_many(
+        self, keys, chunk_size=100, max_workers=4, max_filter_length=2000
+    ) -> dict:
+        """
+        Return Entities with the given primary keys. Keys are fetched in
+        chunks with ``PK in (...)`` filters, chunks are requested concurrently.
+        Services that do not support the ``in`` operator get ``or`` chains
+
+        .. code-block:: python
+
+            >>> query.get_many([1234, 1235, 1236])
+            {1234: <Entity(Order(1234))>, 1236: <Entity(Order(1236))>}
+
+        :param keys: Primary key values
+        :param chunk_size: Maximum number of keys in one request
+        :param max_workers: Number of chunks requested at the same time
+        :param max_filter_length: Maximum length of the key filter, keeps URLs under server limits
+        :return: Dictionary of Entity instances (raw values with ``$select``) by primary key. Keys that were not found are missing
+        """
+        es = self.entity.__new__(self.entity).__odata__
+        if len(es.primary_key_properties) != 1:
+            raise exc.ODataQueryError(
+                "get_many supports entities with a single primary key only"
+            )
+        prop = es.primary_key_properties[0][1]
+
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        results = {}
+        for row in self._fetch_by_values(
+            prop, keys, chunk_size, max_workers, max_filter_length
+        ):
+            results[prop.deserialize(self._row_value(row, prop))] = row
+        return results
+
+    def _fetch_by_values(
+        self, prop, values, chunk_size, max_workers, max_filter_length
+    ) -> list:
+        """
+        Fetch rows whose property matches one of the values, in chunks
+        """
+        rows = []
+        use_in = True
+        chunks = self._chunk_keys(prop, values, chunk_size, max_filter_length, use_in)
+        try:
+            rows += self._get_chunk(prop, chunks[0], use_in)
+        except exc.ODataConnectionError:
+            raise
+        except exc.ODataError:
+            self.log.info("Service rejected 'in' filter, using 'or'")
+            use_in = False
+            chunks = self._chunk_keys(
+                prop, values, chunk_size, max_filter_length, use_in
+            )
+            rows += self._get_chunk(prop, chunks[0], use_in)
+
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for chunk_rows in pool.map(
+                    lambda chunk: self._get_chunk(prop, chunk, use_in), chunks[1:]
+                ):
+                    rows += chunk_rows
+        return rows
+
+    def _key_filter(self, prop, keys, use_in):
+        if use_in:
+            return prop.in_(keys)
+        return " or ".join(str(prop == key) for key in keys)
+
+    def _chunk_keys(self, prop, keys, chunk_size, max_filter_length, use_in) -> list:
+        """
+        Split keys into chunks limited by count and by the length of their filter
+        """
+        if use_in:
+            overhead, per_key = len(prop.name) + 6, 1
+        else:
+            overhead, per_key = 0, len(prop.name) + 8
+
+        chunks = []
+        chunk = []
+        length = overhead
+        for key in keys:
+            key_length = len(str(prop.escape_value(key))) + per_key
+            if chunk and (
+                len(chunk) >= chunk_size or length + key_length > max_filter_length
+            ):
+                chunks.append(chunk)
+                chunk = []
+                length = overhead
+            chunk.append(key)
+            length += key_length
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _get_chunk(self, prop, keys, use_in) -> list:
+        q = self.filter(self._key_filter(prop, keys, use_in))
+        select = q.options.get("$select")
+        if select and prop.name not in select:
+            q = q.select(prop)
+        return list(q)
+
+    @staticmethod
+    def _row_value(row, prop):
+        if isinstance(row, dict):
+            return row.get(prop.name)
+        return row.__odata__[prop.name]
+
+    def partitions(
+        self, count, key=None, strategy="range", page_size=1000
+    ) -> list[QueryPartition]:
+        """
+        Split this query into independent partitions which can be iterated
+        in parallel. See :py:mod:`odata.partition`
+
+        Range partitions need an orderable ``key`` property. Boundaries of
+        Integer, Decimal and Datetime keys are interpolated between the
+        smallest and the largest key (two requests), other keys are split on
+        quantiles probed with ``$count`` and ``$skip``. Skip partitions split
+        ``$count`` rows into equal ``$skip`` windows, ordered by ``key`` if
+        given. Fewer partitions are returned when the key range is too
+        small to split.
+
+        :param count: Number of partitions
+        :param key: Property to partition and order by, e.g. ``Entity.Id``
+        :param strategy: ``range`` or ``skip``
+        :param page_size: Rows requested at once by skip partitions
+        :return: A list of :py:class:`~odata.partition.QueryPartition`
+        """
+        if count < 1:
+            raise exc.ODataQueryError("Partition count must be positive")
+        if self.options.get("$top") is not None or self.options.get("$skip"):
+            raise exc.ODataQueryError("Cannot partition a query with $top or $skip")
+
+        if strategy == "skip":
+            total = self.count()
+            size = -(-total // count) if total else 0
+            partitions = []
+            for index in range(count):
+                start = index * size
+                stop = None if index == count - 1 else start + size
+                partitions.append(
+                    QueryPartition(
+                        self,
+                        index=index,
+                        strategy=strategy,
+                        key=key,
+                        start=start,
+                        stop=stop,
+                        page_size=page_size,
+                    )
+                )
+            return partitions
+
+        if key is None:
+            raise exc.ODataQueryError("Range partitions require a key property")
+
+        boundaries = self._partition_boundaries(key, count)
+        lowers = [None] + boundaries
+        uppers = boundaries + [None]
+        return [
+            QueryPartition(
+                self,
+                index=index,
+                strategy=strategy,
+                key=key,
+                lower=key.serialize(lower) if lower is not None else None,
+                upper=key.serialize(upper) if upper is not None else None,
+                page_size=page_size,
+            )
+            for index, (lower, upper) in enumerate(zip(lowers, uppers))
+        ]
+
+    def partition(self, token: dict) -> QueryPartition:
+        """
+        Rebuild a partition from its resume token, for example in another
+        process. Iteration continues after the last row the token recorded
+
+        :param token: :py:attr:`~odata.partition.QueryPartition.token` value
+        :return: :py:class:`~odata.partition.QueryPartition` instance
+        """
+        options = dict(token)
+        key_name = options.pop("key", None)
+        key = getattr(self.entity, key_name) if key_name else None
+        return QueryPartition(self, key=key, **options)
+
+    def _probe_key(self, key, descending=False, offset=None):
+        """
+        Fetch a single key value of the ordered query
+        """
+        q = self._new_query(
+            {
+                "$select": (key.name,),
+                "$orderby": (key.desc() if descending else key.asc(),),
+                "$skip": offset,
+                "$top": 1,
+            }
+        )
+        for row in q:
+            return key.deserialize(row.get(key.name))
+
+    def _partition_boundaries(self, key, count) -> list:
+        """
+        Sorted unique key values splitting the query into ``count`` ranges
+        """
+        lowest = self._probe_key(key)
+        highest = self._probe_key(key, descending=True)
+        if lowest is None or highest is None or lowest == highest:
+            return []
+
+        boundaries = []
+        if isinstance(lowest, int) and not isinstance(lowest, bool):
+            span = highest - lowest + 1
+            boundaries = [lowest + span * i // count for i in range(1, count)]
+        elif isinstance(lowest, (Decimal, datetime.datetime)):
+            span = highest - lowest
+            boundaries = [lowest + span * i / count for i in range(1, count)]
+        else:
+            total = self.count()
+            for i in range(1, count):
+                value = self._probe_key(key, offset=total * i // count)
+                if value is not None:
+                    boundaries.append(value)
+
+        boundaries = sorted(set(boundaries))
+        return [value for value in boundaries if lowest < value <= highest]
+
     def raw(self, query_params) -> dict:
         """
         Execute a query with custom parameters. Allows queries that
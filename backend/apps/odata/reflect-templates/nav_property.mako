@@ -13,4 +13,10 @@
   % if nav_property.foreign_key:
 , foreign_key=${nav_property.foreign_key}\
   % endif
+  % if nav_property.partner:
+, partner="${nav_property.partner}"\
+  % endif
+  % if nav_property.referenced_key:
+, referenced_key="${nav_property.referenced_key}"\
+  % endif
 )
\ No newline at end of file
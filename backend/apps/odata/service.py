@@ -90,6 +90,7 @@ class ODataService(object):
     :param auth: Custom Requests auth object to use for credentials
     :param console: Rich console instance to use for messages. If set to None a new console will be created. Console will inherit quiet flag from quiet_progress.
     :param quiet_progress: Don't show any progress information while reflecting metadata and while other long duration tasks are running. Default is to show progress
+    :param response_cache: :py:class:`~odata.cache.ResponseCache` for GET responses of slowly changing EntitySets
     :raises ODataConnectionError: Fetching metadata failed. Server returned an HTTP error code
     """
 
@@ -104,6 +105,7 @@ class ODataService(object):
         auth=None,
         console: rich.console.Console = None,
         quiet_progress: bool = False,
+        response_cache=None,
     ):
         self.url = (
             url if url.endswith("/") else url + "/"
@@ -112,7 +114,10 @@ class ODataService(object):
         self.collections = {}
         self.log = logging.getLogger("odata.service")
         self.default_context = Context(
-            auth=auth, session=session, extra_headers=extra_headers
+            auth=auth,
+            session=session,
+            extra_headers=extra_headers,
+            response_cache=response_cache,
         )
         self.console = (
             console
@@ -222,17 +227,35 @@ class ODataService(object):
         )
         outputter.write_reflected_types()
 
-    def create_context(self, auth=None, session=None, extra_headers: dict = None):
+    def create_context(
+        self,
+        auth=None,
+        session=None,
+        extra_headers: dict = None,
+        identity_map=False,
+        identity_map_size=10000,
+        response_cache=None,
+    ):
         """
         Create new context to use for session-like usage
 
         :param auth: Custom Requests auth object to use for credentials
         :param session: Custom Requests session to use for communication with the endpoint
         :param extra_headers: Any extra headers to pass to use for all communications
+        :param identity_map: Share one Entity instance per key, see :py:mod:`odata.identity`
+        :param identity_map_size: Number of recently used entities kept alive by the identity map
+        :param response_cache: :py:class:`~odata.cache.ResponseCache` for GET responses
         :return: Context instance
         :rtype: Context
         """
-        return Context(auth=auth, session=session, extra_headers=extra_headers)
+        return Context(
+            auth=auth,
+            session=session,
+            extra_headers=extra_headers,
+            identity_map=identity_map,
+            identity_map_size=identity_map_size,
+            response_cache=response_cache,
+        )
 
     def describe(self, entity) -> None:
         """
@@ -258,6 +281,53 @@ class ODataService(object):
         """
         return self.default_context.query(entitycls)
 
+    def save_many(self, entities, force_refresh=False, max_workers=8, use_batch=False):
+        """
+        Save many entities concurrently, see :py:func:`~odata.context.Context.save_many`
+
+        :param entities: Model instances to insert or update
+        :param force_refresh: Read full entity data again from service after PATCH calls
+        :param max_workers: Number of writes sent at the same time
+        :param use_batch: Send writes in ``$batch`` requests instead
+        :return: Futures in the order of entities, holding the saved entity or the error
+        """
+        return self.default_context.save_many(
+            entities,
+            force_refresh=force_refresh,
+            max_workers=max_workers,
+            use_batch=use_batch,
+        )
+
+    def delete_many(self, entities, max_workers=8, use_batch=False):
+        """
+        Delete many entities concurrently, see :py:func:`~odata.context.Context.delete_many`
+
+        :param entities: Model instances to delete
+        :param max_workers: Number of deletes sent at the same time
+        :param use_batch: Send deletes in ``$batch`` requests instead
+        :return: Futures in the order of entities, holding None or the error
+        """
+        return self.default_context.delete_many(
+            entities, max_workers=max_workers, use_batch=use_batch
+        )
+
+    def batch(self, format="json", atomic=False, max_size=None):
+        """
+        Start a batch of queries, writes and calls sent in one ``$batch``
+        request, see :py:mod:`odata.batch`
+
+        :param format: ``json`` (OData 4.01) or ``multipart`` (OData 4.0)
+        :param atomic: Send all writes in one change set
+        :param max_size: Maximum number of operations in one ``$batch`` request, ignored when atomic
+        :return: Batch instance
+        """
+        return self.default_context.batch(
+            url=urllib.parse.urljoin(self.url, "$batch"),
+            format=format,
+            atomic=atomic,
+            max_size=max_size,
+        )
+
     def delete(self, entity):
         """
         Creates a DELETE call to the service, deleting the entity
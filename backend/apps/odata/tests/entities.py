@@ -0,0 +1,38 @@
+"""
+Entity classes of a service which is never connected, shared by the tests
+"""
+
+from odata.navproperty import NavigationProperty
+from odata.property import (
+    DatetimeProperty,
+    DecimalProperty,
+    IntegerProperty,
+    StringProperty,
+)
+from odata.service import ODataService
+
+Service = ODataService(
+    "http://odata.example.com/", reflect_entities=False, quiet_progress=True
+)
+
+
+class Office(Service.Entity):
+    __odata_type__ = "Example.Office"
+    __odata_collection__ = "Office"
+
+    OfficeKey = IntegerProperty("OfficeKey", primary_key=True)
+    OfficeName = StringProperty("OfficeName")
+
+
+class Member(Service.Entity):
+    __odata_type__ = "Example.Member"
+    __odata_collection__ = "Member"
+
+    MemberKey = IntegerProperty("MemberKey", primary_key=True)
+    MemberFullName = StringProperty("MemberFullName")
+    OfficeKey = IntegerProperty("OfficeKey")
+    ModificationTimestamp = DatetimeProperty("ModificationTimestamp")
+    Commission = DecimalProperty("Commission")
+    Office = NavigationProperty(
+        "Office", Office, foreign_key="OfficeKey", referenced_key="OfficeKey"
+    )
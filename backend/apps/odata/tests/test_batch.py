@@ -0,0 +1,267 @@
+import json
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from odata.batch import BatchOperation
+from odata.exceptions import ODataError
+from odata.tests.entities import Member, Service
+
+
+def make_response(content, content_type="application/json"):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = content_type
+    response._content = content if isinstance(content, bytes) else content.encode()
+    return response
+
+
+class JsonBatchTestCase(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(Service.default_context.connection, "execute_batch")
+        self.execute_batch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_and_responses(self):
+        self.execute_batch.return_value = make_response(
+            json.dumps(
+                {
+                    "responses": [
+                        {
+                            "id": "2",
+                            "status": 404,
+                            "body": {"error": {"code": "404", "message": "Not found"}},
+                        },
+                        {
+                            "id": "1",
+                            "status": 200,
+                            "body": {
+                                "value": [{"MemberKey": 1, "MemberFullName": "A"}]
+                            },
+                        },
+                    ]
+                }
+            )
+        )
+        query = Service.query(Member).filter(Member.MemberKey == 1)
+        with Service.batch() as batch:
+            members = batch.query(query)
+            office = batch.get("http://odata.example.com/Office(3)")
+            with self.assertRaises(ODataError):
+                members.result()
+
+        url, data, content_type = self.execute_batch.call_args.args
+        self.assertEqual(url, "http://odata.example.com/$batch")
+        self.assertEqual(content_type, "application/json")
+        self.assertEqual(
+            [
+                (item["id"], item["method"], item["url"])
+                for item in json.loads(data)["requests"]
+            ],
+            [
+                ("1", "GET", "Member?%24filter=%28MemberKey%20eq%201%29"),
+                ("2", "GET", "Office(3)"),
+            ],
+        )
+
+        [member] = members.result()
+        self.assertIsInstance(member, Member)
+        self.assertEqual(member.MemberFullName, "A")
+        self.assertIsInstance(office.exception(), ODataError)
+
+    def test_missing_response(self):
+        self.execute_batch.return_value = make_response('{"responses": []}')
+        with Service.batch() as batch:
+            office = batch.get("http://odata.example.com/Office(3)")
+        self.assertIn("No response", str(office.exception()))
+
+    def test_max_size(self):
+        self.execute_batch.return_value = make_response('{"responses": []}')
+        with Service.batch(max_size=2) as batch:
+            for key in range(5):
+                batch.get(f"http://odata.example.com/Office({key})")
+        self.assertEqual(self.execute_batch.call_count, 3)
+
+    def test_atomic_writes(self):
+        self.execute_batch.return_value = make_response('{"responses": []}')
+        with Service.batch(atomic=True) as batch:
+            batch._queue(
+                BatchOperation(
+                    "POST", "http://odata.example.com/Office", body={}, write=True
+                )
+            )
+            batch.get("http://odata.example.com/Office(3)")
+        items = json.loads(self.execute_batch.call_args.args[1])["requests"]
+        self.assertEqual(items[0]["atomicityGroup"], "changeset")
+        self.assertNotIn("atomicityGroup", items[1])
+
+
+class MultipartBatchTestCase(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(Service.default_context.connection, "execute_batch")
+        self.execute_batch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_encoding_and_parsing(self):
+        response = (
+            "--batchresponse\r\n"
+            "Content-Type: application/http\r\n"
+            "Content-ID: 1\r\n"
+            "\r\n"
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json\r\n"
+            "\r\n"
+            '{"OfficeKey": 3}\r\n'
+            "--batchresponse\r\n"
+            "Content-Type: multipart/mixed; boundary=changesetresponse\r\n"
+            "\r\n"
+            "--changesetresponse\r\n"
+            "Content-Type: application/http\r\n"
+            "Content-ID: 3\r\n"
+            "\r\n"
+            "HTTP/1.1 204 No Content\r\n"
+            "\r\n"
+            "\r\n"
+            "--changesetresponse\r\n"
+            "Content-Type: application/http\r\n"
+            "Content-ID: 2\r\n"
+            "\r\n"
+            "HTTP/1.1 201 Created\r\n"
+            "Content-Type: application/json\r\n"
+            "\r\n"
+            '{"OfficeKey": 4}\r\n'
+            "--changesetresponse--\r\n"
+            "--batchresponse--\r\n"
+        )
+        self.execute_batch.return_value = make_response(
+            response, "multipart/mixed; boundary=batchresponse"
+        )
+
+        batch = Service.batch(format="multipart", atomic=True)
+        operations = [
+            BatchOperation("GET", "http://odata.example.com/Office(3)"),
+            BatchOperation(
+                "POST",
+                "http://odata.example.com/Office",
+                body={"OfficeName": "New"},
+                write=True,
+            ),
+            BatchOperation("DELETE", "http://odata.example.com/Office(5)", write=True),
+        ]
+        for operation in operations:
+            batch._queue(operation)
+        responses = batch._send(operations)
+
+        url, body, content_type = self.execute_batch.call_args.args
+        body = body.decode()
+        boundary = content_type.split("boundary=")[1]
+        self.assertTrue(body.endswith(f"--{boundary}--\r\n"))
+        # the read alone, both writes in one change set
+        self.assertEqual(body.count(f"--{boundary}\r\n"), 2)
+        self.assertEqual(body.count("Content-Type: multipart/mixed; boundary="), 1)
+        self.assertIn("GET Office(3) HTTP/1.1", body)
+        self.assertIn(
+            "POST Office HTTP/1.1\r\nAccept: application/json\r\n"
+            'Content-Type: application/json\r\n\r\n{"OfficeName": "New"}',
+            body,
+        )
+
+        self.assertEqual(
+            [response.status_code for response in responses], [200, 201, 204]
+        )
+        self.assertEqual(responses[0].json(), {"OfficeKey": 3})
+        self.assertEqual(responses[1].json(), {"OfficeKey": 4})
+        self.assertEqual(responses[2].reason, "No Content")
+
+    def test_atomic_writes_around_reads(self):
+        response = (
+            "--batchresponse\r\n"
+            "Content-Type: multipart/mixed; boundary=changesetresponse\r\n"
+            "\r\n"
+            "--changesetresponse\r\n"
+            "Content-Type: application/http\r\n"
+            "Content-ID: 1\r\n"
+            "\r\n"
+            "HTTP/1.1 201 Created\r\n"
+            "Content-Type: application/json\r\n"
+            "\r\n"
+            '{"OfficeKey": 4}\r\n'
+            "--changesetresponse\r\n"
+            "Content-Type: application/http\r\n"
+            "Content-ID: 3\r\n"
+            "\r\n"
+            "HTTP/1.1 204 No Content\r\n"
+            "\r\n"
+            "\r\n"
+            "--changesetresponse--\r\n"
+            "--batchresponse\r\n"
+            "Content-Type: application/http\r\n"
+            "Content-ID: 2\r\n"
+            "\r\n"
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json\r\n"
+            "\r\n"
+            '{"OfficeKey": 3}\r\n'
+            "--batchresponse--\r\n"
+        )
+        self.execute_batch.return_value = make_response(
+            response, "multipart/mixed; boundary=batchresponse"
+        )
+
+        def handler(response):
+            return response.status_code, response.content
+
+        with Service.batch(format="multipart", atomic=True) as batch:
+            operations = [
+                BatchOperation(
+                    "POST",
+                    "http://odata.example.com/Office",
+                    body={"OfficeName": "New"},
+                    handler=handler,
+                    write=True,
+                ),
+                BatchOperation(
+                    "GET", "http://odata.example.com/Office(3)", handler=handler
+                ),
+                BatchOperation(
+                    "DELETE",
+                    "http://odata.example.com/Office(5)",
+                    handler=handler,
+                    write=True,
+                ),
+            ]
+            for operation in operations:
+                batch._queue(operation)
+
+        self.assertEqual(
+            [operation.future.result() for operation in operations],
+            [(201, b'{"OfficeKey": 4}'), (200, b'{"OfficeKey": 3}'), (204, b"")],
+        )
+
+    def test_failed_changeset(self):
+        response = (
+            "--batchresponse\r\n"
+            "Content-Type: application/http\r\n"
+            "\r\n"
+            "HTTP/1.1 400 Bad Request\r\n"
+            "Content-Type: application/json\r\n"
+            "\r\n"
+            '{"error": {"code": "400", "message": "Invalid"}}\r\n'
+            "--batchresponse--\r\n"
+        )
+        self.execute_batch.return_value = make_response(
+            response, "multipart/mixed; boundary=batchresponse"
+        )
+        batch = Service.batch(format="multipart", atomic=True)
+        operations = [
+            BatchOperation("POST", "http://odata.example.com/Office", write=True),
+            BatchOperation("POST", "http://odata.example.com/Office", write=True),
+        ]
+        for operation in operations:
+            batch._queue(operation)
+        responses = batch._send(operations)
+        self.assertEqual([response.status_code for response in responses], [400, 400])
+
+    def test_unknown_format(self):
+        with self.assertRaises(ODataError):
+            Service.batch(format="xml")
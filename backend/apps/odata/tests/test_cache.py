@@ -0,0 +1,126 @@
+import tempfile
+import time
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from odata.cache import CacheEntry, ResponseCache
+from odata.connection import ODataConnection
+from odata.exceptions import ODataError
+
+
+def make_response(status=200, content=b'{"value": []}', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response.headers.update(headers or {})
+    response._content = content
+    return response
+
+
+class ResponseCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = ResponseCache(directory.name, ttls={"Lookup": 60, "Rooms": 10})
+
+    def test_ttl_by_entity_set(self):
+        self.assertEqual(self.cache.ttl_for("http://example.com/odata/Lookup"), 60)
+        self.assertEqual(
+            self.cache.ttl_for("http://example.com/odata/Lookup('Status')"), 60
+        )
+        self.assertEqual(
+            self.cache.ttl_for("http://example.com/odata/Lookup(1)/Rooms"), 10
+        )
+        self.assertIsNone(self.cache.ttl_for("http://example.com/odata/Property"))
+        self.cache.default_ttl = 5
+        self.assertEqual(self.cache.ttl_for("http://example.com/odata/Property"), 5)
+
+    def test_keys(self):
+        url = "http://example.com/odata/Lookup"
+        self.assertEqual(
+            self.cache._path(url, {"$top": 1, "$filter": "a"}),
+            self.cache._path(url, {"$filter": "a", "$top": 1}),
+        )
+        self.assertEqual(
+            self.cache._path(url, {"$top": 1}), self.cache._path(url, "%24top=1")
+        )
+        self.assertNotEqual(
+            self.cache._path(url, {"$top": 1}), self.cache._path(url, {"$top": 2})
+        )
+        self.assertEqual(self.cache._path(url, None), self.cache._path(url, {}))
+
+    def test_store_and_expire(self):
+        url = "http://example.com/odata/Lookup"
+        response = make_response(headers={"ETag": 'W/"1"', "X-Other": "1"})
+        self.cache.set(CacheEntry.from_response(url, {"$top": 1}, response))
+
+        entry = self.cache.get(url, {"$top": 1})
+        self.assertEqual(entry.content, '{"value": []}')
+        self.assertEqual(
+            entry.headers, {"content-type": "application/json", "etag": 'W/"1"'}
+        )
+        self.assertEqual(entry.conditional_headers(), {"If-None-Match": 'W/"1"'})
+        self.assertTrue(self.cache.is_fresh(entry))
+        self.assertIsNone(self.cache.get(url, {"$top": 2}))
+
+        entry.stored_at = time.time() - 61
+        self.assertFalse(self.cache.is_fresh(entry))
+        self.cache.renew(entry)
+        self.assertTrue(self.cache.is_fresh(self.cache.get(url, {"$top": 1})))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(url, {"$top": 1}))
+
+
+class CachedConnectionTestCase(SimpleTestCase):
+    url = "http://example.com/odata/Lookup"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = ResponseCache(directory.name, ttls={"Lookup": 60})
+        self.connection = ODataConnection()
+        self.connection.response_cache = self.cache
+        patcher = mock.patch.object(self.connection, "_do_get")
+        self.do_get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fresh_entry_without_request(self):
+        self.do_get.return_value = make_response(content=b'{"value": [1]}')
+        self.assertEqual(self.connection.execute_get(self.url), {"value": [1]})
+        self.assertEqual(self.connection.execute_get(self.url), {"value": [1]})
+        self.assertEqual(self.do_get.call_count, 1)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+
+    def test_revalidation(self):
+        self.do_get.return_value = make_response(
+            content=b'{"value": [1]}', headers={"ETag": '"1"'}
+        )
+        self.connection.execute_get(self.url)
+        entry = self.cache.get(self.url)
+        entry.stored_at -= 120
+        self.cache.set(entry)
+
+        self.do_get.return_value = make_response(status=304, content=b"")
+        self.assertEqual(self.connection.execute_get(self.url), {"value": [1]})
+        self.assertEqual(
+            self.do_get.call_args.kwargs["headers"]["If-None-Match"], '"1"'
+        )
+        self.assertEqual(self.cache.revalidated, 1)
+        self.assertTrue(self.cache.is_fresh(self.cache.get(self.url)))
+
+    def test_not_cached_entity_set(self):
+        self.do_get.return_value = make_response()
+        url = "http://example.com/odata/Property"
+        self.connection.execute_get(url)
+        self.connection.execute_get(url)
+        self.assertEqual(self.do_get.call_count, 2)
+        self.assertIsNone(self.cache.get(url))
+
+    def test_errors_are_not_cached(self):
+        self.do_get.return_value = make_response(status=500, content=b"{}")
+        with self.assertRaises(ODataError):
+            self.connection.execute_get(self.url)
+        self.assertIsNone(self.cache.get(self.url))
@@ -0,0 +1,164 @@
+import datetime
+import importlib.util
+import sys
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+from odata.columnar import ColumnarDecoder
+from odata.tests.entities import Member
+
+ROWS = [
+    {
+        "MemberKey": 1,
+        "MemberFullName": "A",
+        "OfficeKey": 3,
+        "Commission": 2.5,
+        "ModificationTimestamp": "2024-01-02T03:04:05Z",
+    },
+    {"MemberKey": 2, "OfficeKey": None},
+]
+
+
+class ColumnarDecoderTestCase(SimpleTestCase):
+    def test_kinds_from_property_classes(self):
+        decoder = ColumnarDecoder(Member)
+        self.assertEqual(decoder.backend, "python")
+        self.assertEqual(
+            decoder.columns,
+            [
+                ("Commission", "decimal", False),
+                ("MemberFullName", "string", False),
+                ("MemberKey", "int", False),
+                ("ModificationTimestamp", "datetime", False),
+                ("OfficeKey", "int", False),
+            ],
+        )
+
+    def test_kinds_from_schema_types(self):
+        schema = {
+            "properties": [
+                {"name": "MemberKey", "type": "Edm.String"},
+                {"name": "OfficeKey", "type": "Edm.Double"},
+            ]
+        }
+        with mock.patch.object(Member, "__odata_schema__", schema):
+            decoder = ColumnarDecoder(Member, names=["MemberKey", "OfficeKey"])
+        self.assertEqual(
+            decoder.columns,
+            [("MemberKey", "string", False), ("OfficeKey", "float", False)],
+        )
+
+    def test_decode_python(self):
+        decoder = ColumnarDecoder(
+            Member, names=["MemberKey", "ModificationTimestamp", "Commission"]
+        )
+        page = decoder.decode(
+            [
+                {
+                    "MemberKey": 1,
+                    "ModificationTimestamp": "2024-01-02T03:04:05Z",
+                    "Commission": 2.5,
+                },
+                {"MemberKey": 2},
+            ]
+        )
+        self.assertEqual(page["MemberKey"], [1, 2])
+        self.assertEqual(
+            page["ModificationTimestamp"],
+            [
+                datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+                None,
+            ],
+        )
+        self.assertEqual(page["Commission"], [2.5, None])
+
+    def test_decode_exact_decimals(self):
+        decoder = ColumnarDecoder(Member, names=["Commission"], decimal="decimal")
+        page = decoder.decode([{"Commission": 2.15}])
+        self.assertEqual(page["Commission"], [Decimal("2.15")])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            ColumnarDecoder(Member, backend="pandas")
+
+    def test_missing_optional_dependency(self):
+        with mock.patch.dict(sys.modules, {"pyarrow": None}):
+            with self.assertRaisesRegex(ImportError, "requires pyarrow"):
+                ColumnarDecoder(Member, backend="arrow")
+
+
+@skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+class NumpyColumnsTestCase(SimpleTestCase):
+    def test_decode(self):
+        import numpy as np
+
+        page = ColumnarDecoder(Member, backend="numpy").decode(ROWS)
+
+        self.assertEqual(page["MemberKey"].dtype, np.int64)
+        self.assertNotIsInstance(page["MemberKey"], np.ma.MaskedArray)
+        self.assertEqual(page["MemberKey"].tolist(), [1, 2])
+
+        self.assertIsInstance(page["OfficeKey"], np.ma.MaskedArray)
+        self.assertEqual(page["OfficeKey"].mask.tolist(), [False, True])
+        self.assertEqual(page["OfficeKey"][0], 3)
+
+        self.assertEqual(page["Commission"].dtype, np.float64)
+        self.assertEqual(page["Commission"][0], 2.5)
+        self.assertTrue(np.isnan(page["Commission"][1]))
+
+        self.assertEqual(
+            page["ModificationTimestamp"].dtype, np.dtype("datetime64[us]")
+        )
+        self.assertEqual(
+            page["ModificationTimestamp"][0],
+            np.datetime64("2024-01-02T03:04:05", "us"),
+        )
+        self.assertTrue(np.isnat(page["ModificationTimestamp"][1]))
+
+        self.assertEqual(page["MemberFullName"].dtype, object)
+        self.assertEqual(page["MemberFullName"].tolist(), ["A", None])
+
+
+@skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+class ArrowColumnsTestCase(SimpleTestCase):
+    def test_decode(self):
+        import pyarrow as pa
+
+        page = ColumnarDecoder(Member, backend="arrow").decode(ROWS)
+
+        self.assertIsInstance(page, pa.RecordBatch)
+        self.assertEqual(page.num_rows, 2)
+        self.assertEqual(
+            page.schema,
+            pa.schema(
+                [
+                    ("Commission", pa.float64()),
+                    ("MemberFullName", pa.string()),
+                    ("MemberKey", pa.int64()),
+                    ("ModificationTimestamp", pa.timestamp("us", tz="UTC")),
+                    ("OfficeKey", pa.int64()),
+                ]
+            ),
+        )
+        self.assertEqual(
+            page.to_pydict(),
+            {
+                "Commission": [2.5, None],
+                "MemberFullName": ["A", None],
+                "MemberKey": [1, 2],
+                "ModificationTimestamp": [
+                    datetime.datetime(
+                        2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc
+                    ),
+                    None,
+                ],
+                "OfficeKey": [3, None],
+            },
+        )
+
+    def test_exact_decimals(self):
+        page = ColumnarDecoder(
+            Member, names=["Commission"], backend="arrow", decimal="decimal"
+        ).decode([{"Commission": 2.15}, {}])
+        self.assertEqual(page.to_pydict(), {"Commission": [Decimal("2.15"), None]})
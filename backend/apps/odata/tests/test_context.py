@@ -0,0 +1,112 @@
+import json
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from odata.exceptions import ODataError
+from odata.tests.entities import Member, Service
+
+
+def new_member(key):
+    member = Member()
+    member.MemberKey = key
+    member.MemberFullName = f"Member {key}"
+    return member
+
+
+def batch_response(items):
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps({"responses": items}).encode()
+    return response
+
+
+class SaveManyTestCase(SimpleTestCase):
+    def setUp(self):
+        self.context = Service.create_context()
+        self.connection = self.context.connection
+
+    def test_failed_write_does_not_stop_the_others(self):
+        def execute_post(url, data):
+            if data["MemberKey"] == 2:
+                raise ODataError("Invalid")
+            return dict(data, ModificationTimestamp="2024-10-01T12:00:00Z")
+
+        members = [new_member(key) for key in range(1, 4)]
+        with mock.patch.object(
+            self.connection, "execute_post", side_effect=execute_post
+        ):
+            futures = self.context.save_many(members, max_workers=2)
+
+        self.assertEqual(
+            [future.exception() is None for future in futures], [True, False, True]
+        )
+        self.assertIs(futures[0].result(), members[0])
+        self.assertTrue(members[0].__odata__.persisted)
+        self.assertIsNotNone(members[0].ModificationTimestamp)
+        self.assertFalse(members[1].__odata__.persisted)
+
+    def test_batches(self):
+        def execute_batch(url, data, content_type):
+            return batch_response(
+                [
+                    {"id": item["id"], "status": 201, "body": item["body"]}
+                    for item in json.loads(data)["requests"]
+                ]
+            )
+
+        members = [new_member(key) for key in range(1, 6)]
+        with mock.patch.object(
+            self.connection, "execute_batch", side_effect=execute_batch
+        ) as batch:
+            futures = self.context.save_many(members, use_batch=True, batch_size=2)
+
+        self.assertEqual(batch.call_count, 3)
+        self.assertEqual([future.result() for future in futures], members)
+        self.assertTrue(all(member.__odata__.persisted for member in members))
+
+    def test_failed_batch_fails_the_futures(self):
+        members = [new_member(key) for key in range(1, 4)]
+        with mock.patch.object(
+            self.connection, "execute_batch", side_effect=ODataError("Unavailable")
+        ):
+            futures = self.context.save_many(members, use_batch=True)
+        self.assertTrue(all(future.exception() for future in futures))
+
+
+class DeleteManyTestCase(SimpleTestCase):
+    def setUp(self):
+        self.context = Service.create_context()
+        self.connection = self.context.connection
+        self.members = [
+            Member.__new__(Member, from_data={"MemberKey": key}) for key in (1, 2)
+        ]
+
+    def test_concurrent(self):
+        with mock.patch.object(self.connection, "execute_delete") as execute_delete:
+            futures = self.context.delete_many(self.members)
+        self.assertEqual(
+            sorted(call.args[0] for call in execute_delete.call_args_list),
+            [
+                "http://odata.example.com/Member(1)",
+                "http://odata.example.com/Member(2)",
+            ],
+        )
+        self.assertEqual([future.result() for future in futures], [None, None])
+        self.assertFalse(any(member.__odata__.persisted for member in self.members))
+
+    def test_batch(self):
+        with mock.patch.object(
+            self.connection,
+            "execute_batch",
+            return_value=batch_response(
+                [{"id": "1", "status": 204}, {"id": "2", "status": 404}]
+            ),
+        ):
+            futures = self.context.delete_many(self.members, use_batch=True)
+        self.assertIsNone(futures[0].exception())
+        self.assertIsInstance(futures[1].exception(), ODataError)
+        self.assertFalse(self.members[0].__odata__.persisted)
+        self.assertTrue(self.members[1].__odata__.persisted)
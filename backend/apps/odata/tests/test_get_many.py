@@ -0,0 +1,101 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from odata import exceptions as exc
+from odata.query import Query
+from odata.tests.entities import Member, Office, Service
+
+
+class ChunkKeysTestCase(SimpleTestCase):
+    def setUp(self):
+        self.query = Service.query(Member)
+
+    def test_chunk_size(self):
+        self.assertEqual(
+            self.query._chunk_keys(Member.MemberKey, list(range(7)), 3, 2000, True),
+            [[0, 1, 2], [3, 4, 5], [6]],
+        )
+
+    def test_filter_length(self):
+        # "MemberKey in ()" and 5 characters per key
+        keys = [1000, 1001, 1002, 1003]
+        chunks = self.query._chunk_keys(Member.MemberKey, keys, 100, 26, True)
+        self.assertEqual(chunks, [[1000, 1001], [1002, 1003]])
+        for chunk in chunks:
+            self.assertLessEqual(len(str(Member.MemberKey.in_(chunk))), 26)
+
+    def test_or_filters_are_longer(self):
+        keys = [1000, 1001, 1002, 1003]
+        chunks = self.query._chunk_keys(Member.MemberKey, keys, 100, 60, False)
+        self.assertEqual(chunks, [[1000, 1001], [1002, 1003]])
+        for chunk in chunks:
+            key_filter = self.query._key_filter(Member.MemberKey, chunk, False)
+            self.assertLessEqual(len(key_filter), 60)
+
+    def test_key_filter(self):
+        self.assertEqual(
+            str(self.query._key_filter(Member.MemberKey, [1, 2], True)),
+            "MemberKey in (1,2)",
+        )
+        self.assertEqual(
+            self.query._key_filter(Member.MemberKey, [1, 2], False),
+            "MemberKey eq 1 or MemberKey eq 2",
+        )
+
+
+class GetManyTestCase(SimpleTestCase):
+    def setUp(self):
+        self.query = Service.query(Office).select(Office.OfficeName)
+        self.filters = []
+
+        def execute(query):
+            self.filters.append(query.options["$filter"])
+            return iter(
+                [
+                    {"OfficeKey": 1, "OfficeName": "A"},
+                    {"OfficeKey": 3, "OfficeName": "C"},
+                ]
+            )
+
+        patcher = mock.patch.object(
+            Query, "__iter__", autospec=True, side_effect=execute
+        )
+        self.execute = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rows_by_key(self):
+        rows = self.query.get_many([1, 2, 3, 1])
+        self.assertEqual(
+            rows,
+            {
+                1: {"OfficeKey": 1, "OfficeName": "A"},
+                3: {"OfficeKey": 3, "OfficeName": "C"},
+            },
+        )
+        self.assertEqual(len(self.filters), 1)
+        select = self.execute.call_args.args[0].options["$select"]
+        self.assertIn("OfficeKey", [str(prop) for prop in select])
+
+    def test_chunks(self):
+        self.query.get_many(range(5), chunk_size=2, max_workers=1)
+        self.assertEqual(
+            [[str(value) for value in filters] for filters in self.filters],
+            [["OfficeKey in (0,1)"], ["OfficeKey in (2,3)"], ["OfficeKey in (4)"]],
+        )
+
+    def test_no_keys(self):
+        self.assertEqual(self.query.get_many([]), {})
+        self.execute.assert_not_called()
+
+    def test_or_fallback(self):
+        rejected = exc.ODataError("in is not supported")
+        with mock.patch.object(
+            Query,
+            "_get_chunk",
+            autospec=True,
+            side_effect=[rejected, [{"OfficeKey": 1}]],
+        ) as get_chunk:
+            self.assertEqual(self.query.get_many([1, 2]), {1: {"OfficeKey": 1}})
+        self.assertEqual(
+            [call.args[3] for call in get_chunk.call_args_list], [True, False]
+        )
@@ -0,0 +1,88 @@
+import gc
+from unittest import mock
+
+from django.test import SimpleTestCase
+from odata.identity import IdentityMap
+from odata.tests.entities import Member, Office, Service
+
+
+def load(entity_class, **data):
+    return entity_class.__new__(entity_class, from_data=data)
+
+
+class IdentityMapTestCase(SimpleTestCase):
+    def test_merge_updates_the_shared_instance(self):
+        identity_map = IdentityMap()
+        first = identity_map.merge(load(Member, MemberKey=1, MemberFullName="A"))
+        first.OfficeKey = 7
+
+        again = identity_map.merge(
+            load(Member, MemberKey=1, MemberFullName="B", OfficeKey=8)
+        )
+        self.assertIs(again, first)
+        self.assertEqual(first.MemberFullName, "B")
+        # modified locally
+        self.assertEqual(first.OfficeKey, 7)
+        self.assertEqual(len(identity_map), 1)
+
+    def test_get(self):
+        identity_map = IdentityMap()
+        member = identity_map.merge(load(Member, MemberKey=1))
+        self.assertIs(identity_map.get("Member(1)"), member)
+        self.assertIsNone(identity_map.get("Member(2)"))
+        self.assertEqual((identity_map.hits, identity_map.misses), (1, 1))
+
+    def test_entities_without_id(self):
+        identity_map = IdentityMap()
+        member = Member()
+        self.assertIs(identity_map.merge(member), member)
+        self.assertEqual(len(identity_map), 0)
+
+    def test_recent_entities_are_kept_alive(self):
+        identity_map = IdentityMap(max_size=1)
+        identity_map.merge(load(Member, MemberKey=1))
+        identity_map.merge(load(Member, MemberKey=2))
+        gc.collect()
+        self.assertNotIn("Member(1)", identity_map)
+        self.assertIn("Member(2)", identity_map)
+
+    def test_discard(self):
+        identity_map = IdentityMap()
+        member = identity_map.merge(load(Member, MemberKey=1))
+        identity_map.discard(load(Member, MemberKey=1))
+        self.assertIn("Member(1)", identity_map)
+        identity_map.discard(member)
+        self.assertNotIn("Member(1)", identity_map)
+
+
+class ContextIdentityMapTestCase(SimpleTestCase):
+    def setUp(self):
+        self.context = Service.create_context(identity_map=True)
+        patcher = mock.patch.object(self.context.connection, "execute_get")
+        self.execute_get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_queries_share_instances(self):
+        self.execute_get.return_value = {
+            "value": [{"MemberKey": 1, "MemberFullName": "A", "OfficeKey": 3}]
+        }
+        [first] = self.context.query(Member).all()
+        [again] = self.context.query(Member).filter(Member.MemberKey == 1).all()
+        self.assertIs(first, again)
+
+    def test_navigation_property_from_the_map(self):
+        self.execute_get.return_value = {
+            "value": [{"OfficeKey": 3, "OfficeName": "Main"}]
+        }
+        [office] = self.context.query(Office).all()
+        self.execute_get.return_value = {
+            "value": [{"MemberKey": 1, "MemberFullName": "A", "OfficeKey": 3}]
+        }
+        [member] = self.context.query(Member).all()
+
+        self.execute_get.reset_mock()
+        self.assertIs(member.Office, office)
+        self.execute_get.assert_not_called()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(Service.create_context().identity_map)
@@ -0,0 +1,77 @@
+from django.test import SimpleTestCase
+from odata.management.commands.odata_bench import (
+    EDMX_FOOTER,
+    EDMX_HEADER,
+    SyntheticMetaData,
+    build_metadata_document,
+)
+from odata.service import ODataService
+
+# types are referenced by their full name (Bench.Schema.X) and by the alias (Bench.X)
+DOCUMENT = (
+    EDMX_HEADER + '<EntityType Name="Office">'
+    '<Key><PropertyRef Name="OfficeKey"/></Key>'
+    '<Property Name="OfficeKey" Type="Edm.Int64" Nullable="false"/>'
+    '<NavigationProperty Name="Members" Type="Collection(Bench.Schema.Member)"/>'
+    "</EntityType>"
+    '<EntityType Name="Member">'
+    '<Key><PropertyRef Name="MemberKey"/></Key>'
+    '<Property Name="MemberKey" Type="Edm.Int64" Nullable="false"/>'
+    '<NavigationProperty Name="Office" Type="Bench.Office"/>'
+    '<NavigationProperty Name="Team" Type="Bench.Team"/>'
+    "</EntityType>"
+    '<Function Name="Refresh" IsBound="true">'
+    '<Parameter Name="bindingParameter" Type="Bench.Schema.Member"/>'
+    '<ReturnType Type="Bench.Schema.Office"/>'
+    "</Function>"
+    '<EntityContainer Name="Container">'
+    '<EntitySet Name="Office" EntityType="Bench.Office"/>'
+    '<EntitySet Name="Member" EntityType="Bench.Schema.Member"/>'
+    "</EntityContainer>" + EDMX_FOOTER
+).encode("utf-8")
+
+
+def reflect(document):
+    service = ODataService(
+        "http://bench.local/odata/", reflect_entities=False, quiet_progress=True
+    )
+    metadata = SyntheticMetaData(service, console=service.console, quiet=True)
+    metadata.document = document
+    _, sets, types = metadata.get_entity_sets(base=service.Entity)
+    return sets, types
+
+
+class RelationshipsTestCase(SimpleTestCase):
+    def setUp(self):
+        self.sets, self.types = reflect(DOCUMENT)
+
+    def test_entity_sets_by_name_and_alias(self):
+        self.assertTrue(issubclass(self.sets["Office"], self.types["Bench.Office"]))
+        self.assertTrue(
+            issubclass(self.sets["Member"], self.types["Bench.Schema.Member"])
+        )
+
+    def test_navigation_properties(self):
+        member, office = self.types["Bench.Member"], self.types["Bench.Office"]
+        self.assertIs(member.Office.entityclass, office)
+        self.assertFalse(member.Office.is_collection)
+        self.assertIs(office.Members.entityclass, member)
+        self.assertTrue(office.Members.is_collection)
+
+    def test_navigation_property_to_unknown_type_is_skipped(self):
+        self.assertFalse(hasattr(self.types["Bench.Member"], "Team"))
+
+    def test_bound_function(self):
+        refresh = vars(self.types["Bench.Member"])["Refresh"]
+        self.assertIs(refresh.return_type, self.types["Bench.Office"])
+        self.assertFalse(refresh.bound_to_collection)
+
+    def test_synthetic_document(self):
+        sets, types = reflect(build_metadata_document(20, 3, 4))
+        self.assertEqual(len(sets), 20)
+        for index in range(20):
+            entity = types[f"Bench.Entity{index}"]
+            for nav in range(4):
+                target = getattr(entity, f"Nav{nav}").entityclass
+                self.assertIn(target.__name__, [f"Entity{i}" for i in range(20)])
+                self.assertEqual(getattr(entity, f"Nav{nav}").is_collection, nav % 2)
@@ -0,0 +1,22 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from odata import navproperty
+from odata.tests.entities import Member, Office
+
+
+class PrefetchKeysTestCase(SimpleTestCase):
+    def test_keys_from_referential_constraint(self):
+        parent_key, related_key = Member.Office.prefetch_keys(Member)
+        self.assertIs(parent_key, Member.OfficeKey)
+        self.assertIs(related_key, Office.OfficeKey)
+
+    def test_keys_resolved_once_per_class(self):
+        Member.Office._prefetch_keys.clear()
+        with mock.patch.object(
+            navproperty, "_find_property", wraps=navproperty._find_property
+        ) as find_property:
+            first = Member.Office.prefetch_keys(Member)
+            second = Member.Office.prefetch_keys(Member)
+        self.assertEqual(first, second)
+        self.assertEqual(find_property.call_count, 2)
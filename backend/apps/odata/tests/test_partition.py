@@ -0,0 +1,128 @@
+import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+from odata.exceptions import ODataQueryError
+from odata.query import Query
+from odata.tests.entities import Member, Service
+
+
+def probe(values):
+    """
+    _probe_key of a query whose ordered key values are the given ones
+    """
+
+    def _probe_key(query, key, descending=False, offset=None):
+        if descending:
+            return values[-1]
+        return values[offset or 0]
+
+    return mock.patch.object(Query, "_probe_key", autospec=True, side_effect=_probe_key)
+
+
+class RangePartitionsTestCase(SimpleTestCase):
+    def setUp(self):
+        self.query = Service.query(Member)
+
+    def get_bounds(self, partitions):
+        return [(partition.lower, partition.upper) for partition in partitions]
+
+    def test_integer_boundaries(self):
+        with probe([1, 100]):
+            partitions = self.query.partitions(4, key=Member.MemberKey)
+        self.assertEqual(
+            self.get_bounds(partitions),
+            [(None, 26), (26, 51), (51, 76), (76, None)],
+        )
+        self.assertEqual([partition.index for partition in partitions], [0, 1, 2, 3])
+
+    def test_datetime_boundaries(self):
+        values = [
+            datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2024, 1, 5, tzinfo=datetime.timezone.utc),
+        ]
+        with probe(values):
+            partitions = self.query.partitions(2, key=Member.ModificationTimestamp)
+        self.assertEqual(
+            self.get_bounds(partitions),
+            [(None, "2024-01-03T00:00:00+00:00"), ("2024-01-03T00:00:00+00:00", None)],
+        )
+
+    def test_quantile_boundaries(self):
+        names = ["Adams", "Adams", "Baker", "Clark", "Davis", "Evans"]
+        with probe(names), mock.patch.object(Query, "count", return_value=6):
+            partitions = self.query.partitions(3, key=Member.MemberFullName)
+        self.assertEqual(
+            self.get_bounds(partitions),
+            [(None, "Baker"), ("Baker", "Davis"), ("Davis", None)],
+        )
+
+    def test_range_too_small_to_split(self):
+        with probe([7, 7]):
+            partitions = self.query.partitions(4, key=Member.MemberKey)
+        self.assertEqual(self.get_bounds(partitions), [(None, None)])
+
+        with probe([1, 2]):
+            partitions = self.query.partitions(4, key=Member.MemberKey)
+        self.assertEqual(self.get_bounds(partitions), [(None, 2), (2, None)])
+
+    def test_range_query(self):
+        with probe([1, 100]):
+            partition = self.query.partitions(4, key=Member.MemberKey)[1]
+        self.assertEqual(
+            partition._range_query().as_string(),
+            "http://odata.example.com/Member?$filter=(MemberKey ge 26) and "
+            "(MemberKey lt 51)&$orderby=MemberKey asc",
+        )
+
+    def test_resume_token(self):
+        with probe([1, 100]):
+            partition = self.query.partitions(4, key=Member.MemberKey)[1]
+        partition.last = 30
+
+        resumed = self.query.partition(partition.token)
+        self.assertEqual(resumed.token, partition.token)
+        self.assertEqual(
+            resumed._range_query().as_string(),
+            "http://odata.example.com/Member?$filter=(MemberKey gt 30) and "
+            "(MemberKey lt 51)&$orderby=MemberKey asc",
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ODataQueryError):
+            self.query.partitions(0, key=Member.MemberKey)
+        with self.assertRaises(ODataQueryError):
+            self.query.limit(10).partitions(2, key=Member.MemberKey)
+        with self.assertRaises(ODataQueryError):
+            self.query.partitions(2)
+
+
+class SkipPartitionsTestCase(SimpleTestCase):
+    def setUp(self):
+        self.query = Service.query(Member)
+
+    def test_windows(self):
+        with mock.patch.object(Query, "count", return_value=10):
+            partitions = self.query.partitions(3, strategy="skip")
+        self.assertEqual(
+            [(partition.start, partition.stop) for partition in partitions],
+            [(0, 4), (4, 8), (8, None)],
+        )
+
+    def test_iteration_pages(self):
+        rows = [{"MemberKey": key} for key in range(10)]
+        requests = []
+
+        def execute(query):
+            skip, top = query.options["$skip"], query.options["$top"]
+            requests.append((skip, top))
+            return iter(rows[skip : skip + top])
+
+        with mock.patch.object(Query, "count", return_value=10):
+            partition = self.query.partitions(
+                2, key=Member.MemberKey, strategy="skip", page_size=3
+            )[1]
+        with mock.patch.object(Query, "__iter__", autospec=True, side_effect=execute):
+            self.assertEqual(list(partition), rows[5:])
+        self.assertEqual(requests, [(5, 3), (8, 3), (10, 3)])
+        self.assertEqual(partition.last, 10)
@@ -0,0 +1,70 @@
+from django.test import SimpleTestCase
+from odata.tests.entities import Member, Service
+
+
+class ImmutableQueryTestCase(SimpleTestCase):
+    def setUp(self):
+        self.query = Service.query(Member)
+
+    def test_builders_return_new_queries(self):
+        filtered = self.query.filter(Member.MemberKey > 1)
+        limited = filtered.limit(10)
+        self.assertEqual(self.query.as_string(), "http://odata.example.com/Member")
+        self.assertEqual(
+            filtered.as_string(),
+            "http://odata.example.com/Member?$filter=(MemberKey gt 1)",
+        )
+        self.assertEqual(
+            limited.as_string(),
+            "http://odata.example.com/Member?$top=10&$filter=(MemberKey gt 1)",
+        )
+
+    def test_options(self):
+        query = (
+            self.query.select(Member.MemberKey, Member.MemberFullName)
+            .filter(Member.MemberKey > 1)
+            .filter(Member.MemberFullName == "A")
+            .order_by(Member.MemberKey.desc())
+            .offset(20)
+        )
+        self.assertEqual(
+            query._get_options(),
+            {
+                "$skip": 20,
+                "$select": "MemberKey,MemberFullName",
+                "$filter": "(MemberKey gt 1) and (MemberFullName eq 'A')",
+                "$orderby": "MemberKey desc",
+            },
+        )
+        self.assertEqual(
+            query._get_query_string(),
+            "%24skip=20&%24select=MemberKey%2CMemberFullName"
+            "&%24filter=%28MemberKey%20gt%201%29%20and%20%28MemberFullName%20eq%20%27A%27%29"
+            "&%24orderby=MemberKey%20desc",
+        )
+
+    def test_compiled_once(self):
+        query = self.query.filter(Member.MemberKey > 1)
+        options = query._get_options()
+        options["$top"] = 1
+        self.assertNotIn("$top", query._get_options())
+        self.assertIs(query._get_query_string(), query._get_query_string())
+
+    def test_fragments_shared_with_derived_queries(self):
+        query = self.query.filter(Member.MemberKey > 1)
+        query._get_query_string()
+
+        paged = query.limit(10).offset(20)
+        self.assertIs(paged._fragments["$filter"], query._fragments["$filter"])
+        self.assertEqual(
+            paged._get_query_string(),
+            "%24top=10&%24skip=20&%24filter=%28MemberKey%20gt%201%29",
+        )
+
+        refiltered = query.filter(Member.MemberKey < 5)
+        self.assertIsNot(refiltered._fragments["$filter"], query._fragments["$filter"])
+        self.assertEqual(
+            refiltered._get_options()["$filter"],
+            "(MemberKey gt 1) and (MemberKey lt 5)",
+        )
+        self.assertEqual(query._get_options()["$filter"], "(MemberKey gt 1)")
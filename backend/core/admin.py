@@ -1,7 +1,90 @@
+import json
+
+from django.core.paginator import Paginator
+from django.db import OperationalError, connections, transaction
+from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 
 
-class ViewOnlyAdminMixin:
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator of big tables (Postgres) which avoids a full COUNT(*):
+    - unfiltered lists use the row count estimated by the last ANALYZE or autovacuum
+      (pg_class.reltuples, summed over the partitions of partitioned tables),
+    - filtered lists (and tables never analyzed) are counted exactly, but a count
+      running longer than count_timeout ms is canceled and the planner estimate of
+      the filtered query is used instead.
+    Tables estimated under exact_count_below rows are always counted exactly.
+    """
+
+    count_timeout = 500
+    exact_count_below = 10000
+
+    @property
+    def connection(self):
+        return connections[self.object_list.db]
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where and not query.distinct:
+            estimate = self._table_estimate()
+            if estimate is not None and estimate >= self.exact_count_below:
+                return estimate
+        try:
+            with transaction.atomic(using=self.object_list.db):
+                with self.connection.cursor() as cursor:
+                    cursor.execute(
+                        f"SET LOCAL statement_timeout = {int(self.count_timeout)}"
+                    )
+                return self.object_list.count()
+        except OperationalError:
+            # canceled by statement_timeout
+            return self._query_estimate()
+
+    def _table_estimate(self):
+        """
+        :return: Estimated row count of the table, None if it was never analyzed
+        """
+        table = self.object_list.model._meta.db_table
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT SUM(c.reltuples), MIN(c.reltuples)
+                FROM pg_partition_tree(%s::regclass) t
+                JOIN pg_class c ON c.oid = t.relid
+                WHERE t.isleaf
+                """,
+                [self.connection.ops.quote_name(table)],
+            )
+            total, least = cursor.fetchone()
+        # reltuples is -1 until the first ANALYZE
+        if total is None or least < 0:
+            return None
+        return int(total)
+
+    def _query_estimate(self):
+        sql, params = self.object_list.query.sql_with_params()
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountAdminMixin:
+    """
+    Changelists of big tables without COUNT(*) scans: counts of EstimatedCountPaginator,
+    and no second count of the unfiltered table while searching or filtering
+    (the "N total" link)
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class ViewOnlyAdminMixin(EstimatedCountAdminMixin):
     def has_add_permission(self, request, obj=None):
         return False
 
@@ -12,6 +95,32 @@ class ViewOnlyAdminMixin:
         return False
 
 
+class FullTextSearchAdminMixin:
+    """
+    Search box served by full_text_search() (an indexed search) instead of the
+    ILIKE scans of search_fields: numbers are looked up as primary keys, other terms
+    as keywords. search_fields must still be set, the admin shows the box for them,
+    and they are searched as usual while full_text_search() is not overridden.
+    """
+
+    def full_text_search(self, queryset, search_term):
+        """
+        :return: Records matching the term, None to search the search_fields
+        """
+        return None
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if term.isdigit():
+            return queryset.filter(pk=term), False
+        results = self.full_text_search(queryset, term)
+        if results is None:
+            return super().get_search_results(request, queryset, search_term)
+        return results, False
+
+
 class ImageUrlFieldsAdminMixin:
     def render_image_field(self, image_url, max_size=200):
         return mark_safe(
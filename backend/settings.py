@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "whitenoise.runserver_nostatic",  # allows not tu use whitenoise in local
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "explorer",
     # "django_sql_dashboard",
 ]
@@ -239,6 +240,47 @@ BRIGHT_MLS_API_URL = os.environ.get("BRIGHT_MLS_API_URL", "")
 BRIGHT_MLS_CLIENT_ID = os.environ.get("BRIGHT_MLS_CLIENT_ID", "")
 BRIGHT_MLS_CLIENT_SECRET = os.environ.get("BRIGHT_MLS_CLIENT_SECRET", "")
 
+# On-disk cache of API responses for slowly changing entities (ttl in seconds)
+BRIGHT_MLS_CACHE_DIR = os.environ.get(
+    "BRIGHT_MLS_CACHE_DIR", str(BASE_DIR / ".cache" / "brightmls")
+)
+BRIGHT_MLS_CACHE_TTLS = {
+    "Lookup": 24 * 3600,
+    "RelatedLookup": 24 * 3600,
+    "City": 24 * 3600,
+    "CityZipCode": 24 * 3600,
+    "School": 24 * 3600,
+    "SchoolDistrict": 24 * 3600,
+    "Subdivision": 24 * 3600,
+}
+
+# Request budget shared by all processes calling the API (requests per second and burst),
+# keep it below the Bright MLS quota. A rate of 0 disables the limit
+BRIGHT_MLS_RATE_LIMIT = {
+    "rate": float(os.environ.get("BRIGHT_MLS_RATE_LIMIT_RATE", 10)),
+    "burst": float(os.environ.get("BRIGHT_MLS_RATE_LIMIT_BURST", 20)),
+}
+
+# Session settings of index builds after bulk loads (see brightmls.services.indexes)
+BRIGHT_MLS_INDEX_BUILD = {
+    "maintenance_work_mem": os.environ.get(
+        "BRIGHT_MLS_INDEX_MAINTENANCE_WORK_MEM", "512MB"
+    ),
+    "parallel_workers": int(os.environ.get("BRIGHT_MLS_INDEX_PARALLEL_WORKERS", 2)),
+}
+
+# Bounds of the page size tuning of mls_grab (see brightmls.services.pagesize)
+BRIGHT_MLS_ADAPTIVE_PAGE_SIZE = {
+    "initial": 2000,
+    "min_page_size": 100,
+    "max_page_size": 10000,
+    "max_page_bytes": 64 * 10**6,
+    "max_latency": 60,
+    "max_memory": 2 * 10**9,
+    "min_batch_size": 100,
+    "max_batch_size": 5000,
+}
+
 
 # SQL Explorer settings
 EXPLORER_AI_API_KEY = os.environ.get("OPENAI_API_KEY")
@@ -276,6 +318,11 @@ LOGGING = {
             "level": "WARNING",  # Ignore DEBUG and INFO logs for urllib3
             "propagate": False,
         },
+        "brightmls": {
+            "handlers": ["console"],
+            "level": "INFO",  # page size tuning decisions
+            "propagate": False,
+        },
         "odata": {
             "handlers": ["console"],
             "level": "WARNING",  # Ignore DEBUG and INFO logs for urllib3